@@ -0,0 +1,9 @@
+"""
+DeepFakeGuard benchmark suite
+
+Runs the image detector and the DistilBERT text classifier on synthetic
+inputs (no dataset or network access needed) and writes a JSON report.
+
+    python -m benchmarks run --out bench.json
+    python -m benchmarks compare bench.json baseline.json --tolerance 0.10
+"""
@@ -0,0 +1,93 @@
+"""
+python -m benchmarks run|compare
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from .common import compare, peak_rss_mb
+
+
+def cmd_run(args):
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "random_weights": args.random_weights,
+        }
+    }
+    batch_sizes = tuple(args.batch_sizes)
+
+    if args.only in (None, "image"):
+        from . import image_bench
+        print("🖼️ Benchmarking image detector...")
+        report["image"] = image_bench.run(
+            args.image_model, args.image_backend, batch_sizes, args.repeat, args.random_weights
+        )
+        report["image"]["peak_rss_mb"] = peak_rss_mb()
+
+    if args.only in (None, "text"):
+        from . import text_bench
+        print("📝 Benchmarking text classifier...")
+        report["text"] = text_bench.run(args.text_model, batch_sizes, args.repeat, args.random_weights)
+        # Peak RSS is process-wide, so this includes the image run when both ran
+        report["text"]["peak_rss_mb"] = peak_rss_mb()
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results saved to {args.out}")
+
+
+def cmd_compare(args):
+    with open(args.current) as f:
+        current = json.load(f)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    rows = compare(current, baseline, args.tolerance)
+    regressions = [r for r in rows if r[4]]
+
+    print("=" * 92)
+    print(f"{'metric':<52}{'baseline':>12}{'current':>12}{'change':>10}")
+    print("=" * 92)
+    for name, base, cur, change, regressed in rows:
+        flag = "  ❌" if regressed else ""
+        print(f"{name:<52}{base:>12.3f}{cur:>12.3f}{change:>+9.1%}{flag}")
+    print("=" * 92)
+
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        sys.exit(1)
+    print(f"✅ No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run the benchmarks and write a JSON report")
+    p_run.add_argument("--out", type=str, default="bench_results.json")
+    p_run.add_argument("--only", choices=["image", "text"], default=None)
+    p_run.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    p_run.add_argument("--repeat", type=int, default=10)
+    p_run.add_argument("--image-model", type=str, default=None)
+    p_run.add_argument("--image-backend", choices=["keras", "tflite"], default="keras")
+    p_run.add_argument("--text-model", type=str, default=None, help="save_pretrained folder")
+    p_run.add_argument("--random-weights", action="store_true",
+                       help="Use untrained models with the real architectures (no model files needed)")
+
+    p_cmp = sub.add_parser("compare", help="Flag regressions against a stored baseline")
+    p_cmp.add_argument("current", type=str)
+    p_cmp.add_argument("baseline", type=str)
+    p_cmp.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        cmd_run(args)
+    else:
+        cmd_compare(args)
@@ -0,0 +1,101 @@
+"""
+Timing, memory and report helpers shared by the benchmarks
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Repo root on sys.path: the benchmarks import the detectors through
+# serving.loaders, like the serving layer does
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Metric name suffixes where a higher value is better; everything else
+# (ms, s, mb) is lower-is-better.
+HIGHER_IS_BETTER = ("items_per_s",)
+
+
+def time_ms(fn, repeat, warmup=1):
+    """
+    Median wall time of fn() in milliseconds
+    """
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process so far (None when unavailable)
+    """
+    if resource is None:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        # Windows: peak working set, in bytes
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def cold_start_s(code, repeat=3):
+    """
+    Best wall time of running `code` in a fresh interpreter
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def flatten(report, prefix=""):
+    """
+    {"a": {"b": 1}} -> {"a.b": 1}, numeric leaves only
+    """
+    out = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            out[name] = value
+    return out
+
+
+def compare(current, baseline, tolerance):
+    """
+    Compare two reports metric by metric
+
+    Returns:
+        list: (metric, baseline, current, change, regressed) rows
+    """
+    cur = flatten({k: v for k, v in current.items() if k != "meta"})
+    base = flatten({k: v for k, v in baseline.items() if k != "meta"})
+    rows = []
+    for name in sorted(set(cur) & set(base)):
+        b, c = base[name], cur[name]
+        if b == 0:
+            continue
+        change = (c - b) / b
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        rows.append((name, b, c, change, worse > tolerance))
+    return rows
@@ -0,0 +1,80 @@
+"""
+Image detector benchmark on synthetic JPEGs
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from serving.loaders import IMAGE_SCRIPTS
+
+from .common import cold_start_s, time_ms
+
+IMAGE_SIZES = [(224, 224), (640, 480), (1920, 1080), (4032, 3024)]
+
+
+def make_images(folder, sizes, seed=0):
+    """
+    Write one random-noise JPEG per (width, height)
+    """
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    paths = {}
+    for width, height in sizes:
+        pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        path = os.path.join(folder, f"synthetic_{width}x{height}.jpg")
+        Image.fromarray(pixels).save(path, quality=90)
+        paths[f"{width}x{height}"] = path
+    return paths
+
+
+def random_weight_model(folder, backend="keras"):
+    """
+    Untrained EfficientNetB0 detector (same compute as the real model),
+    saved as .keras, or converted to an fp32 .tflite for the tflite backend
+    """
+    from model import build_model
+
+    path = os.path.join(folder, "random_weights.keras")
+    build_model(weights=None).save(path)
+    if backend == "tflite":
+        from convert_tflite import convert
+
+        keras_path, path = path, os.path.join(folder, "random_weights.tflite")
+        with open(path, "wb") as f:
+            f.write(convert(keras_path, "fp32"))
+    return path
+
+
+def run(model_path=None, backend="keras", batch_sizes=(1, 8, 32), repeat=20, random_weights=False):
+    from deepfake_detector import DeepFakeDetector, INPUT_SHAPE
+    from image_loader import decode_image, preprocess_image
+
+    report = {"decode_ms": {}, "preprocess_ms": {}, "inference": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        images = make_images(tmp, IMAGE_SIZES)
+        for name, path in images.items():
+            report["decode_ms"][name] = time_ms(lambda: decode_image(path), repeat)
+            decoded = decode_image(path)
+            report["preprocess_ms"][name] = time_ms(lambda: preprocess_image(decoded), repeat)
+
+        if random_weights:
+            model_path = random_weight_model(tmp, backend)
+        detector = DeepFakeDetector(model_path, backend=backend, max_batch_size=max(batch_sizes), lazy=False)
+
+        rng = np.random.default_rng(0)
+        for bs in batch_sizes:
+            batch = rng.random((bs, *INPUT_SHAPE), dtype=np.float32)
+            ms = time_ms(lambda: detector.predict_scores(batch), repeat)
+            report["inference"][f"batch_{bs}"] = {"ms_per_batch": ms, "items_per_s": bs * 1000 / ms}
+
+        # Import + model load + first prediction in a fresh interpreter
+        report["cold_start_s"] = cold_start_s(
+            f"import sys, numpy as np; sys.path.insert(0, {IMAGE_SCRIPTS!r}); "
+            "from deepfake_detector import DeepFakeDetector; "
+            f"d = DeepFakeDetector({detector.model_path!r}, backend={backend!r}); "
+            "d.predict_scores(np.zeros((1, 224, 224, 3), np.float32))"
+        )
+    return report
@@ -0,0 +1,85 @@
+"""
+DistilBERT text classifier benchmark on synthetic messages
+"""
+
+import os
+import random
+import tempfile
+
+from serving.loaders import TEXT_SCRIPTS, load_text_predict
+
+from .common import cold_start_s, time_ms
+
+REPO_MODEL_DIR = os.path.join(os.path.dirname(TEXT_SCRIPTS), "model")
+TOKEN_LENGTHS = [16, 64, 256, 512]
+
+WORDS = (
+    "the account please your payment meeting team verify update report "
+    "project click offer bank today send thanks message delivery order "
+    "link prize week price call review free support number office time"
+).split()
+
+
+def make_text(tokenizer, n_tokens, seed=0):
+    """
+    Random word sequence that tokenizes to about n_tokens (incl. [CLS]/[SEP])
+    """
+    rng = random.Random(seed + n_tokens)
+    words = [rng.choice(WORDS) for _ in range(n_tokens)]
+    while words and len(tokenizer(" ".join(words), truncation=True, max_length=512)["input_ids"]) > n_tokens:
+        words.pop()
+    return " ".join(words)
+
+
+def random_weight_model(folder, model_dir):
+    """
+    Untrained DistilBERT with the repo's config + tokenizer (same compute as the real model)
+    """
+    from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+    config = DistilBertConfig.from_pretrained(model_dir)
+    DistilBertForSequenceClassification(config).save_pretrained(folder)
+    DistilBertTokenizerFast.from_pretrained(model_dir).save_pretrained(folder)
+    return folder
+
+
+def run(model_dir=None, batch_sizes=(1, 8, 32), repeat=10, random_weights=False):
+    import torch
+
+    text_predict = load_text_predict()
+    report = {"preprocess_ms": {}, "inference": {}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_dir = model_dir or REPO_MODEL_DIR
+        if random_weights:
+            model_dir = random_weight_model(tmp, model_dir)
+        text_predict.MODEL_PATH = model_dir
+        tokenizer, model, device = text_predict.load_model()
+
+        for n_tokens in TOKEN_LENGTHS:
+            text = make_text(tokenizer, n_tokens)
+            key = f"tokens_{n_tokens}"
+
+            def preprocess():
+                return tokenizer(text_predict.clean_text(text), return_tensors="pt",
+                                 truncation=True, max_length=text_predict.MAX_LEN)
+            report["preprocess_ms"][key] = time_ms(preprocess, repeat)
+
+            report["inference"][key] = {}
+            for bs in batch_sizes:
+                inputs = tokenizer([text] * bs, return_tensors="pt", truncation=True,
+                                   padding=True, max_length=text_predict.MAX_LEN)
+                inputs = {k: v.to(device) for k, v in inputs.items()}
+
+                def infer():
+                    with torch.inference_mode():
+                        model(**inputs)
+                ms = time_ms(infer, repeat)
+                report["inference"][key][f"batch_{bs}"] = {"ms_per_batch": ms, "items_per_s": bs * 1000 / ms}
+
+        # Import + model load + first prediction in a fresh interpreter
+        report["cold_start_s"] = cold_start_s(
+            f"import sys; sys.path.insert(0, {TEXT_SCRIPTS!r}); import predict; "
+            f"predict.MODEL_PATH = {model_dir!r}; predict.predict('Your OTP is 1234, click to verify')"
+        )
+    return report
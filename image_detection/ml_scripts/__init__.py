@@ -1,7 +1,22 @@
 """
 DeepFakeGuard ML Scripts Package
+
+Exports are resolved lazily so `import ml_scripts` stays cheap; heavy
+frameworks are only imported when a model is actually loaded.
 """
 
-from .deepfake_detector import DeepFakeDetector
+import importlib
+
+_EXPORTS = {
+    'DeepFakeDetector': '.deepfake_detector',
+    'VerdictCache': '.verdict_cache',
+}
+
+__all__ = ['DeepFakeDetector', 'VerdictCache']
+
 
-__all__ = ['DeepFakeDetector']
\ No newline at end of file
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
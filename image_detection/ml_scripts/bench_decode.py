@@ -0,0 +1,76 @@
+"""
+Decode benchmark: keras load_img vs ImageDecoder
+
+Usage:
+    python bench_decode.py <image_dir> [--limit 500] [--workers 8]
+
+Reports decode ms per image for:
+  - keras      : keras.preprocessing.image.load_img + img_to_array (old path)
+  - draft      : ImageDecoder on one thread (reduced-size JPEG decoding)
+  - draft+pool : ImageDecoder.decode_many on a thread pool
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+from tensorflow.keras.preprocessing import image
+
+from image_loader import ImageDecoder
+
+IMAGE_EXTS = [".jpg", ".jpeg", ".png"]
+
+
+def keras_decode(path):
+    img = image.load_img(path, target_size=(224, 224))
+    return image.img_to_array(img) / 255.0
+
+
+def time_per_image(fn, paths):
+    start = time.perf_counter()
+    fn(paths)
+    return (time.perf_counter() - start) * 1000 / len(paths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("image_dir", type=str, help="Folder with test images")
+    parser.add_argument("--limit", type=int, default=500, help="Max images to decode")
+    parser.add_argument("--workers", type=int, default=None, help="Decode threads for the pool run")
+    args = parser.parse_args()
+
+    paths = sorted(p for p in Path(args.image_dir).rglob("*") if p.suffix.lower() in IMAGE_EXTS)
+    paths = [str(p) for p in paths[:args.limit]]
+    if not paths:
+        raise SystemExit(f"❌ No images found in {args.image_dir}")
+
+    single = ImageDecoder(num_workers=1)
+    pooled = ImageDecoder(num_workers=args.workers)
+
+    # Warm the OS file cache so every run reads from memory
+    for p in paths:
+        Path(p).read_bytes()
+    # Untimed first calls (lazy imports / plugin loading inside each path)
+    keras_decode(paths[0])
+    single.decode(paths[0])
+    pooled.decode_many(paths[:1])
+
+    results = {
+        "keras": time_per_image(lambda ps: [keras_decode(p) for p in ps], paths),
+        "draft": time_per_image(lambda ps: [single.decode(p) for p in ps], paths),
+        f"draft+pool ({pooled.num_workers})": time_per_image(pooled.decode_many, paths),
+    }
+    pooled.close()
+
+    # Pixel drift introduced by draft decoding
+    diffs = [np.abs(keras_decode(p) - single.decode(p)).mean() for p in paths[:50]]
+
+    print("=" * 50)
+    print(f"Decode benchmark ({len(paths)} images)")
+    print("=" * 50)
+    base = results["keras"]
+    for name, ms in results.items():
+        print(f"{name:<18} {ms:8.2f} ms/img   {base / ms:5.2f}x")
+    print(f"Mean abs pixel diff vs keras: {np.mean(diffs):.4f}")
+    print("=" * 50)
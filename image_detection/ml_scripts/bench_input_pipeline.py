@@ -0,0 +1,76 @@
+"""
+Input pipeline benchmark: current loader vs packed shards
+
+Usage:
+    python bench_input_pipeline.py --data C:/DeepFakeGuard-ML/dataset_split --shards C:/DeepFakeGuard-ML/shards
+    python bench_input_pipeline.py --data .../split_manifest.csv --shards .../shards --train-step
+
+Reports images/s fed to the model for the same split on the same CPU:
+  - loader : preprocess.load_dataset on the folder (or split manifest)
+  - shards : image_shards.load_shards
+With --train-step every batch also goes through model.train_on_batch
+(frozen EfficientNetB0 from model.build_model), i.e. images/s trained.
+"""
+
+import argparse
+import os
+import time
+
+from image_shards import load_shards
+from preprocess import load_dataset
+
+
+def images_per_s(ds, batches, warmup, step=None):
+    it = iter(ds)
+    for _ in range(warmup):
+        images, labels = next(it)
+        if step:
+            step(images, labels)
+    n = 0
+    start = time.perf_counter()
+    for _ in range(batches):
+        try:
+            images, labels = next(it)
+        except StopIteration:
+            break
+        if step:
+            step(images, labels)
+        n += int(images.shape[0])
+    return n / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", type=str, required=True, help="Split folder root or split_manifest.csv")
+    parser.add_argument("--shards", type=str, required=True, help="Shard folder from image_shards.py")
+    parser.add_argument("--split", type=str, default="train")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batches", type=int, default=200, help="Timed batches per pipeline")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed batches (fills buffers)")
+    parser.add_argument("--train-step", action="store_true", help="Also run model.train_on_batch on every batch")
+    args = parser.parse_args()
+
+    if args.data.endswith(".csv"):
+        loader = load_dataset(args.data, batch_size=args.batch_size, split=args.split)
+    else:
+        loader = load_dataset(os.path.join(args.data, args.split), batch_size=args.batch_size)
+    shards = load_shards(args.shards, args.split, batch_size=args.batch_size)
+
+    step = None
+    if args.train_step:
+        from model import build_model
+        model = build_model()
+        step = lambda x, y: model.train_on_batch(x, y)
+
+    results = {
+        "loader": images_per_s(loader, args.batches, args.warmup, step),
+        "shards": images_per_s(shards, args.batches, args.warmup, step),
+    }
+
+    print("=" * 50)
+    print(f"{args.split} split, batch {args.batch_size}, {args.batches} batches, "
+          f"{os.cpu_count()} CPUs{', with train step' if step else ''}")
+    print("=" * 50)
+    for name, rate in results.items():
+        print(f"{name:<8} {rate:>10.1f} img/s   {rate / results['loader']:5.2f}x")
+    print("=" * 50)
@@ -0,0 +1,76 @@
+"""
+Single-image latency: model.predict vs the compiled inference function
+
+Usage:
+    python bench_latency.py [--model path] [--runs 200] [--max-batch-size 32]
+
+Reports first-call and steady-state p50/p99 latency for both paths and
+checks that the compiled function is not retraced for batch sizes
+1..max_batch_size.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from deepfake_detector import DeepFakeDetector, INPUT_SHAPE
+
+
+def latencies(fn, batch, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(batch)
+        times.append((time.perf_counter() - start) * 1000)
+    return np.array(times)
+
+
+def report(name, first_ms, times):
+    print(f"{name:<16} first {first_ms:8.2f} ms | "
+          f"p50 {np.percentile(times, 50):7.2f} ms | p99 {np.percentile(times, 99):7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", type=str, default=None, help="Path to .keras model")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    # lazy=True: no warmup, so the compiled path's first call below is a real
+    # cold call (tracing + first run); only the model load is timed here
+    detector = DeepFakeDetector(args.model, max_batch_size=args.max_batch_size, lazy=True)
+    start = time.perf_counter()
+    detector.model
+    load_ms = (time.perf_counter() - start) * 1000
+
+    batch = np.random.rand(1, *INPUT_SHAPE).astype(np.float32)
+
+    def old_path(x):
+        return detector.model.predict(x, verbose=0)
+
+    start = time.perf_counter()
+    old_path(batch)
+    old_first = (time.perf_counter() - start) * 1000
+    old_times = latencies(old_path, batch, args.runs)
+
+    start = time.perf_counter()
+    detector.predict_scores(batch)
+    new_first = (time.perf_counter() - start) * 1000
+    new_times = latencies(detector.predict_scores, batch, args.runs)
+
+    traces_before = detector.trace_count
+    for n in range(1, args.max_batch_size + 1):
+        detector.predict_scores(np.random.rand(n, *INPUT_SHAPE).astype(np.float32))
+    traces_after = detector.trace_count
+
+    print("=" * 70)
+    print(f"Single-image latency ({args.runs} runs, model load {load_ms:.0f} ms, first calls exclude it)")
+    print("=" * 70)
+    report("model.predict", old_first, old_times)
+    report("compiled", new_first, new_times)
+    print(f"Speedup (p50): {np.percentile(old_times, 50) / np.percentile(new_times, 50):.2f}x")
+    print(f"Traces: {traces_before} after the batch-1 runs, {traces_after} after batch sizes 1..{args.max_batch_size}")
+    print("✅ No retracing" if traces_after == traces_before else "❌ Retracing detected")
+    print("=" * 70)
@@ -0,0 +1,88 @@
+"""
+Near-duplicate lookup benchmark: multi-index hash vs linear scan
+
+Usage:
+    python bench_near_dup.py                                   # 100k random 64-bit hashes
+    python bench_near_dup.py --manifest C:/DeepFakeGuard-ML/dataset/clean_manifest.sqlite
+    python bench_near_dup.py --count 300000 --radius 8
+
+Runs the clean_images.find_duplicates pattern (query, then add when no
+match) over the hashes and reports, per index:
+  - linear : numpy XOR + popcount against every stored hash
+  - mih    : perceptual_hash.MultiIndexHash
+the total time, hashes/s and, for mih, the average fraction of the index
+inspected per query. Both must report the same number of near duplicates.
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from perceptual_hash import MultiIndexHash, _popcount64
+
+
+def load_hashes(args):
+    if args.manifest:
+        from image_manifest import ImageManifest
+        manifest = ImageManifest(args.manifest)
+        hashes = [int(r["phash"], 16) for r in manifest.rows("ok") if r["phash"]]
+        manifest.close()
+        return hashes[:args.count] if args.count else hashes
+    rng = random.Random(args.seed)
+    base = [rng.getrandbits(64) for _ in range(args.count)]
+    # ~5% near copies (2 flipped bits) so there is something to find
+    for i in rng.sample(range(len(base)), len(base) // 20):
+        base[i] = base[rng.randrange(len(base))] ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64))
+    return base
+
+
+def run_linear(hashes, radius):
+    stored = np.zeros(len(hashes), dtype=np.uint64)
+    n = found = 0
+    for value in hashes:
+        if n and (_popcount64(stored[:n] ^ np.uint64(value)) <= radius).any():
+            found += 1
+            continue
+        stored[n] = value
+        n += 1
+    return found, None
+
+
+def run_mih(hashes, radius):
+    index = MultiIndexHash(radius)
+    found = queries = 0
+    for value in hashes:
+        if len(index):
+            queries += 1
+            if index.query(value, radius):
+                found += 1
+                continue
+        index.add(value)
+    return found, index.candidates_checked / max(1, queries) / max(1, len(index))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest", type=str, default=None, help="clean_manifest.sqlite (pHashes of kept images)")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--radius", type=int, default=6)
+    parser.add_argument("--skip-linear", action="store_true", help="Linear scan is slow on big sets")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    hashes = load_hashes(args)
+    runs = [("mih", run_mih)] + ([] if args.skip_linear else [("linear", run_linear)])
+
+    print("=" * 64)
+    print(f"{len(hashes):,} hashes, radius {args.radius}")
+    print("=" * 64)
+    for name, fn in runs:
+        start = time.perf_counter()
+        found, inspected = fn(hashes, args.radius)
+        elapsed = time.perf_counter() - start
+        extra = f"   inspected {inspected:.2%} / query" if inspected is not None else ""
+        print(f"{name:<8} {elapsed:>8.2f} s   {len(hashes) / elapsed:>10,.0f} hashes/s   "
+              f"near dups {found:,}{extra}")
+    print("=" * 64)
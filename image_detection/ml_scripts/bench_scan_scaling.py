@@ -0,0 +1,78 @@
+"""
+Scaling benchmark for scan_images.py --workers
+
+Usage:
+    python bench_scan_scaling.py <image_dir> [--limit 5000] [--max-workers 64]
+
+Scans the same image sample with 1, 2, 4, ... N worker processes. Each
+run splits the machine's cores evenly between workers (intra-op threads
+= cores / workers) and writes to a throwaway folder. Prints images/s and
+speedup per configuration so the process/thread split can be chosen per
+machine.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from scan_images import build_parser, run, walk_images
+
+
+def link_sample(image_dir, limit, dest):
+    """
+    Hardlink (or copy) the first `limit` images into dest so every run scans the same files
+    """
+    for i, path in enumerate(walk_images(image_dir)):
+        if i >= limit:
+            break
+        target = os.path.join(dest, f"{i:08d}{os.path.splitext(path)[1]}")
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copy2(path, target)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("image_dir", type=str)
+    parser.add_argument("--limit", type=int, default=5000, help="Images per run")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--backend", choices=["keras", "tflite"], default="keras")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = []
+    n = 1
+    while n <= args.max_workers:
+        counts.append(n)
+        n *= 2
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = os.path.join(tmp, "sample")
+        os.makedirs(sample)
+        link_sample(args.image_dir, args.limit, sample)
+
+        for workers in counts:
+            out = os.path.join(tmp, f"out_{workers}.jsonl")
+            scan_args = build_parser().parse_args([
+                sample, "--out", out,
+                "--workers", str(workers),
+                "--batch-size", str(args.batch_size),
+                "--backend", args.backend,
+            ])
+            progress, elapsed = run(scan_args)
+            rows.append((workers, max(1, cpus // workers), progress.processed / elapsed))
+
+    base = rows[0][2]
+    print("\n" + "=" * 50)
+    print(f"Scan scaling ({args.limit} images, {cpus} cores)")
+    print("=" * 50)
+    print(f"{'workers':>8}{'intra':>8}{'img/s':>12}{'speedup':>10}")
+    for workers, intra, rate in rows:
+        print(f"{workers:>8}{intra:>8}{rate:>12.1f}{rate / base:>9.2f}x")
+    print("=" * 50)
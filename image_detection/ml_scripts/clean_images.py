@@ -1,49 +1,227 @@
-from pathlib import Path
+"""
+Incremental, parallel image dataset cleaning
+
+Usage:
+    python clean_images.py                          # clean DATASET_ROOT
+    python clean_images.py <dataset_root> --workers 8 --radius 6
+    python clean_images.py --dry-run                # flag only, delete nothing
+
+1. Walk the tree and stat every image; files whose size and mtime match
+   the manifest (see image_manifest.py) are not opened again
+2. New or changed files are verified, SHA-256 hashed (streamed, one open
+   per file) and perceptually hashed in a process pool; rows are saved to
+   the manifest in batches, so an interrupted run keeps its progress
+3. Duplicates: exact (same SHA-256) and near (pHash within --radius bits,
+   looked up in a multi-index hash). Files kept by an earlier run stay kept; new
+   files are checked in path order against everything kept so far
+4. Corrupted files and exact duplicates are deleted, as before; near
+   duplicates are only flagged in the manifest unless --near-duplicates delete
+"""
+
+import argparse
+import hashlib
+import multiprocessing as mp
+import os
+import time
+
 from PIL import Image
-import hashlib, os
 from tqdm import tqdm
 
-dataset_root = Path("C:/DeepFakeGuard-ML/dataset/image_face")
+from image_manifest import ImageManifest, default_manifest_path, label_of, to_relpath
+from perceptual_hash import MultiIndexHash, phash
 
-def is_corrupted(fp):
+DATASET_ROOT = "C:/DeepFakeGuard-ML/dataset/image_face"
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+HASH_CHUNK_SIZE = 1 << 20
+NEAR_DUP_RADIUS = 6          # max Hamming distance (of 64 bits) for a near duplicate
+SAVE_EVERY = 2000            # manifest rows per commit while inspecting
+
+
+# ---------- WALK ----------
+def walk_images(root):
+    """
+    Yield (relpath, size, mtime_ns) for every image under root, sorted
+    """
     try:
-        Image.open(fp).verify()
-        return False
-    except Exception:
-        return True
-
-def md5(fp):
-    with open(fp,'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
-
-deleted_corrupted = 0
-deleted_duplicates = 0
-seen = set()
-files = [f for f in dataset_root.rglob("*") if f.suffix.lower() in [".jpg",".jpeg",".png"]]
-total = len(files)
-print(f"🧹 Starting cleaning process for {total:,} images...\n")
-
-for i, file in enumerate(tqdm(files, desc="Cleaning Progress", unit="img")):
+        entries = sorted(os.scandir(root), key=lambda e: e.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk_images(entry.path)
+        elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS:
+            st = entry.stat()
+            yield entry.path, st.st_size, st.st_mtime_ns
+
+
+# ---------- INSPECT (worker) ----------
+def inspect_file(job):
+    """
+    Verify + hash one file; returns a manifest row
+    """
+    root, rel, size, mtime_ns = job
+    row = {"path": rel, "size": size, "mtime_ns": mtime_ns, "sha256": None, "phash": None,
+           "status": "ok", "duplicate_of": None, "distance": None, "error": None}
     try:
-        if is_corrupted(file):
-            os.remove(file)
-            deleted_corrupted += 1
+        with open(os.path.join(root, rel), "rb") as f:
+            h = hashlib.sha256()
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+            row["sha256"] = h.hexdigest()
+
+            f.seek(0)
+            with Image.open(f) as img:
+                img.verify()
+            # verify() does not decode pixel data; hashing does, which
+            # also catches truncated files
+            f.seek(0)
+            with Image.open(f) as img:
+                row["phash"] = f"{phash(img):016x}"
+    except Exception as e:
+        row["status"] = "corrupted"
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def inspect_changed(root, manifest, workers):
+    """
+    Inspect new / changed files; returns the set of inspected relpaths
+    """
+    known = manifest.stat_index()
+    seen, todo = set(), []
+    for path, size, mtime_ns in walk_images(root):
+        rel = to_relpath(root, path)
+        seen.add(rel)
+        if known.get(rel) != (size, mtime_ns):
+            todo.append((root, rel, size, mtime_ns))
+
+    vanished = [p for p in known if p not in seen]
+    if vanished:
+        manifest.remove(vanished)
+    print(f"🧹 {len(seen):,} images | {len(todo):,} new or changed | "
+          f"{len(seen) - len(todo):,} unchanged | {len(vanished):,} gone since last run")
+    if not todo:
+        return set(), 0.0
+
+    start = time.time()
+    buffer = []
+    with mp.Pool(workers) as pool:
+        for row in tqdm(pool.imap_unordered(inspect_file, todo, chunksize=64),
+                        total=len(todo), desc="Inspecting", unit="img"):
+            buffer.append(row)
+            if len(buffer) >= SAVE_EVERY:
+                manifest.upsert(buffer)
+                buffer = []
+    manifest.upsert(buffer)
+    return {job[1] for job in todo}, time.time() - start
+
+
+# ---------- DUPLICATES ----------
+def find_duplicates(manifest, changed, radius):
+    """
+    Assign duplicate / near_duplicate / ok to new rows and to rows whose
+    kept original disappeared; returns the status updates
+    """
+    rows = list(manifest.rows())
+    stable = {r["path"] for r in rows if r["status"] == "ok" and r["path"] not in changed}
+
+    by_sha = {}
+    index = MultiIndexHash(radius)
+    for r in rows:
+        if r["path"] in stable:
+            by_sha.setdefault(r["sha256"], r["path"])
+            index.add(int(r["phash"], 16), r["path"])
+
+    pending = [
+        r for r in rows
+        if r["status"] != "corrupted" and r["path"] not in stable
+        and (r["path"] in changed or r["duplicate_of"] not in stable)
+    ]
+
+    updates = []
+    for r in pending:
+        value = int(r["phash"], 16)
+        if r["sha256"] in by_sha:
+            updates.append((r["path"], "duplicate", by_sha[r["sha256"]], 0))
             continue
-        h = md5(file)
-        if h in seen:
-            os.remove(file)
-            deleted_duplicates += 1
-        else:
-            seen.add(h)
-    except Exception:
-        continue
-    # print progress every 500 files
-    if i % 500 == 0 and i > 0:
-        print(f"→ Processed {i:,}/{total:,} | "
-              f"Corrupted removed: {deleted_corrupted} | "
-              f"Duplicates removed: {deleted_duplicates}")
-
-print("\n✅ Cleaning complete!")
-print(f"🗑️ Corrupted removed: {deleted_corrupted}")
-print(f"📄 Duplicates removed: {deleted_duplicates}")
-print(f"📦 Total processed: {total}")
+        matches = index.query(value, radius)
+        if matches:
+            distance, _, original = matches[0]
+            updates.append((r["path"], "near_duplicate", original, distance))
+            continue
+        updates.append((r["path"], "ok", None, None))
+        by_sha[r["sha256"]] = r["path"]
+        index.add(value, r["path"])
+
+    manifest.set_status(updates)
+    return updates
+
+
+# ---------- ACTIONS ----------
+def delete_flagged(root, manifest, statuses):
+    removed = {}
+    gone = []
+    for status in statuses:
+        for r in manifest.rows(status):
+            try:
+                os.remove(os.path.join(root, r["path"]))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ Could not delete {r['path']}: {e}")
+                continue
+            gone.append(r["path"])
+            removed[status] = removed.get(status, 0) + 1
+    manifest.remove(gone)
+    return removed
+
+
+def run(args):
+    start = time.time()
+    manifest = ImageManifest(args.manifest or default_manifest_path(args.root))
+    try:
+        changed, inspect_s = inspect_changed(args.root, manifest, args.workers)
+        updates = find_duplicates(manifest, changed, args.radius)
+
+        cross_label = sum(
+            1 for path, status, original, _ in updates
+            if status == "near_duplicate" and label_of(path) != label_of(original)
+        )
+        stats = manifest.stats()
+
+        removed = {}
+        if not args.dry_run:
+            statuses = ["corrupted", "duplicate"]
+            if args.near_duplicates == "delete":
+                statuses.append("near_duplicate")
+            removed = delete_flagged(args.root, manifest, statuses)
+    finally:
+        manifest.close()
+
+    elapsed = time.time() - start
+    print("\n✅ Cleaning complete!")
+    print(f"📦 Kept (ok)          : {stats.get('ok', 0):,}")
+    print(f"🗑️ Corrupted          : {stats.get('corrupted', 0):,} ({removed.get('corrupted', 0):,} deleted)")
+    print(f"📄 Exact duplicates   : {stats.get('duplicate', 0):,} ({removed.get('duplicate', 0):,} deleted)")
+    print(f"🪞 Near duplicates    : {stats.get('near_duplicate', 0):,} within {args.radius} bits "
+          f"({removed.get('near_duplicate', 0):,} deleted)")
+    if cross_label:
+        print(f"⚠️ {cross_label:,} new near duplicates sit in a different class folder than their original")
+    if changed:
+        print(f"⏱️ Inspected {len(changed):,} files in {inspect_s:.1f} s ({len(changed) / max(inspect_s, 1e-9):,.0f} img/s)")
+    print(f"⏱️ Total {elapsed:.1f} s | manifest: {args.manifest or default_manifest_path(args.root)}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Verify, hash and de-duplicate an image dataset (incremental)")
+    parser.add_argument("root", nargs="?", default=DATASET_ROOT, help="Dataset root folder")
+    parser.add_argument("--manifest", type=str, default=None, help="Manifest file (default: <root>/clean_manifest.sqlite)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Inspection processes")
+    parser.add_argument("--radius", type=int, default=NEAR_DUP_RADIUS, help="Near-duplicate Hamming radius (bits)")
+    parser.add_argument("--near-duplicates", choices=["flag", "delete"], default="flag")
+    parser.add_argument("--dry-run", action="store_true", help="Only update the manifest, delete nothing")
+    return parser
+
+
+if __name__ == "__main__":
+    run(build_parser().parse_args())
@@ -0,0 +1,100 @@
+"""
+Export the DeepFake Keras model to TFLite
+
+Usage:
+    python convert_tflite.py --mode float16
+    python convert_tflite.py --mode int8 --data C:/DeepFakeGuard-ML/dataset_split --calib-samples 300
+
+Modes:
+  - fp32    : plain conversion
+  - float16 : float16 weights (about half the size, float compute)
+  - int8    : full-integer INT8, calibrated on images from the
+              dataset_split/<split>/<real|fake>/<subfolder>/ layout written
+              by split_dataset_with_subfolders.py
+"""
+
+import argparse
+import os
+import random
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+from image_loader import load_image
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ml_models")
+KERAS_MODEL_PATH = os.path.join(MODELS_DIR, "deepfake_detector_FINAL.keras")
+BASE_PATH = r"C:\DeepFakeGuard-ML\dataset_split"
+
+IMAGE_EXTS = [".jpg", ".jpeg", ".png"]
+
+
+def list_split_images(base_path, split, limit=None, seed=42):
+    """
+    Balanced (path, label) sample from one split; label 1 = real, 0 = fake
+
+    Labels follow image_dataset_from_directory's alphabetical class order
+    (fake=0, real=1), i.e. the model's score is the REAL probability.
+    """
+    rng = random.Random(seed)
+    per_label = None if limit is None else max(1, limit // 2)
+    items = []
+    for label_name, label in [("real", 1), ("fake", 0)]:
+        folder = Path(base_path) / split / label_name
+        paths = sorted(p for p in folder.rglob("*") if p.suffix.lower() in IMAGE_EXTS)
+        rng.shuffle(paths)
+        if per_label is not None:
+            paths = paths[:per_label]
+        items.extend((str(p), label) for p in paths)
+    rng.shuffle(items)
+    return items
+
+
+def representative_dataset(base_path, split, samples):
+    items = list_split_images(base_path, split, limit=samples)
+    if not items:
+        raise SystemExit(f"❌ No calibration images found under {base_path}/{split}")
+    print(f"🎯 Calibrating on {len(items)} images from {split}")
+
+    def gen():
+        for path, _ in items:
+            yield [np.expand_dims(load_image(path), axis=0)]
+    return gen
+
+
+def convert(model_path, mode, base_path=BASE_PATH, split="train", samples=200):
+    model = tf.keras.models.load_model(model_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+    if mode == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == "int8":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset(base_path, split, samples)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+
+    return converter.convert()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", type=str, default=KERAS_MODEL_PATH, help="Keras model to convert")
+    parser.add_argument("--mode", choices=["fp32", "float16", "int8"], default="float16")
+    parser.add_argument("--out", type=str, default=None, help="Output .tflite path")
+    parser.add_argument("--data", type=str, default=BASE_PATH, help="dataset_split root (int8 calibration)")
+    parser.add_argument("--calib-split", type=str, default="train")
+    parser.add_argument("--calib-samples", type=int, default=200)
+    args = parser.parse_args()
+
+    out = args.out or os.path.splitext(args.model)[0] + f"_{args.mode}.tflite"
+
+    print(f"🔧 Converting {args.model} ({args.mode})...")
+    tflite_model = convert(args.model, args.mode, args.data, args.calib_split, args.calib_samples)
+    with open(out, "wb") as f:
+        f.write(tflite_model)
+
+    print(f"✅ Saved: {out} ({len(tflite_model) / 1e6:.2f} MB)")
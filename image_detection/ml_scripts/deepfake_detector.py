@@ -2,13 +2,30 @@
 DeepFake Image Detector
 Model: deepfake_detector_FINAL.keras
 Threshold: 0.65 (Optimized)
+
+TensorFlow is imported lazily: the model is loaded on the first prediction
+or an explicit warmup(), so importing this module (or ml_scripts) is cheap.
 """
 
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing import image
 import numpy as np
 import os
+import threading
+
+try:
+    from .image_loader import ImageDecoder
+    from .tflite_backend import TFLiteModel
+    from .verdict_cache import VerdictCache, file_sha256, load_model_identity
+except ImportError:
+    from image_loader import ImageDecoder
+    from tflite_backend import TFLiteModel
+    from verdict_cache import VerdictCache, file_sha256, load_model_identity
+
+BACKENDS = ['keras', 'tflite']
+INPUT_SHAPE = (224, 224, 3)
+DEFAULT_MODELS = {
+    'keras': 'deepfake_detector_FINAL.keras',
+    'tflite': 'deepfake_detector_FINAL_float16.tflite'
+}
 
 class DeepFakeDetector:
     """
@@ -17,22 +34,72 @@ class DeepFakeDetector:
     Val AUC: 0.8048
     """
     
-    def __init__(self, model_path=None, threshold=0.65):
+    def __init__(self, model_path=None, threshold=0.65, decoder=None, cache=None,
+                 backend='keras', num_threads=None, max_batch_size=32, lazy=True):
         """
         Initialize detector
         
         Args:
-            model_path: Path to .keras model file (optional)
+            model_path: Path to .keras / .tflite model file (optional)
             threshold: Decision threshold (0.65 recommended)
+            decoder: Image decode stage (optional, defaults to ImageDecoder())
+            cache: VerdictCache for raw scores of already-seen images (optional)
+            backend: 'keras' or 'tflite' (see convert_tflite.py)
+            num_threads: TFLite interpreter threads (tflite backend only)
+            max_batch_size: Largest batch sent to the model in one call;
+                            bigger inputs are split into slices of this size
+            lazy: Defer model loading to the first prediction / warmup()
+                  (False = load and warm up now)
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        
         # Default model path
         if model_path is None:
             current_dir = os.path.dirname(os.path.abspath(__file__))
-            model_path = os.path.join(current_dir, '..', 'ml_models', 'deepfake_detector_FINAL.keras')
+            model_path = os.path.join(current_dir, '..', 'ml_models', DEFAULT_MODELS[backend])
         
-        self.model = load_model(model_path)
+        self.model_path = model_path
+        self.backend = backend
+        self.num_threads = num_threads
         self.threshold = threshold
-        print(f"✅ DeepFake Detector loaded (Threshold: {threshold})")
+        self.decoder = decoder if decoder is not None else ImageDecoder()
+        self.cache = cache
+        self.model_id = load_model_identity(model_path) if cache is not None else None
+        self.max_batch_size = max_batch_size
+        self._model = None
+        self._infer = None
+        self._load_lock = threading.Lock()
+        
+        if not lazy:
+            self.warmup()
+    
+    @property
+    def model(self):
+        """
+        Underlying Keras model / TFLiteModel (loaded on first access)
+        """
+        self._ensure_loaded()
+        return self._model
+    
+    @property
+    def is_loaded(self):
+        return self._model is not None
+    
+    def _ensure_loaded(self):
+        if self._model is not None:
+            return
+        with self._load_lock:
+            if self._model is not None:
+                return
+            if self.backend == 'tflite':
+                model = TFLiteModel(self.model_path, num_threads=self.num_threads)
+            else:
+                from tensorflow.keras.models import load_model
+                model = load_model(self.model_path)
+            self._infer = self._build_infer_fn(model)
+            self._model = model
+            print(f"✅ DeepFake Detector loaded (Backend: {self.backend}, Threshold: {self.threshold})")
     
     def predict(self, image_path):
         """
@@ -49,17 +116,95 @@ class DeepFakeDetector:
                 'raw_score': float (0-1)
             }
         """
-        # Load and resize to 224x224
-        img = image.load_img(image_path, target_size=(224, 224))
+        key = self._cache_key(image_path) if self.cache is not None else None
+        if key is not None:
+            raw_score = self.cache.get(key)
+            if raw_score is not None:
+                return self.to_result(raw_score)
         
-        # Convert to array and normalize
-        img_array = image.img_to_array(img)
-        img_array = np.expand_dims(img_array, axis=0)
-        img_array = img_array / 255.0
+        img_array = np.expand_dims(self.decoder.decode(image_path), axis=0)
         
         # Predict
-        raw_score = self.model.predict(img_array, verbose=0)[0][0]
+        raw_score = self.predict_scores(img_array)[0]
         
+        if key is not None:
+            self.cache.put(key, raw_score)
+        return self.to_result(raw_score)
+    
+    def predict_scores(self, batch):
+        """
+        Raw scores for an already preprocessed (N, 224, 224, 3) batch
+        
+        Returns:
+            np.ndarray: (N,) float scores (0-1, higher = more likely REAL)
+        """
+        self._ensure_loaded()
+        batch = np.asarray(batch, dtype=np.float32)
+        scores = []
+        for start in range(0, len(batch), self.max_batch_size):
+            out = self._infer(batch[start:start + self.max_batch_size])
+            scores.append(np.asarray(out).reshape(-1))
+        return np.concatenate(scores) if scores else np.zeros(0, dtype=np.float32)
+    
+    def warmup(self):
+        """
+        Load the model and run dummy batches so the first real request pays
+        no loading/tracing/allocation cost
+        """
+        self._ensure_loaded()
+        for n in sorted({1, self.max_batch_size}):
+            self._infer(np.zeros((n, *INPUT_SHAPE), dtype=np.float32))
+    
+    @property
+    def trace_count(self):
+        """
+        Number of times the compiled Keras inference function was traced
+        (stays at 1 after warmup for every batch size; None for tflite)
+        """
+        if self.backend != 'keras':
+            return None
+        if self._infer is None:
+            return 0
+        return self._infer.experimental_get_tracing_count()
+    
+    def _build_infer_fn(self, model):
+        """
+        Inference callable built once per detector
+        
+        For Keras this is a tf.function with a fixed (None, 224, 224, 3)
+        float32 signature: it is traced once and then reused for every batch
+        size, skipping the data adapter / step function that model.predict
+        rebuilds on each call.
+        """
+        if self.backend != 'keras':
+            return model.predict_on_batch
+        
+        import tensorflow as tf
+        
+        @tf.function(input_signature=[tf.TensorSpec(shape=(None, *INPUT_SHAPE), dtype=tf.float32)])
+        def infer(batch):
+            return model(batch, training=False)
+        
+        return infer
+    
+    @property
+    def cache_stats(self):
+        """
+        Verdict cache counters (hits, memory_hits, disk_hits, misses, evictions)
+        """
+        return dict(self.cache.stats) if self.cache is not None else None
+    
+    def _cache_key(self, image_path):
+        """
+        Cache key from image content, model identity and preprocessing version
+        """
+        preprocessing = getattr(self.decoder, 'version', type(self.decoder).__name__)
+        return VerdictCache.make_key(file_sha256(image_path), self.model_id, preprocessing)
+    
+    def to_result(self, raw_score):
+        """
+        Turn a raw sigmoid score into a prediction dictionary
+        """
         # Determine result
         if raw_score > self.threshold:
             is_fake = False
@@ -73,25 +218,108 @@ class DeepFakeDetector:
         return {
             'is_fake': is_fake,
             'result': result,
-            'confidence': round(confidence, 2),
+            'confidence': round(float(confidence), 2),
             'raw_score': round(float(raw_score), 4)
         }
     
-    def predict_batch(self, image_paths):
+    def predict_batch(self, image_paths, batch_size=32):
         """
         Predict multiple images
         
         Args:
             image_paths: List of image paths
+            batch_size: Number of images sent to the model per call
             
         Returns:
-            list: List of prediction dictionaries
+            list: List of prediction dictionaries (same order as image_paths).
+                  Images that fail to decode get an error dictionary instead
+                  of stopping the batch (see _error_result).
+        """
+        return list(self.iter_predict_batch(image_paths, batch_size=batch_size))
+    
+    def iter_predict_batch(self, image_paths, batch_size=32):
+        """
+        Predict images chunk by chunk, yielding results as each chunk finishes
+        
+        Only one chunk of decoded images is held in memory at a time, so
+        this works on path lists (or lazy iterables) of any length.
+        
+        Args:
+            image_paths: Iterable of image paths
+            batch_size: Number of images sent to the model per call
+            
+        Yields:
+            dict: Prediction dictionary per image, in input order
         """
-        results = []
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        
+        chunk = []
         for img_path in image_paths:
-            result = self.predict(img_path)
-            results.append(result)
+            chunk.append(img_path)
+            if len(chunk) == batch_size:
+                yield from self._predict_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._predict_chunk(chunk)
+    
+    def _predict_chunk(self, image_paths):
+        """
+        Decode a chunk, stack it into one (N, 224, 224, 3) tensor and run the model once
+        
+        Images already in the verdict cache are neither decoded nor sent to the model.
+        """
+        results = [None] * len(image_paths)
+        keys = [None] * len(image_paths)
+        todo = list(range(len(image_paths)))
+        
+        if self.cache is not None:
+            todo = []
+            for i, img_path in enumerate(image_paths):
+                try:
+                    keys[i] = self._cache_key(img_path)
+                except OSError:
+                    # Unreadable file: let the decode stage report the error
+                    todo.append(i)
+                    continue
+                raw_score = self.cache.get(keys[i])
+                if raw_score is not None:
+                    results[i] = self.to_result(raw_score)
+                else:
+                    todo.append(i)
+        
+        decoded = self.decoder.decode_many([image_paths[i] for i in todo])
+        ok = []
+        for i, (arr, err) in zip(todo, decoded):
+            if arr is None:
+                results[i] = self._error_result(err)
+            else:
+                ok.append((i, arr))
+        
+        if ok:
+            batch = np.stack([arr for _, arr in ok])
+            raw_scores = self.predict_scores(batch)
+            new_entries = []
+            for (i, _), score in zip(ok, raw_scores):
+                results[i] = self.to_result(score)
+                if keys[i] is not None:
+                    new_entries.append((keys[i], score))
+            if new_entries:
+                self.cache.put_many(new_entries)
         return results
+    
+    @staticmethod
+    def _error_result(error):
+        """
+        Result dictionary for an image that could not be decoded
+        """
+        return {
+            'is_fake': None,
+            'result': 'ERROR',
+            'confidence': None,
+            'raw_score': None,
+            'error': error
+        }
 
 
 # ============================================
@@ -0,0 +1,176 @@
+"""
+Cached frozen-backbone embeddings
+
+The EfficientNetB0 base is frozen, so its pooled 1280-dim output for an
+image never changes between epochs or head hyperparameters. extract()
+runs the backbone ONCE over a split and stores:
+
+    <cache_root>/<split>-<fingerprint>/
+        embeddings.f16   float16 [rows, 1280] (row-major, memory-mappable)
+        labels.u8        uint8 [rows] (fake=0, real=1)
+        meta.json        rows, fingerprint parts (written last)
+
+The fingerprint combines a hash of the backbone's weight values, the
+image size, the preprocessing version and a hash of the data source
+(shard index, split manifest, or the split folder's file list with sizes
+and mtimes). Changing any of them selects a new cache folder, so a stale
+cache is never read. Folder and manifest sources share
+PREPROCESSING_VERSION (TF decode + resize in float); shard folders use
+the version recorded in their index (image_shards.PREPROCESSING), since
+their pixels are rounded to uint8.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+try:
+    from .image_shards import LEGACY_PREPROCESSING, is_shard_dir, read_index
+    from .model import EMBEDDING_DIM
+    from .preprocess import load_dataset
+    from .split_manifest import meta_path
+except ImportError:
+    from image_shards import LEGACY_PREPROCESSING, is_shard_dir, read_index
+    from model import EMBEDDING_DIM
+    from preprocess import load_dataset
+    from split_manifest import meta_path
+
+CACHE_ROOT = "embedding_cache"
+# Bump when the folder / manifest input pipeline (decode / resize) changes
+PREPROCESSING_VERSION = "tf-bilinear-v1"
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+
+
+# ---------- FINGERPRINT ----------
+def weights_fingerprint(model):
+    h = hashlib.sha256()
+    for w in model.weights:
+        h.update(w.name.encode("utf-8"))
+        h.update(np.ascontiguousarray(w.numpy()).tobytes())
+    return h.hexdigest()
+
+
+def _hash_files(*paths):
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def source_fingerprint(data, split):
+    """
+    Hash of what the loader would read for (data, split)
+    """
+    if str(data).endswith(".csv"):
+        return "manifest:" + _hash_files(data, meta_path(data)) + f":{split}"
+    if is_shard_dir(data):
+        return "shards:" + _hash_files(os.path.join(data, "index.json")) + f":{split}"
+
+    h = hashlib.sha256()
+    folder = os.path.join(data, split)
+    for dirpath, dirnames, files in os.walk(folder):
+        dirnames.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTS:
+                st = os.stat(os.path.join(dirpath, name))
+                rel = os.path.relpath(os.path.join(dirpath, name), folder).replace(os.sep, "/")
+                h.update(f"{rel}|{st.st_size}|{st.st_mtime_ns}\n".encode("utf-8"))
+    return "folder:" + h.hexdigest()
+
+
+def preprocessing_version(data):
+    if is_shard_dir(data):
+        return "shards:" + read_index(data).get("preprocessing", LEGACY_PREPROCESSING)
+    return PREPROCESSING_VERSION
+
+
+def load_split(data, split, img_size, batch_size):
+    """
+    Dataset for one split from a split-folder root, a split manifest or a shard folder
+    """
+    if str(data).endswith(".csv") or is_shard_dir(data):
+        return load_dataset(data, img_size=img_size, batch_size=batch_size, split=split)
+    return load_dataset(os.path.join(data, split), img_size=img_size, batch_size=batch_size)
+
+
+# ---------- CACHE ----------
+class EmbeddingCache:
+    def __init__(self, cache_dir):
+        with open(os.path.join(cache_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        rows = self.meta["rows"]
+        self.cache_dir = cache_dir
+        self.embeddings = np.memmap(os.path.join(cache_dir, "embeddings.f16"), dtype=np.float16,
+                                    mode="r", shape=(rows, EMBEDDING_DIM))
+        self.labels = np.memmap(os.path.join(cache_dir, "labels.u8"), dtype=np.uint8, mode="r", shape=(rows,))
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def dataset(self, batch_size=256, shuffle=True, seed=None):
+        """
+        tf.data over (float32 [B, 1280], float32 [B, 1]); the matrix is read into memory once
+        """
+        import tensorflow as tf
+
+        x = np.asarray(self.embeddings)
+        y = np.asarray(self.labels, dtype=np.float32)[:, None]
+        ds = tf.data.Dataset.from_tensor_slices((x, y))
+        if shuffle:
+            ds = ds.shuffle(len(self), seed=seed, reshuffle_each_iteration=True)
+        ds = ds.batch(batch_size).map(lambda a, b: (tf.cast(a, tf.float32), b))
+        return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def extract(backbone, data, split, cache_root=CACHE_ROOT, img_size=(224, 224), batch_size=64):
+    """
+    Return the EmbeddingCache for (backbone, data, split), running the
+    backbone over the split only when no matching cache exists
+    """
+    import tensorflow as tf
+
+    parts = {
+        "backbone": weights_fingerprint(backbone),
+        "img_size": list(img_size),
+        "preprocessing": preprocessing_version(data),
+        "source": source_fingerprint(data, split),
+    }
+    fingerprint = hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+    cache_dir = os.path.join(cache_root, f"{split}-{fingerprint[:16]}")
+    if os.path.exists(os.path.join(cache_dir, "meta.json")):
+        print(f"⚡ Reusing embeddings {cache_dir}")
+        return EmbeddingCache(cache_dir)
+
+    print(f"🧠 Extracting {split} embeddings → {cache_dir}")
+    tmp_dir = cache_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    rows = 0
+    start = time.time()
+    ds = load_split(data, split, img_size, batch_size)
+    infer = tf.function(lambda x: backbone(x, training=False))
+    with open(os.path.join(tmp_dir, "embeddings.f16"), "wb") as emb_f, \
+         open(os.path.join(tmp_dir, "labels.u8"), "wb") as lab_f:
+        for images, labels in ds:
+            emb = infer(images).numpy().astype(np.float16)
+            emb_f.write(emb.tobytes())
+            lab_f.write(labels.numpy().reshape(-1).astype(np.uint8).tobytes())
+            rows += len(emb)
+            print(f"\r   {rows:,} images ({rows / (time.time() - start):.1f} img/s)", end="", flush=True)
+    print()
+    if rows == 0:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise ValueError(f"No images found for split '{split}' in {data}")
+
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"rows": rows, "dim": EMBEDDING_DIM, "fingerprint": fingerprint, **parts}, f, indent=2)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    return EmbeddingCache(cache_dir)
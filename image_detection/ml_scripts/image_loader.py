@@ -0,0 +1,122 @@
+"""
+Image decoding front end for the DeepFake detector
+
+Decodes images straight to the model input size. JPEGs are decoded with
+PIL's draft mode, which lets libjpeg scale by 1/2, 1/4 or 1/8 during the
+DCT, so a 12 MP photo is never fully decoded just to be shrunk to 224x224.
+Batches are decoded on a thread pool (PIL releases the GIL while decoding).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+TARGET_SIZE = (224, 224)
+
+# Bump whenever decoding/resizing/normalization changes (invalidates cached verdicts)
+PREPROCESSING_VERSION = "pil-nearest-div255-v1"
+
+
+def decode_image(image_path, target_size=TARGET_SIZE, draft=True):
+    """
+    Decode an image to an RGB PIL image, at reduced size for JPEGs when draft=True
+    """
+    height, width = target_size
+    with Image.open(image_path) as img:
+        if draft and img.format == "JPEG":
+            # Picks the smallest DCT scale that is still >= the requested size
+            img.draft("RGB", (width, height))
+        return img.convert("RGB")
+
+
+def preprocess_image(img, target_size=TARGET_SIZE):
+    """
+    Resize a decoded RGB image and normalize it to a float32 array in [0, 1]
+    """
+    height, width = target_size
+    if img.size != (width, height):
+        # Same interpolation as keras.preprocessing.image.load_img
+        img = img.resize((width, height), Image.NEAREST)
+    return np.asarray(img, dtype=np.float32) / 255.0
+
+
+def load_image(image_path, target_size=TARGET_SIZE, draft=True):
+    """
+    Load one image as a normalized float32 array
+
+    Args:
+        image_path: Path to image file (jpg, png)
+        target_size: (height, width) of the output
+        draft: Use reduced-size JPEG decoding when the file allows it
+
+    Returns:
+        np.ndarray: (height, width, 3) array scaled to [0, 1]
+    """
+    return preprocess_image(decode_image(image_path, target_size, draft), target_size)
+
+
+class ImageDecoder:
+    """
+    Pluggable decode stage used by DeepFakeDetector
+
+    Any object with the same decode / decode_many methods can be passed to
+    the detector instead.
+    """
+
+    def __init__(self, target_size=TARGET_SIZE, num_workers=None, draft=True):
+        """
+        Args:
+            target_size: (height, width) of decoded images
+            num_workers: Decode threads for decode_many (default: CPU count, max 8)
+            draft: Use reduced-size JPEG decoding
+        """
+        self.target_size = tuple(target_size)
+        self.num_workers = num_workers or min(8, os.cpu_count() or 1)
+        self.draft = draft
+        self._pool = None
+
+    @property
+    def version(self):
+        """
+        Preprocessing identity used in verdict cache keys
+        """
+        suffix = "-draft" if self.draft else ""
+        return f"{PREPROCESSING_VERSION}-{self.target_size[0]}x{self.target_size[1]}{suffix}"
+
+    def decode(self, image_path):
+        """
+        Decode a single image (errors are raised)
+        """
+        return load_image(image_path, self.target_size, self.draft)
+
+    def decode_many(self, image_paths):
+        """
+        Decode several images in parallel
+
+        Returns:
+            list: One (array, error) tuple per path, in input order.
+                  array is None and error holds the message if decoding failed.
+        """
+        image_paths = list(image_paths)
+        if self.num_workers == 1 or len(image_paths) == 1:
+            return [self._safe_decode(p) for p in image_paths]
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.num_workers)
+        return list(self._pool.map(self._safe_decode, image_paths))
+
+    def _safe_decode(self, image_path):
+        try:
+            return self.decode(image_path), None
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+
+    def close(self):
+        """
+        Shut down the worker pool
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,106 @@
+"""
+Persistent manifest of a cleaned image dataset
+
+One SQLite row per image, keyed by its path relative to the dataset root
+(forward slashes), so the manifest stays valid when the dataset folder
+moves:
+
+    path          e.g. "real/ffhq/00001.jpg"
+    size, mtime   stat() at the time the row was written
+    sha256        streamed content hash (exact duplicates)
+    phash         16-hex-digit perceptual hash (near duplicates), NULL if corrupted
+    status        ok | corrupted | duplicate | near_duplicate
+    duplicate_of  kept file this row duplicates (duplicate / near_duplicate)
+    distance      Hamming distance to duplicate_of (near_duplicate)
+    error         why the file is corrupted
+
+clean_images.py writes it; a file is re-inspected only when its size or
+mtime changed. Rows with status "ok" are the clean dataset.
+"""
+
+import os
+import sqlite3
+
+MANIFEST_NAME = "clean_manifest.sqlite"
+COLUMNS = ["path", "size", "mtime_ns", "sha256", "phash", "status", "duplicate_of", "distance", "error"]
+
+
+def default_manifest_path(dataset_root):
+    return os.path.join(dataset_root, MANIFEST_NAME)
+
+
+def to_relpath(root, path):
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def label_of(relpath):
+    """Class folder of a manifest path ("real/ffhq/1.jpg" -> "real")"""
+    return relpath.split("/", 1)[0]
+
+
+class ImageManifest:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT, phash TEXT,"
+            " status TEXT NOT NULL, duplicate_of TEXT, distance INTEGER, error TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_status ON files (status)")
+        self._db.commit()
+
+    def rows(self, status=None):
+        """
+        Iterate rows as dicts (sorted by path), optionally of one status
+        """
+        sql = f"SELECT {', '.join(COLUMNS)} FROM files"
+        args = ()
+        if status is not None:
+            sql += " WHERE status = ?"
+            args = (status,)
+        for row in self._db.execute(sql + " ORDER BY path", args):
+            yield dict(zip(COLUMNS, row))
+
+    def stats(self):
+        """
+        {status: count}
+        """
+        return dict(self._db.execute("SELECT status, COUNT(*) FROM files GROUP BY status"))
+
+    def stat_index(self):
+        """
+        {path: (size, mtime_ns)} for change detection
+        """
+        return {p: (s, m) for p, s, m in self._db.execute("SELECT path, size, mtime_ns FROM files")}
+
+    def upsert(self, rows):
+        """
+        Insert or replace full rows (dicts with COLUMNS keys) in one commit
+        """
+        self._db.executemany(
+            f"INSERT OR REPLACE INTO files ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            [tuple(r.get(c) for c in COLUMNS) for r in rows]
+        )
+        self._db.commit()
+
+    def set_status(self, updates):
+        """
+        updates: [(path, status, duplicate_of, distance), ...]
+        """
+        self._db.executemany(
+            "UPDATE files SET status = ?, duplicate_of = ?, distance = ? WHERE path = ?",
+            [(status, dup, dist, path) for path, status, dup, dist in updates]
+        )
+        self._db.commit()
+
+    def remove(self, paths):
+        self._db.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in paths])
+        self._db.commit()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        self._db.close()
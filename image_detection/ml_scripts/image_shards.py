@@ -0,0 +1,245 @@
+"""
+Packed, pre-resized TFRecord shards for training
+
+Usage:
+    python image_shards.py --manifest C:/DeepFakeGuard-ML/dataset_split/split_manifest.csv --out C:/DeepFakeGuard-ML/shards
+    python image_shards.py --data C:/DeepFakeGuard-ML/dataset_split --out C:/DeepFakeGuard-ML/shards --splits train val
+
+Converts each split ONCE: images are decoded and resized to 224x224 in a
+process pool and written as raw uint8 pixels into shuffled shards of
+--shard-size records:
+
+    <out>/train-00000.tfrecord ...
+    <out>/index.json   image size, encoding, class names and, per split,
+                       every shard with its record / label counts
+
+load_shards() reads them with a parallel interleave over shard files, a
+shuffle buffer, batched parsing and prefetch, and yields batches in the
+same format as preprocess.load_dataset (float32 0-255 RGB, binary labels
+fake=0 / real=1). preprocess.load_dataset(<out>, split=...) uses it
+directly.
+
+Images are decoded and resized with the same TF ops as the folder /
+manifest loaders (tf.io.decode_image + bilinear tf.image.resize), so
+switching the input pipeline does not change what the model trains on;
+the only difference is rounding to uint8 (at most 0.5 per channel), plus
+JPEG q95 loss with --encoding jpeg. The index records the pipeline as
+"preprocessing" (PREPROCESSING) and embedding_cache keys shard
+embeddings on it.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+INDEX_NAME = "index.json"
+IMG_SIZE = (224, 224)
+SHARD_SIZE = 2048
+CLASS_NAMES = ["fake", "real"]
+# Bump when _encode changes the produced pixels
+PREPROCESSING = "tf-bilinear-uint8-v1"
+# Indexes without a "preprocessing" field: PIL draft decode + PIL bilinear
+LEGACY_PREPROCESSING = "pil-draft-bilinear-uint8-v1"
+
+
+# ---------- WRITE ----------
+def _init_worker():
+    # One TF thread per process (the pool provides the parallelism), no GPU
+    import tensorflow as tf
+
+    tf.config.set_visible_devices([], "GPU")
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _encode(job):
+    """
+    Decode + resize one image (runs in a worker); returns (bytes, label) or None
+
+    Same ops as preprocess.load_manifest_dataset, then rounded to uint8.
+    """
+    import tensorflow as tf
+
+    path, label, img_size, encoding = job
+    try:
+        img = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False)
+        img = tf.image.resize(img, img_size)
+    except Exception:
+        return None
+    pixels = np.clip(np.round(img.numpy()), 0, 255).astype(np.uint8)
+    if encoding == "raw":
+        return pixels.tobytes(), label
+    return tf.io.encode_jpeg(pixels, quality=95).numpy(), label
+
+
+def _example(data, label):
+    import tensorflow as tf
+
+    return tf.train.Example(features=tf.train.Features(feature={
+        "image": tf.train.Feature(bytes_list=tf.train.BytesList(value=[data])),
+        "label": tf.train.Feature(int64_list=tf.train.Int64List(value=[label])),
+    })).SerializeToString()
+
+
+def read_index(out_dir):
+    path = os.path.join(out_dir, INDEX_NAME)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return None
+
+
+def write_shards(items, out_dir, split, img_size=IMG_SIZE, shard_size=SHARD_SIZE,
+                 encoding="raw", workers=None, seed=42):
+    """
+    items: [(path, label_int), ...]; returns the split's index entry
+    """
+    import tensorflow as tf
+
+    os.makedirs(out_dir, exist_ok=True)
+    index = read_index(out_dir) or {"img_size": list(img_size), "encoding": encoding,
+                                    "preprocessing": PREPROCESSING, "class_names": CLASS_NAMES, "splits": {}}
+    if (tuple(index["img_size"]) != tuple(img_size) or index["encoding"] != encoding
+            or index.setdefault("preprocessing", LEGACY_PREPROCESSING) != PREPROCESSING):
+        raise ValueError(f"{out_dir} already holds {index['img_size']} {index['encoding']} shards "
+                         f"({index['preprocessing']} preprocessing)")
+
+    # Shuffle once so every shard mixes labels and sources
+    items = list(items)
+    random.Random(seed).shuffle(items)
+    jobs = [(path, label, tuple(img_size), encoding) for path, label in items]
+
+    shards, writer, current = [], None, None
+    failed = 0
+    start = time.time()
+    with Pool(workers, initializer=_init_worker) as pool:
+        for n, result in enumerate(pool.imap(_encode, jobs, chunksize=32), 1):
+            if result is None:
+                failed += 1
+                continue
+            if writer is None:
+                current = {"file": f"{split}-{len(shards):05d}.tfrecord", "count": 0,
+                           "labels": {name: 0 for name in CLASS_NAMES}}
+                writer = tf.io.TFRecordWriter(os.path.join(out_dir, current["file"] + ".tmp"))
+            data, label = result
+            writer.write(_example(data, label))
+            current["count"] += 1
+            current["labels"][CLASS_NAMES[label]] += 1
+            if current["count"] == shard_size:
+                writer.close()
+                os.replace(os.path.join(out_dir, current["file"] + ".tmp"), os.path.join(out_dir, current["file"]))
+                shards.append(current)
+                writer = None
+            if n % 1000 == 0:
+                print(f"\r📦 {split}: {n:,}/{len(jobs):,} ({n / (time.time() - start):,.0f} img/s)", end="", flush=True)
+        if writer is not None:
+            writer.close()
+            os.replace(os.path.join(out_dir, current["file"] + ".tmp"), os.path.join(out_dir, current["file"]))
+            shards.append(current)
+    print()
+
+    # Drop shards of an earlier, larger conversion of this split
+    keep = {s["file"] for s in shards}
+    for old in (index["splits"].get(split) or {}).get("shards", []):
+        if old["file"] not in keep and os.path.exists(os.path.join(out_dir, old["file"])):
+            os.remove(os.path.join(out_dir, old["file"]))
+
+    entry = {"count": sum(s["count"] for s in shards), "failed": failed, "shards": shards}
+    index["splits"][split] = entry
+    with open(os.path.join(out_dir, INDEX_NAME + ".tmp"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(os.path.join(out_dir, INDEX_NAME + ".tmp"), os.path.join(out_dir, INDEX_NAME))
+    return entry
+
+
+# ---------- READ ----------
+def is_shard_dir(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, INDEX_NAME))
+
+
+def load_shards(shard_dir, split, batch_size=32, shuffle=True, shuffle_buffer=8192,
+                cycle_length=8, seed=None, img_size=None):
+    """
+    tf.data pipeline over a split's shards: (float32 [B, H, W, 3], float32 [B, 1])
+    """
+    import tensorflow as tf
+
+    index = read_index(shard_dir)
+    if index is None or split not in index["splits"]:
+        raise ValueError(f"No '{split}' shards in {shard_dir}")
+    height, width = index["img_size"]
+    if img_size is not None and tuple(img_size) != (height, width):
+        raise ValueError(f"Shards in {shard_dir} are {height}x{width}, not {img_size[0]}x{img_size[1]}")
+    files = [os.path.join(shard_dir, s["file"]) for s in index["splits"][split]["shards"]]
+    raw = index["encoding"] == "raw"
+
+    ds = tf.data.Dataset.from_tensor_slices(files)
+    if shuffle:
+        ds = ds.shuffle(len(files), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.interleave(
+        lambda f: tf.data.TFRecordDataset(f, buffer_size=8 << 20),
+        cycle_length=min(cycle_length, len(files)),
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=not shuffle,
+    )
+    if shuffle:
+        ds = ds.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+
+    spec = {
+        "image": tf.io.FixedLenFeature([], tf.string),
+        "label": tf.io.FixedLenFeature([], tf.int64),
+    }
+
+    def parse_batch(records):
+        parsed = tf.io.parse_example(records, spec)
+        if raw:
+            images = tf.reshape(tf.io.decode_raw(parsed["image"], tf.uint8), [-1, height, width, 3])
+        else:
+            images = tf.map_fn(lambda b: tf.io.decode_jpeg(b, channels=3), parsed["image"],
+                               fn_output_signature=tf.TensorSpec([height, width, 3], tf.uint8))
+        labels = tf.cast(tf.expand_dims(parsed["label"], -1), tf.float32)
+        return tf.cast(images, tf.float32), labels
+
+    # Parse whole batches at once (one op call per batch instead of per image)
+    ds = ds.batch(batch_size)
+    ds = ds.map(parse_batch, num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+# ---------- MAIN ----------
+def split_items(args, split):
+    if args.manifest:
+        from split_manifest import read_split_manifest
+        return [(path, CLASS_NAMES.index(label)) for path, label in read_split_manifest(args.manifest, split)]
+    from convert_tflite import list_split_images
+    # list_split_images labels real=1 / fake=0, same as CLASS_NAMES
+    return list_split_images(args.data, split)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack image splits into pre-resized TFRecord shards")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--manifest", type=str, help="split_manifest.csv from split_dataset_with_subfolders.py")
+    source.add_argument("--data", type=str, help="Split folder root (<data>/<split>/<label>/...)")
+    parser.add_argument("--out", type=str, required=True, help="Shard output folder")
+    parser.add_argument("--splits", nargs="+", default=["train", "val", "test"])
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help="Records per shard")
+    parser.add_argument("--encoding", choices=["raw", "jpeg"], default="raw",
+                        help="raw uint8 pixels (fastest reads) or JPEG q95 (about 10x smaller)")
+    parser.add_argument("--workers", type=int, default=None, help="Decode processes (default: all cores)")
+    args = parser.parse_args()
+
+    for split in args.splits:
+        start = time.time()
+        items = split_items(args, split)
+        entry = write_shards(items, args.out, split, shard_size=args.shard_size,
+                             encoding=args.encoding, workers=args.workers)
+        elapsed = time.time() - start
+        print(f"✅ {split}: {entry['count']:,} images in {len(entry['shards'])} shards "
+              f"({entry['failed']:,} unreadable) in {elapsed:.1f} s")
+    print(f"📁 Shards + index: {args.out}")
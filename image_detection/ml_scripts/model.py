@@ -1,11 +1,75 @@
 import tensorflow as tf
 from tensorflow.keras import layers, models
 
-def build_model(input_shape=(224, 224, 3)):
+EMBEDDING_DIM = 1280   # EfficientNetB0 pooled features
+
+
+def build_backbone(input_shape=(224, 224, 3), weights="imagenet"):
+    """
+    Frozen EfficientNetB0 + global average pooling: image -> 1280-dim embedding
+    """
+    base_model = tf.keras.applications.EfficientNetB0(
+        include_top=False,
+        weights=weights,
+        input_shape=input_shape
+    )
+    base_model.trainable = False
+    x = layers.GlobalAveragePooling2D()(base_model.output)
+    return models.Model(inputs=base_model.input, outputs=x)
+
+
+def backbone_from_model(model):
+    """
+    Backbone (input -> pooled embedding) of a model built by build_model
+    """
+    pool = next(l for l in model.layers if isinstance(l, layers.GlobalAveragePooling2D))
+    return models.Model(inputs=model.input, outputs=pool.output)
+
+
+def _head_layers(x, units, dropout, head_dropout):
+    x = layers.Dropout(dropout)(x)
+    x = layers.Dense(units, activation='relu')(x)
+    x = layers.Dropout(head_dropout)(x)
+    # Output layer (sigmoid = REAL probability; labels fake=0, real=1)
+    return layers.Dense(1, activation='sigmoid')(x)
+
+
+def _compile(model, learning_rate):
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+        loss="binary_crossentropy",
+        metrics=["accuracy"]
+    )
+    return model
+
+
+def build_head(units=128, dropout=0.3, head_dropout=0.2, learning_rate=0.0001):
+    """
+    The classifier head alone, on 1280-dim embeddings (see embedding_cache.py)
+    """
+    inputs = layers.Input(shape=(EMBEDDING_DIM,))
+    return _compile(models.Model(inputs, _head_layers(inputs, units, dropout, head_dropout)), learning_rate)
+
+
+def transfer_head(head, model):
+    """
+    Copy a trained build_head() head's Dense weights into a build_model() model
+    """
+    src = [l for l in head.layers if isinstance(l, layers.Dense)]
+    dst = [l for l in model.layers if isinstance(l, layers.Dense)]
+    if len(src) != len(dst):
+        raise ValueError(f"Head has {len(src)} Dense layers, model has {len(dst)}")
+    for s, d in zip(src, dst):
+        d.set_weights(s.get_weights())
+    return model
+
+
+def build_model(input_shape=(224, 224, 3), weights="imagenet", units=128, dropout=0.3, head_dropout=0.2,
+                learning_rate=0.0001):
     # Load EfficientNetB0 WITHOUT top layer
     base_model = tf.keras.applications.EfficientNetB0(
         include_top=False,
-        weights="imagenet",
+        weights=weights,
         input_shape=input_shape
     )
 
@@ -14,21 +78,10 @@ def build_model(input_shape=(224, 224, 3)):
 
     # Add custom layers
     x = layers.GlobalAveragePooling2D()(base_model.output)
-    x = layers.Dropout(0.3)(x)
-    x = layers.Dense(128, activation='relu')(x)
-    x = layers.Dropout(0.2)(x)
-
-    # Output layer (REAL = 0, FAKE = 1)
-    output = layers.Dense(1, activation='sigmoid')(x)
+    output = _head_layers(x, units, dropout, head_dropout)
 
     # Build final model
     model = models.Model(inputs=base_model.input, outputs=output)
 
     # Compile the model
-    model.compile(
-        optimizer=tf.keras.optimizers.Adam(learning_rate=0.0001),
-        loss="binary_crossentropy",
-        metrics=["accuracy"]
-    )
-
-    return model
+    return _compile(model, learning_rate)
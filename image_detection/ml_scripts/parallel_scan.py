@@ -0,0 +1,230 @@
+"""
+Multi-process sharded image scanning
+
+Used by `scan_images.py --workers N`. The main process walks the tree,
+cuts the sorted file list into fixed-size shards and hands them to N
+worker processes, one shard at a time through each worker's own queue,
+so it always knows which shard every worker holds. Each worker loads its
+own DeepFakeDetector with pinned TensorFlow intra/inter-op thread counts
+and streams result rows back; the main process is the only writer
+(output + checkpoint).
+
+If a worker dies (even before reporting anything, e.g. OOM-killed), the
+unfinished part of its shard is re-queued and a replacement worker is
+started. A shard that keeps crashing workers is written out as errors
+after --max-retries attempts. Rows that a dead worker sent but that
+arrive late are only written for paths still missing.
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import threading
+from collections import Counter, deque
+
+from scan_images import (
+    Checkpoint, JsonlWriter, ParquetWriter, Progress, batched, walk_images
+)
+
+
+def _pin_threads(intra, inter):
+    # Must happen before TensorFlow creates its thread pools
+    os.environ["OMP_NUM_THREADS"] = str(intra)
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(intra)
+    os.environ["TF_NUM_INTEROP_THREADS"] = str(inter)
+
+
+def _worker_main(worker_id, task_q, result_q, cfg):
+    _pin_threads(cfg["intra_threads"], cfg["inter_threads"])
+
+    from deepfake_detector import DeepFakeDetector
+    from image_loader import ImageDecoder
+
+    if cfg["backend"] == "keras":
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(cfg["intra_threads"])
+        tf.config.threading.set_inter_op_parallelism_threads(cfg["inter_threads"])
+
+    detector = DeepFakeDetector(
+        cfg["model"],
+        threshold=cfg["threshold"],
+        backend=cfg["backend"],
+        num_threads=cfg["intra_threads"],
+        decoder=ImageDecoder(num_workers=cfg["decode_threads"]),
+        max_batch_size=cfg["batch_size"],
+        lazy=False
+    )
+    result_q.put(("ready", worker_id, None, None))
+
+    while True:
+        task = task_q.get()
+        if task is None:
+            break
+        shard_id, paths = task
+        for chunk in batched(paths, cfg["batch_size"]):
+            results = detector.predict_batch(chunk, batch_size=cfg["batch_size"])
+            rows = [dict({"error": None}, path=p, **r) for p, r in zip(chunk, results)]
+            result_q.put(("rows", worker_id, shard_id, rows))
+        result_q.put(("done", worker_id, shard_id, None))
+
+
+def _crash_rows(paths, reason):
+    return [{"path": p, "result": "ERROR", "is_fake": None, "confidence": None,
+             "raw_score": None, "error": reason} for p in paths]
+
+
+def scan_parallel(args):
+    ctx = mp.get_context("spawn")  # TensorFlow is not fork-safe
+    result_q = ctx.Queue()
+
+    cpus = os.cpu_count() or 1
+    cfg = {
+        "model": args.model,
+        "backend": args.backend,
+        "threshold": args.threshold,
+        "batch_size": args.batch_size,
+        "intra_threads": args.intra_threads or max(1, cpus // args.workers),
+        "inter_threads": args.inter_threads,
+        "decode_threads": args.decode_threads,
+    }
+    print(f"🧵 {args.workers} workers × {cfg['intra_threads']} intra-op / "
+          f"{cfg['inter_threads']} inter-op threads, shards of {args.shard_size}")
+
+    checkpoint = Checkpoint(args.out + ".checkpoint")
+    if checkpoint.done:
+        print(f"↩️ Resuming: {len(checkpoint.done):,} files already done")
+    if args.format == "parquet":
+        writer = ParquetWriter(args.out, part_size=args.part_size)
+    else:
+        writer = JsonlWriter(args.out)
+    progress = Progress(args.image_dir, len(checkpoint.done))
+
+    # shard_id -> paths not yet received back from a worker
+    pending = {}
+    lock = threading.Lock()
+    feeding_done = threading.Event()
+    todo_q = queue.Queue(maxsize=args.workers * 2)   # walked shards waiting for a worker
+    retry = deque()                                  # re-queued (shard_id, paths)
+
+    def feed():
+        todo = (p for p in walk_images(args.image_dir) if p not in checkpoint.done)
+        for shard_id, paths in enumerate(batched(todo, args.shard_size)):
+            with lock:
+                pending[shard_id] = set(paths)
+            todo_q.put((shard_id, paths))
+        feeding_done.set()
+
+    def start_worker(worker_id):
+        task_q = ctx.Queue()
+        p = ctx.Process(target=_worker_main, args=(worker_id, task_q, result_q, cfg), daemon=True)
+        p.start()
+        return p, task_q
+
+    workers = {wid: start_worker(wid) for wid in range(args.workers)}
+    current = {}   # worker_id -> shard_id assigned and not done yet
+    ready = set()  # workers that loaded their model
+    retries = Counter()
+    startup_failures = 0
+    next_worker_id = args.workers
+    threading.Thread(target=feed, daemon=True).start()
+
+    def assign():
+        for wid, (proc, task_q) in workers.items():
+            if wid in current or not proc.is_alive():
+                continue
+            if retry:
+                task = retry.popleft()
+            else:
+                try:
+                    task = todo_q.get_nowait()
+                except queue.Empty:
+                    return
+            current[wid] = task[0]
+            task_q.put(task)
+
+    def handle(msg):
+        kind, wid, shard_id, rows = msg
+        if kind == "ready":
+            ready.add(wid)
+        elif kind == "rows":
+            # Rows of a dead worker can arrive late, after its shard was
+            # re-run or written out as crash rows: keep only paths still owed
+            with lock:
+                remaining = pending.get(shard_id)
+                if remaining is None:
+                    return
+                rows = [r for r in rows if r["path"] in remaining]
+                remaining.difference_update(r["path"] for r in rows)
+            if rows:
+                checkpoint.mark(writer.write(rows))
+                progress.update(len(rows), sum(r["error"] is not None for r in rows))
+        elif kind == "done":
+            # Only the shard's current owner (or a crash write-out) finishes it
+            if wid is not None and current.get(wid) != shard_id:
+                return
+            current.pop(wid, None)
+            with lock:
+                pending.pop(shard_id, None)
+
+    try:
+        while True:
+            assign()
+            try:
+                handle(result_q.get(timeout=1))
+            except queue.Empty:
+                pass
+
+            for wid, (proc, _) in list(workers.items()):
+                if proc.is_alive():
+                    continue
+                # Drain what the dead worker already sent before re-queueing
+                while True:
+                    try:
+                        handle(result_q.get_nowait())
+                    except queue.Empty:
+                        break
+                del workers[wid]
+                shard_id = current.pop(wid, None)
+                crashed_at_startup = wid not in ready
+                ready.discard(wid)
+                if crashed_at_startup:
+                    # Died before loading the model (e.g. model failed to load)
+                    startup_failures += 1
+                    if startup_failures > args.workers * args.max_retries:
+                        raise RuntimeError("❌ Workers keep failing at startup, aborting scan")
+                print(f"\n⚠️ Worker {wid} exited (code {proc.exitcode}) on shard {shard_id}")
+                new_id, next_worker_id = next_worker_id, next_worker_id + 1
+                workers[new_id] = start_worker(new_id)
+
+                if shard_id is None:
+                    continue
+                with lock:
+                    remaining = sorted(pending.get(shard_id, ()))
+                if not remaining:
+                    with lock:
+                        pending.pop(shard_id, None)
+                    continue
+                if not crashed_at_startup:
+                    retries[shard_id] += 1
+                if retries[shard_id] > args.max_retries:
+                    rows = _crash_rows(remaining, f"worker crashed {retries[shard_id]} times on this shard")
+                    handle(("rows", None, shard_id, rows))
+                    handle(("done", None, shard_id, None))
+                else:
+                    retry.append((shard_id, remaining))
+
+            with lock:
+                finished = feeding_done.is_set() and not pending
+            if finished:
+                break
+    finally:
+        for _, task_q in workers.values():
+            task_q.put(None)
+        for proc, _ in workers.values():
+            proc.join(timeout=30)
+            if proc.is_alive():
+                proc.terminate()
+        checkpoint.mark(writer.close())
+        checkpoint.close()
+
+    return progress
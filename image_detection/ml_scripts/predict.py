@@ -1,22 +1,26 @@
-import tensorflow as tf
 import argparse
 import numpy as np
-from tensorflow.keras.preprocessing import image
+from image_loader import load_image
 
 MODEL_PATH = r"C:\DeepFakeGuard-ML\ml_models\deepfake_model.h5"
 
-# Load the trained model
-print("📥 Loading model...")
-model = tf.keras.models.load_model(MODEL_PATH)
+_model = None
+
+def get_model():
+    # Load the trained model on first use (keeps import and --help fast)
+    global _model
+    if _model is None:
+        import tensorflow as tf
+        print("📥 Loading model...")
+        _model = tf.keras.models.load_model(MODEL_PATH)
+    return _model
 
 def predict_image(img_path):
     # Load and preprocess image
-    img = image.load_img(img_path, target_size=(224, 224))
-    img_array = image.img_to_array(img)
-    img_array = np.expand_dims(img_array, axis=0) / 255.0
+    img_array = np.expand_dims(load_image(img_path), axis=0)
 
     # Predict
-    prediction = model.predict(img_array)[0][0]
+    prediction = get_model().predict(img_array)[0][0]
 
     # Fake >= 0.5 | Real < 0.5
     label = "FAKE" if prediction >= 0.5 else "REAL"
@@ -0,0 +1,245 @@
+"""
+Resumable bulk directory scan with DeepFakeDetector
+
+Usage:
+    python scan_images.py <image_dir> --out results.jsonl
+    python scan_images.py <image_dir> --out results_parquet --format parquet --batch-size 64
+    python scan_images.py <image_dir> --out results.jsonl --workers 16 --intra-threads 4
+
+- Walks the directory tree lazily (sorted, so runs are deterministic)
+- Predicts in batches and writes each batch as soon as it finishes
+- Appends finished paths to <out>.checkpoint; re-running the same command
+  skips everything already recorded there
+- Prints live images/s, error count and ETA
+- --workers N shards the scan across N processes (see parallel_scan.py)
+
+JSONL rows are flushed after every batch. Parquet output is a folder of
+part files: a Parquet file is only readable once its footer is written, so
+rows are buffered and written as a complete part every --part-size rows,
+and only then recorded in the checkpoint.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from deepfake_detector import DeepFakeDetector
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+FIELDS = ["path", "result", "is_fake", "confidence", "raw_score", "error"]
+
+
+def walk_images(root):
+    """
+    Lazily yield image paths under root in sorted order
+    """
+    try:
+        entries = sorted(os.scandir(root), key=lambda e: e.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk_images(entry.path)
+        elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS:
+            yield entry.path
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Checkpoint:
+    """
+    Append-only list of finished paths (one per line)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        self._f = open(path, "a", encoding="utf-8")
+
+    def mark(self, paths):
+        if not paths:
+            return
+        self._f.write("".join(p + "\n" for p in paths))
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self):
+        self._f.close()
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self._f = open(path, "a", encoding="utf-8")
+
+    def write(self, rows):
+        """
+        Returns the paths that are now durably written
+        """
+        self._f.write("".join(json.dumps(r) + "\n" for r in rows))
+        self._f.flush()
+        return [r["path"] for r in rows]
+
+    def close(self):
+        self._f.close()
+        return []
+
+
+class ParquetWriter:
+    def __init__(self, folder, part_size=10000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(folder, exist_ok=True)
+        self._pa = pa
+        self._pq = pq
+        self.folder = folder
+        self.part_size = part_size
+        self._rows = []
+        self._schema = pa.schema([
+            ("path", pa.string()),
+            ("result", pa.string()),
+            ("is_fake", pa.bool_()),
+            ("confidence", pa.float64()),
+            ("raw_score", pa.float64()),
+            ("error", pa.string()),
+        ])
+
+    def write(self, rows):
+        """
+        Returns the paths that are now durably written (empty until a part is full)
+        """
+        self._rows.extend(rows)
+        if len(self._rows) >= self.part_size:
+            return self._flush()
+        return []
+
+    def _flush(self):
+        if not self._rows:
+            return []
+        part = len([f for f in os.listdir(self.folder) if f.endswith(".parquet")])
+        final = os.path.join(self.folder, f"part-{part:05d}.parquet")
+        columns = {name: [r.get(name) for r in self._rows] for name in FIELDS}
+        self._pq.write_table(self._pa.table(columns, schema=self._schema), final + ".tmp")
+        os.replace(final + ".tmp", final)
+        paths = [r["path"] for r in self._rows]
+        self._rows = []
+        return paths
+
+    def close(self):
+        return self._flush()
+
+
+class Progress:
+    """
+    Live images/s, error count and ETA; the total is counted in a background
+    thread so scanning starts immediately
+    """
+
+    def __init__(self, root, already_done):
+        self.start = time.time()
+        self.processed = 0
+        self.errors = 0
+        self.already_done = already_done
+        self.total = None
+        threading.Thread(target=self._count, args=(root,), daemon=True).start()
+
+    def _count(self, root):
+        self.total = sum(1 for _ in walk_images(root))
+
+    def update(self, n, errors):
+        self.processed += n
+        self.errors += errors
+        elapsed = time.time() - self.start
+        rate = self.processed / elapsed if elapsed > 0 else 0
+        if self.total is not None and rate > 0:
+            remaining = max(0, self.total - self.already_done - self.processed)
+            eta = time.strftime("%H:%M:%S", time.gmtime(remaining / rate))
+            total = f"/{self.total - self.already_done:,}"
+        else:
+            eta, total = "counting...", ""
+        sys.stdout.write(f"\r🔍 {self.processed:,}{total} | {rate:6.1f} img/s | "
+                         f"errors {self.errors:,} | ETA {eta}   ")
+        sys.stdout.flush()
+
+
+def scan(args):
+    checkpoint = Checkpoint(args.out + ".checkpoint")
+    if checkpoint.done:
+        print(f"↩️ Resuming: {len(checkpoint.done):,} files already done")
+
+    if args.format == "parquet":
+        writer = ParquetWriter(args.out, part_size=args.part_size)
+    else:
+        writer = JsonlWriter(args.out)
+    detector = DeepFakeDetector(
+        args.model,
+        threshold=args.threshold,
+        backend=args.backend,
+        max_batch_size=args.batch_size
+    )
+    progress = Progress(args.image_dir, len(checkpoint.done))
+
+    todo = (p for p in walk_images(args.image_dir) if p not in checkpoint.done)
+    try:
+        for paths in batched(todo, args.batch_size):
+            results = detector.predict_batch(paths, batch_size=args.batch_size)
+            rows = [dict({"error": None}, path=p, **r) for p, r in zip(paths, results)]
+            # Output first, then checkpoint: a crash can repeat rows but never lose them
+            checkpoint.mark(writer.write(rows))
+            progress.update(len(rows), sum(r["error"] is not None for r in rows))
+    finally:
+        checkpoint.mark(writer.close())
+        checkpoint.close()
+    return progress
+
+
+def build_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("image_dir", type=str, help="Root folder to scan")
+    parser.add_argument("--out", type=str, required=True, help="Output .jsonl file or Parquet folder")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--part-size", type=int, default=10000, help="Rows per Parquet part file")
+    parser.add_argument("--model", type=str, default=None)
+    parser.add_argument("--backend", choices=["keras", "tflite"], default="keras")
+    parser.add_argument("--threshold", type=float, default=0.65)
+    # Multi-process mode
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (1 = in-process scan)")
+    parser.add_argument("--intra-threads", type=int, default=None, help="Intra-op threads per worker (default: cores / workers)")
+    parser.add_argument("--inter-threads", type=int, default=1, help="Inter-op threads per worker")
+    parser.add_argument("--decode-threads", type=int, default=2, help="Image decode threads per worker")
+    parser.add_argument("--shard-size", type=int, default=1024, help="Files per shard")
+    parser.add_argument("--max-retries", type=int, default=2, help="Re-queues per shard after worker crashes")
+    return parser
+
+
+def run(args):
+    if args.workers > 1:
+        from parallel_scan import scan_parallel
+        progress = scan_parallel(args)
+    else:
+        progress = scan(args)
+
+    elapsed = time.time() - progress.start
+    print(f"\n✅ Scan complete: {progress.processed:,} images in {elapsed:.1f} s "
+          f"({progress.errors:,} errors) → {args.out}")
+    return progress, elapsed
+
+
+if __name__ == "__main__":
+    run(build_parser().parse_args())
@@ -1,42 +1,142 @@
-import random, shutil
-from pathlib import Path
+"""
+Copy-free, hash-deterministic train/val/test split
+
+Usage:
+    python split_dataset_with_subfolders.py                       # manifest only
+    python split_dataset_with_subfolders.py --materialize hardlink
+    python split_dataset_with_subfolders.py --key path --ratios 0.7 0.15 0.15
+
+Writes <out>/split_manifest.csv (see split_manifest.py) instead of copying
+images. Every file's split comes from a stable hash of its content
+(SHA-256 from the clean_images.py manifest) or of its path, so re-running
+after adding files never moves existing ones. preprocess.load_dataset()
+reads the manifest directly.
+
+--materialize hardlink|symlink|copy additionally builds the old
+<out>/<split>/<label>/<source>/ folder layout with a thread pool; existing
+entries are left alone, so it is incremental too.
+"""
+
+import argparse
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from tqdm import tqdm
 
+from image_manifest import ImageManifest, default_manifest_path, to_relpath
+from split_manifest import MANIFEST_NAME, SPLITS, assign_split, write_split_manifest
+
 # Input folder (your cleaned dataset)
-root = Path("C:/DeepFakeGuard-ML/dataset/image_face")
-
-# Output folder (new split data will be saved here)
-out = Path("C:/DeepFakeGuard-ML/dataset_split")
-
-# Split ratios
-ratios = {"train": 0.8, "val": 0.1, "test": 0.1}
-random.seed(42)
-
-# Create folder structure
-for s in ratios:
-    for lbl in ["real", "fake"]:
-        (out / s / lbl).mkdir(parents=True, exist_ok=True)
-
-def process_label(label):
-    src_label = root / label
-    for sub in [p for p in src_label.iterdir() if p.is_dir()]:
-        imgs = [p for p in sub.rglob("*") if p.suffix.lower() in [".jpg", ".jpeg", ".png"]]
-        random.shuffle(imgs)
-        n = len(imgs)
-        n_train = int(ratios["train"] * n)
-        n_val = int(ratios["val"] * n)
-        splits = {
-            "train": imgs[:n_train],
-            "val": imgs[n_train:n_train + n_val],
-            "test": imgs[n_train + n_val:]
-        }
-        for s, files in splits.items():
-            dest = out / s / label / sub.name
-            dest.mkdir(parents=True, exist_ok=True)
-            for f in tqdm(files, desc=f"{label}/{sub.name} -> {s}", leave=False):
-                shutil.copy2(f, dest / f.name)
-
-process_label("real")
-process_label("fake")
-print("\n✅ Dataset split complete!")
-print("Output saved in: C:/DeepFakeGuard-ML/dataset_split/")
+ROOT = "C:/DeepFakeGuard-ML/dataset/image_face"
+
+# Output folder (split manifest + optional materialized folders)
+OUT = "C:/DeepFakeGuard-ML/dataset_split"
+
+LABELS = ["real", "fake"]
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+SEED = 42
+
+
+def rows_from_clean_manifest(root):
+    """
+    (relpath, key) for kept files; duplicates share their original's key
+    """
+    manifest = ImageManifest(default_manifest_path(root))
+    try:
+        rows = list(manifest.rows())
+    finally:
+        manifest.close()
+    sha = {r["path"]: r["sha256"] for r in rows}
+    out = []
+    for r in rows:
+        if r["status"] == "corrupted":
+            continue
+        original = r["duplicate_of"] if r["status"] in ("duplicate", "near_duplicate") else r["path"]
+        out.append((r["path"], sha.get(original) or original))
+    return out
+
+
+def rows_from_walk(root):
+    """
+    (relpath, relpath) for every image under the label folders
+    """
+    out = []
+    for label in LABELS:
+        for dirpath, _, files in os.walk(os.path.join(root, label)):
+            for name in files:
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTS:
+                    rel = to_relpath(root, os.path.join(dirpath, name))
+                    out.append((rel, rel))
+    return out
+
+
+def build_rows(root, key, ratios, seed):
+    use_content = key == "content" and os.path.exists(default_manifest_path(root))
+    if key == "content" and not use_content:
+        print("⚠️ No clean_images.py manifest found; splitting by path instead of content")
+    pairs = rows_from_clean_manifest(root) if use_content else rows_from_walk(root)
+
+    rows = []
+    for rel, split_key in pairs:
+        parts = rel.split("/")
+        if parts[0] not in LABELS or not os.path.exists(os.path.join(root, *parts)):
+            continue
+        rows.append({
+            "path": rel,
+            "label": parts[0],
+            "source": parts[1] if len(parts) > 2 else "",
+            "split": assign_split(split_key, ratios, seed),
+        })
+    return rows, "content" if use_content else "path"
+
+
+def materialize(rows, root, out, mode, workers):
+    """
+    Create <out>/<split>/<label>/<source>/<name> links (or copies) in parallel
+    """
+    link = {"hardlink": os.link, "symlink": os.symlink, "copy": shutil.copy2}[mode]
+
+    def place(row):
+        parts = row["path"].split("/")
+        dest = os.path.join(out, row["split"], row["label"], row["source"], parts[-1])
+        if os.path.lexists(dest):
+            return False
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        link(os.path.abspath(os.path.join(root, *parts)), dest)
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        created = sum(tqdm(pool.map(place, rows), total=len(rows), desc=f"{mode} -> {out}", unit="img"))
+    return created
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hash-deterministic split manifest (no copies)")
+    parser.add_argument("--root", type=str, default=ROOT)
+    parser.add_argument("--out", type=str, default=OUT)
+    parser.add_argument("--key", choices=["content", "path"], default="content",
+                        help="Hash file content (needs the clean_images.py manifest) or relative path")
+    parser.add_argument("--ratios", type=float, nargs=3, default=[0.8, 0.1, 0.1], metavar=("TRAIN", "VAL", "TEST"))
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--materialize", choices=["none", "hardlink", "symlink", "copy"], default="none")
+    parser.add_argument("--workers", type=int, default=16, help="Threads for --materialize")
+    args = parser.parse_args()
+
+    start = time.time()
+    ratios = dict(zip(SPLITS, args.ratios))
+    rows, key = build_rows(args.root, args.key, ratios, args.seed)
+    manifest_path = os.path.join(args.out, MANIFEST_NAME)
+    write_split_manifest(manifest_path, rows, args.root, ratios, args.seed, key)
+
+    print(f"\n✅ Split manifest written: {manifest_path} ({len(rows):,} files, key = {key})")
+    for split in SPLITS:
+        for label in LABELS:
+            n = sum(1 for r in rows if r["split"] == split and r["label"] == label)
+            print(f"   {split:<5} {label:<4}: {n:,}")
+
+    if args.materialize != "none":
+        created = materialize(rows, args.root, args.out, args.materialize, args.workers)
+        print(f"🔗 {created:,} new {args.materialize}s under {args.out}")
+    print(f"⏱️ {time.time() - start:.1f} s")
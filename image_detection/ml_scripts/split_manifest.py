@@ -0,0 +1,77 @@
+"""
+Hash-deterministic train/val/test split manifests
+
+A file's split is a pure function of a stable key (its SHA-256 from the
+clean manifest, or its relative path) and the seed: the key is hashed to
+a number in [0, 1) and compared with the cumulative ratios. Adding or
+removing files never moves any other file to a different split.
+
+Near / exact duplicates flagged by clean_images.py use the key of the
+file they duplicate, so a re-encoded copy always lands in the same split
+as its original instead of leaking across train / val / test.
+
+On disk:
+    split_manifest.csv        path,label,source,split (paths relative to root)
+    split_manifest.meta.json  root, ratios, seed, key
+"""
+
+import csv
+import hashlib
+import json
+import os
+
+SPLITS = ["train", "val", "test"]
+DEFAULT_RATIOS = {"train": 0.8, "val": 0.1, "test": 0.1}
+MANIFEST_NAME = "split_manifest.csv"
+FIELDS = ["path", "label", "source", "split"]
+
+
+def assign_split(key, ratios=DEFAULT_RATIOS, seed=42):
+    """
+    Stable split for a key (same key + seed + ratios -> same split, always)
+    """
+    digest = hashlib.sha256(f"{seed}:{key}".encode("utf-8")).digest()
+    x = int.from_bytes(digest[:8], "big") / 2 ** 64
+    total = sum(ratios.values())
+    cumulative = 0.0
+    for split in SPLITS:
+        cumulative += ratios.get(split, 0) / total
+        if x < cumulative:
+            return split
+    return SPLITS[-1]
+
+
+def meta_path(manifest_path):
+    return os.path.splitext(manifest_path)[0] + ".meta.json"
+
+
+def write_split_manifest(manifest_path, rows, root, ratios, seed, key):
+    """
+    rows: dicts with FIELDS keys, written sorted by path (temp file + rename)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(sorted(rows, key=lambda r: r["path"]))
+    os.replace(tmp, manifest_path)
+    with open(meta_path(manifest_path), "w", encoding="utf-8") as f:
+        json.dump({"root": os.path.abspath(root), "ratios": ratios, "seed": seed, "key": key}, f, indent=2)
+
+
+def read_split_manifest(manifest_path, split=None, root=None):
+    """
+    Return [(absolute_path, label), ...] for one split (or all rows)
+
+    root overrides the dataset root stored in the meta file (moved dataset).
+    """
+    if root is None:
+        with open(meta_path(manifest_path), encoding="utf-8") as f:
+            root = json.load(f)["root"]
+    items = []
+    with open(manifest_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if split is None or row["split"] == split:
+                items.append((os.path.join(root, *row["path"].split("/")), row["label"]))
+    return items
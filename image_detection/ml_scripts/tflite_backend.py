@@ -0,0 +1,90 @@
+"""
+TFLite inference backend for the DeepFake detector
+
+TFLiteModel wraps a .tflite file (fp32, float16 or full-integer INT8, see
+convert_tflite.py) behind the same predict / predict_on_batch calls that
+DeepFakeDetector uses on a Keras model.
+
+Re-allocating an interpreter's tensors for a new batch size is expensive,
+so batches are padded up to a power-of-two bucket (1, 2, 4, ... rows) and
+each bucket keeps its own allocated interpreter: a 32 + remainder split
+reuses two ready interpreters instead of resizing twice per call.
+"""
+
+import numpy as np
+
+
+def _make_interpreter(model_path, num_threads):
+    # Prefer the small tflite_runtime wheel on serving boxes
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter(model_path=model_path, num_threads=num_threads)
+
+
+class TFLiteModel:
+    """
+    Keras-like wrapper around a TFLite interpreter
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        """
+        Args:
+            model_path: Path to .tflite file
+            num_threads: Interpreter CPU threads (None = TFLite default)
+        """
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.interpreter = _make_interpreter(model_path, num_threads)
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        # bucket size -> (interpreter, input details, output details)
+        self._buckets = {}
+
+    @staticmethod
+    def bucket_size(n):
+        return 1 << max(0, n - 1).bit_length()
+
+    def _bucket(self, n, sample_shape):
+        if n not in self._buckets:
+            interpreter = self.interpreter if not self._buckets else _make_interpreter(self.model_path, self.num_threads)
+            interpreter.resize_tensor_input(interpreter.get_input_details()[0]["index"], [n, *sample_shape])
+            interpreter.allocate_tensors()
+            self._buckets[n] = (interpreter, interpreter.get_input_details()[0], interpreter.get_output_details()[0])
+        return self._buckets[n]
+
+    def _quantize(self, batch):
+        dtype = self._input["dtype"]
+        if dtype == np.float32:
+            return batch.astype(np.float32, copy=False)
+        scale, zero_point = self._input["quantization"]
+        info = np.iinfo(dtype)
+        q = np.round(batch / scale + zero_point)
+        return np.clip(q, info.min, info.max).astype(dtype)
+
+    def _dequantize(self, out):
+        if self._output["dtype"] == np.float32:
+            return out
+        scale, zero_point = self._output["quantization"]
+        return (out.astype(np.float32) - zero_point) * scale
+
+    def predict_on_batch(self, batch):
+        """
+        Run one (N, 224, 224, 3) batch, returns (N, 1) float scores
+        """
+        batch = np.asarray(batch)
+        n = batch.shape[0]
+        size = self.bucket_size(n)
+        interpreter, input_details, output_details = self._bucket(size, batch.shape[1:])
+        if size != n:
+            batch = np.concatenate([batch, np.zeros((size - n, *batch.shape[1:]), dtype=batch.dtype)])
+
+        interpreter.set_tensor(input_details["index"], self._quantize(batch))
+        interpreter.invoke()
+        out = interpreter.get_tensor(output_details["index"])
+        return self._dequantize(out)[:n]
+
+    def predict(self, batch, verbose=0):
+        return self.predict_on_batch(batch)
@@ -0,0 +1,100 @@
+"""
+Parity report: Keras model vs TFLite exports
+
+Usage:
+    python tflite_parity.py ../ml_models/deepfake_detector_FINAL_float16.tflite \
+        ../ml_models/deepfake_detector_FINAL_int8.tflite --data C:/DeepFakeGuard-ML/dataset_split
+
+For each backend reports AUC, accuracy at the detector threshold,
+raw-score drift against Keras and ms/image.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from convert_tflite import BASE_PATH, KERAS_MODEL_PATH, list_split_images
+from image_loader import ImageDecoder
+from tflite_backend import TFLiteModel
+
+
+def roc_auc(labels, scores):
+    """
+    ROC AUC via the Mann-Whitney rank statistic (ties get average rank)
+    """
+    labels = np.asarray(labels)
+    scores = np.asarray(scores, dtype=np.float64)
+    order = np.argsort(scores, kind="mergesort")
+    ranks = np.empty(len(scores))
+    sorted_scores = scores[order]
+    i = 0
+    while i < len(scores):
+        j = i
+        while j + 1 < len(scores) and sorted_scores[j + 1] == sorted_scores[i]:
+            j += 1
+        ranks[order[i:j + 1]] = (i + j) / 2 + 1
+        i = j + 1
+    n_pos = labels.sum()
+    n_neg = len(labels) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return float("nan")
+    return (ranks[labels == 1].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+
+def score_all(model, batches):
+    scores = []
+    start = time.perf_counter()
+    for batch in batches:
+        scores.append(np.asarray(model.predict_on_batch(batch)).reshape(-1))
+    elapsed = time.perf_counter() - start
+    scores = np.concatenate(scores)
+    return scores, elapsed * 1000 / len(scores)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("tflite_models", nargs="+", help=".tflite files to compare")
+    parser.add_argument("--keras-model", type=str, default=KERAS_MODEL_PATH)
+    parser.add_argument("--data", type=str, default=BASE_PATH, help="dataset_split root")
+    parser.add_argument("--split", type=str, default="test")
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None, help="TFLite interpreter threads")
+    parser.add_argument("--threshold", type=float, default=0.65)
+    args = parser.parse_args()
+
+    items = list_split_images(args.data, args.split, limit=args.samples)
+    if not items:
+        raise SystemExit(f"❌ No images found under {args.data}/{args.split}")
+
+    # Decode once and reuse the same tensors for every backend
+    decoder = ImageDecoder()
+    decoded = decoder.decode_many([p for p, _ in items])
+    decoder.close()
+    keep = [i for i, (arr, _) in enumerate(decoded) if arr is not None]
+    labels = np.array([items[i][1] for i in keep])
+    images = np.stack([decoded[i][0] for i in keep])
+    batches = [images[i:i + args.batch_size] for i in range(0, len(images), args.batch_size)]
+    print(f"📥 {len(images)} images from {args.split} ({len(items) - len(keep)} unreadable)")
+
+    keras_model = tf.keras.models.load_model(args.keras_model)
+    reference, ref_ms = score_all(keras_model, batches)
+
+    rows = [("keras", os.path.getsize(args.keras_model), reference, ref_ms)]
+    for path in args.tflite_models:
+        scores, ms = score_all(TFLiteModel(path, num_threads=args.threads), batches)
+        rows.append((os.path.basename(path), os.path.getsize(path), scores, ms))
+
+    print("\n" + "=" * 96)
+    print(f"{'backend':<44}{'MB':>7}{'AUC':>8}{'acc':>8}{'max|Δ|':>9}{'mean|Δ|':>9}{'ms/img':>9}")
+    print("=" * 96)
+    for name, size, scores, ms in rows:
+        auc = roc_auc(labels, scores)
+        acc = np.mean((scores > args.threshold).astype(int) == labels)
+        diff = np.abs(scores - reference)
+        print(f"{name:<44}{size / 1e6:>7.2f}{auc:>8.4f}{acc:>8.4f}"
+              f"{diff.max():>9.4f}{diff.mean():>9.4f}{ms:>9.2f}")
+    print("=" * 96)
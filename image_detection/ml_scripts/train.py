@@ -9,13 +9,22 @@ TRAIN_PATH = os.path.join(BASE_PATH, "train")
 VAL_PATH = os.path.join(BASE_PATH, "val")
 TEST_PATH = os.path.join(BASE_PATH, "test")
 
+# split_manifest.csv from split_dataset_with_subfolders.py; when it exists the
+# splits are read from it and no copied train/val/test folders are needed
+SPLIT_MANIFEST = os.path.join(BASE_PATH, "split_manifest.csv")
+
 MODEL_SAVE_PATH = r"C:\DeepFakeGuard-ML\ml_models\deepfake_model.h5"
 
 # Load Datasets
 print("📥 Loading datasets...")
-train_ds = load_dataset(TRAIN_PATH)
-val_ds = load_dataset(VAL_PATH)
-test_ds = load_dataset(TEST_PATH)
+if os.path.exists(SPLIT_MANIFEST):
+    train_ds = load_dataset(SPLIT_MANIFEST, split="train")
+    val_ds = load_dataset(SPLIT_MANIFEST, split="val")
+    test_ds = load_dataset(SPLIT_MANIFEST, split="test")
+else:
+    train_ds = load_dataset(TRAIN_PATH)
+    val_ds = load_dataset(VAL_PATH)
+    test_ds = load_dataset(TEST_PATH)
 
 # Build Model
 print("🔧 Building model...")
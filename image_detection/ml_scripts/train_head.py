@@ -0,0 +1,88 @@
+"""
+Train the classifier head on cached backbone embeddings
+
+Usage:
+    python train_head.py --data C:/DeepFakeGuard-ML/dataset_split
+    python train_head.py --data .../split_manifest.csv --units 64 128 256 --dropout 0.2 0.3 --lr 1e-3 1e-4
+    python train_head.py --data .../shards --save ../ml_models/deepfake_head_model.keras
+
+The frozen EfficientNetB0 runs once per split (embedding_cache.extract);
+every head configuration of the sweep then trains on the cached float16
+matrix in seconds. --save rebuilds the full image model with the best
+head's weights (model.build_model + transfer_head), ready for
+DeepFakeDetector.
+"""
+
+import argparse
+import itertools
+import time
+
+import tensorflow as tf
+
+from embedding_cache import CACHE_ROOT, extract
+from model import backbone_from_model, build_backbone, build_head, build_model, transfer_head
+
+BASE_PATH = r"C:\DeepFakeGuard-ML\dataset_split"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Head training / sweeps on cached embeddings")
+    parser.add_argument("--data", type=str, default=BASE_PATH, help="Split folder root, split_manifest.csv or shard folder")
+    parser.add_argument("--backbone", type=str, default=None,
+                        help="Take the backbone from this saved model (default: ImageNet EfficientNetB0)")
+    parser.add_argument("--cache", type=str, default=CACHE_ROOT)
+    parser.add_argument("--units", type=int, nargs="+", default=[128])
+    parser.add_argument("--dropout", type=float, nargs="+", default=[0.3])
+    parser.add_argument("--head-dropout", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--lr", type=float, nargs="+", default=[1e-4])
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--save", type=str, default=None, help="Save the best full model here (.keras)")
+    args = parser.parse_args()
+
+    if args.backbone:
+        backbone = backbone_from_model(tf.keras.models.load_model(args.backbone))
+    else:
+        backbone = build_backbone()
+
+    train = extract(backbone, args.data, "train", cache_root=args.cache)
+    val = extract(backbone, args.data, "val", cache_root=args.cache)
+    print(f"📦 train {len(train):,} | val {len(val):,} embeddings")
+
+    results = []
+    for units, dropout, head_dropout, lr in itertools.product(args.units, args.dropout, args.head_dropout, args.lr):
+        tf.keras.backend.clear_session()
+        head = build_head(units, dropout, head_dropout, lr)
+        early_stop = tf.keras.callbacks.EarlyStopping(patience=5, monitor="val_loss", restore_best_weights=True)
+
+        start = time.time()
+        history = head.fit(
+            train.dataset(args.batch_size),
+            validation_data=val.dataset(args.batch_size, shuffle=False),
+            epochs=args.epochs,
+            callbacks=[early_stop],
+            verbose=0
+        )
+        elapsed = time.time() - start
+        best = max(history.history["val_accuracy"])
+        results.append({"units": units, "dropout": dropout, "head_dropout": head_dropout, "lr": lr,
+                        "val_accuracy": best, "epochs": len(history.history["loss"]), "seconds": elapsed,
+                        "head": head})
+        print(f"units {units:<4} dropout {dropout:<4} head_dropout {head_dropout:<4} lr {lr:<8g} "
+              f"→ val acc {best:.4f} ({len(history.history['loss'])} epochs, {elapsed:.1f} s)")
+
+    best = max(results, key=lambda r: r["val_accuracy"])
+    print("\n🏆 Best: units {units}, dropout {dropout}, head_dropout {head_dropout}, lr {lr:g} "
+          "→ val acc {val_accuracy:.4f}".format(**best))
+
+    if args.save:
+        model = build_model(weights=None if args.backbone else "imagenet", units=best["units"],
+                            dropout=best["dropout"], head_dropout=best["head_dropout"], learning_rate=best["lr"])
+        if args.backbone:
+            # Same backbone weights as the embeddings were computed with
+            source = tf.keras.models.load_model(args.backbone)
+            for dst, src in zip(backbone_from_model(model).layers, backbone_from_model(source).layers):
+                dst.set_weights(src.get_weights())
+        transfer_head(best["head"], model)
+        model.save(args.save)
+        print(f"✅ Full model saved to: {args.save}")
@@ -0,0 +1,142 @@
+"""
+Content-addressed verdict cache for the DeepFake detector
+
+Keys are built from the SHA-256 of the image bytes, the model identity
+(from ml_models/model_info.json) and the preprocessing version, so a new
+model or a decode change never returns stale scores. Only the raw score
+is stored; the REAL/FAKE label is re-derived with the detector's current
+threshold.
+
+Two tiers:
+  - memory : bounded LRU (OrderedDict)
+  - disk   : optional SQLite file that survives restarts
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path):
+    """
+    Streamed SHA-256 of a file's contents
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_model_identity(model_path):
+    """
+    Identify a model by the model_info.json stored next to it
+
+    Falls back to file name + size + mtime when no matching info file exists.
+    """
+    model_dir = os.path.dirname(os.path.abspath(model_path))
+    info_path = os.path.join(model_dir, "model_info.json")
+    if os.path.exists(info_path):
+        with open(info_path) as f:
+            info = json.load(f)
+        if info.get("model_name") == os.path.basename(model_path):
+            return f"{info['model_name']}@{info.get('date', '')}:{info.get('file_size_mb', '')}"
+
+    st = os.stat(model_path)
+    return f"{os.path.basename(model_path)}:{st.st_size}:{int(st.st_mtime)}"
+
+
+class VerdictCache:
+    """
+    Two-tier (LRU memory + SQLite disk) cache of raw model scores
+    """
+
+    def __init__(self, max_items=10000, db_path=None):
+        """
+        Args:
+            max_items: Max entries kept in the in-memory LRU tier
+            db_path: SQLite file for the persistent tier (None = memory only)
+        """
+        self.max_items = max_items
+        self.db_path = db_path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, raw_score REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(content_hash, model_id, preprocessing_version):
+        return f"{content_hash}|{model_id}|{preprocessing_version}"
+
+    def get(self, key):
+        """
+        Return the cached raw score for key, or None on a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT raw_score FROM verdicts WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self.stats["hits"] += 1
+                    self.stats["disk_hits"] += 1
+                    self._remember(key, row[0])
+                    return row[0]
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key, raw_score):
+        """
+        Store a raw score in both tiers
+        """
+        self.put_many([(key, raw_score)])
+
+    def put_many(self, items):
+        """
+        Store several (key, raw_score) pairs with a single disk commit
+        """
+        items = [(key, float(score)) for key, score in items]
+        with self._lock:
+            for key, score in items:
+                self._remember(key, score)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO verdicts (key, raw_score) VALUES (?, ?)",
+                    items
+                )
+                self._db.commit()
+
+    def _remember(self, key, raw_score):
+        self._memory[key] = raw_score
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def __len__(self):
+        return len(self._memory)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,107 @@
+"""
+Load generator for server.py
+
+Usage:
+    python bench_load.py text --concurrency 64 --requests 2000
+    python bench_load.py image --image sample.jpg --concurrency 32 --requests 1000
+
+To compare with and without batching, run the same load against
+    python server.py --max-batch-size 32
+    python server.py --max-batch-size 1
+Reports throughput, p50/p95/p99 latency, status codes and the server's
+mean batch size.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+import aiohttp
+import numpy as np
+
+SAMPLE_TEXTS = [
+    "Hi, are we still meeting for lunch tomorrow?",
+    "Congratulations! You have won a lottery prize. Claim now by paying the registration fee.",
+    "Your OTP is 482913. Click the link to verify your account urgently.",
+    "Please find attached the minutes from yesterday's project meeting. "
+    "Let me know if anything is missing before I send it to the wider team.",
+    "Earn daily guaranteed profit with our crypto investment plan, limited seats.",
+]
+
+
+async def worker(session, url, make_body, headers, n, latencies, statuses):
+    for _ in range(n):
+        start = time.perf_counter()
+        try:
+            async with session.post(url, data=make_body(), headers=headers) as resp:
+                await resp.read()
+                statuses[resp.status] += 1
+        except aiohttp.ClientError as e:
+            statuses[type(e).__name__] += 1
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def main(args):
+    base = f"http://{args.host}:{args.port}"
+    if args.kind == "text":
+        import json
+        url = f"{base}/predict/text"
+        headers = {"Content-Type": "application/json"}
+
+        def make_body():
+            return json.dumps({"text": random.choice(SAMPLE_TEXTS)})
+    else:
+        url = f"{base}/predict/image"
+        headers = {"Content-Type": "application/octet-stream"}
+        with open(args.image, "rb") as f:
+            image_bytes = f.read()
+
+        def make_body():
+            return image_bytes
+
+    latencies, statuses = [], Counter()
+    per_worker = [args.requests // args.concurrency] * args.concurrency
+    for i in range(args.requests % args.concurrency):
+        per_worker[i] += 1
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            worker(session, url, make_body, headers, n, latencies, statuses) for n in per_worker
+        ])
+        elapsed = time.perf_counter() - start
+
+        async with session.get(f"{base}/health") as resp:
+            server_stats = (await resp.json()).get(args.kind, {})
+
+    ok = statuses.get(200, 0)
+    lat = np.array(latencies) if latencies else np.zeros(1)
+    print("=" * 60)
+    print(f"{args.kind} | {args.requests} requests | concurrency {args.concurrency}")
+    print("=" * 60)
+    print(f"Throughput   : {ok / elapsed:.1f} req/s ({elapsed:.1f} s)")
+    print(f"Latency p50  : {np.percentile(lat, 50):.1f} ms")
+    print(f"Latency p95  : {np.percentile(lat, 95):.1f} ms")
+    print(f"Latency p99  : {np.percentile(lat, 99):.1f} ms")
+    print(f"Status codes : {dict(statuses)}")
+    print(f"Mean batch   : {server_stats.get('mean_batch')}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("kind", choices=["text", "image"])
+    parser.add_argument("--image", type=str, help="Image file to upload (image mode)")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.kind == "image" and not args.image:
+        parser.error("--image is required for image load")
+    asyncio.run(main(args))
@@ -0,0 +1,81 @@
+"""
+Startup benchmark: import time and time-to-first-prediction
+
+Usage:
+    python bench_startup.py --image sample.jpg [--repeat 3]
+
+Every measurement runs in a fresh interpreter. Run it on the commit before
+lazy loading and on the current tree to compare; the warm worker row is
+only filled in when `warm_worker.py start` is running.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from loaders import IMAGE_SCRIPTS, ROOT, TEXT_SCRIPTS
+
+SNIPPETS = {
+    "import ml_scripts": (
+        f"import sys; sys.path.insert(0, {repr(ROOT + '/image_detection')}); import ml_scripts"
+    ),
+    "import text predict": (
+        f"import sys; sys.path.insert(0, {TEXT_SCRIPTS!r}); import predict"
+    ),
+    "first image prediction": (
+        f"import sys; sys.path.insert(0, {IMAGE_SCRIPTS!r}); "
+        "from deepfake_detector import DeepFakeDetector; DeepFakeDetector().predict(sys.argv[1])"
+    ),
+    "first text prediction": (
+        f"import sys; sys.path.insert(0, {TEXT_SCRIPTS!r}); "
+        "import predict; predict.predict('Your OTP is 1234, click to verify')"
+    ),
+}
+
+
+def run_cold(code, args, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code, *args], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_warm(command, payload, repeat):
+    from warm_worker import call_worker
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if call_worker(command, payload) is None:
+            return None
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--image", type=str, required=True, help="Image used for the first prediction")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+    args.image = os.path.abspath(args.image)
+
+    baseline = run_cold("pass", [], args.repeat)
+    print("=" * 60)
+    print(f"Startup benchmark (best of {args.repeat}, interpreter start {baseline:.2f} s)")
+    print("=" * 60)
+    for name, code in SNIPPETS.items():
+        seconds = run_cold(code, [args.image], args.repeat)
+        print(f"{name:<28} {seconds:7.2f} s")
+
+    image_warm = run_warm("image", [args.image], args.repeat)
+    text_warm = run_warm("text", ["Your OTP is 1234, click to verify"], args.repeat)
+    if image_warm is None:
+        print(f"{'warm worker':<28}     (not running)")
+    else:
+        print(f"{'warm worker image':<28} {image_warm:7.3f} s")
+        print(f"{'warm worker text':<28} {text_warm:7.3f} s")
+    print("=" * 60)
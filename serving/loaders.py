@@ -0,0 +1,29 @@
+"""
+Shared helpers to import the image and text detectors from serving/
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_SCRIPTS = os.path.join(ROOT, "image_detection", "ml_scripts")
+TEXT_SCRIPTS = os.path.join(ROOT, "text_email_detection", "scripts")
+
+if IMAGE_SCRIPTS not in sys.path:
+    sys.path.insert(0, IMAGE_SCRIPTS)
+
+
+def load_text_predict():
+    """
+    Import text_email_detection/scripts/predict.py as module "text_predict"
+
+    Both script folders have a predict.py, so the text one is loaded by path.
+    """
+    if "text_predict" in sys.modules:
+        return sys.modules["text_predict"]
+    spec = importlib.util.spec_from_file_location("text_predict", os.path.join(TEXT_SCRIPTS, "predict.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["text_predict"] = module
+    spec.loader.exec_module(module)
+    return module
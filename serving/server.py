@@ -0,0 +1,249 @@
+"""
+DeepFakeGuard inference server (asyncio + aiohttp)
+
+Holds one DeepFakeDetector and one DistilBERT text model in memory and
+merges concurrent requests into dynamic batches.
+
+Usage:
+    python server.py --port 8080 --max-batch-size 32 --max-wait-ms 5
+
+Endpoints:
+    POST /predict/image   raw image bytes in the body
+    POST /predict/text    JSON {"text": "..."}
+    GET  /health          queue depth and batching stats
+
+Run with --max-batch-size 1 to serve without batching (see bench_load.py).
+"""
+
+import argparse
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from aiohttp import web
+
+from loaders import load_text_predict
+
+
+class QueueFull(Exception):
+    pass
+
+
+class MicroBatcher:
+    """
+    Collects queued requests into batches of up to max_batch_size, waiting
+    at most max_wait_ms after the first item, and runs each batch on a
+    dedicated executor thread so the event loop never blocks on the model.
+    """
+
+    def __init__(self, name, run_batch, max_batch_size=32, max_wait_ms=5, max_queue=1024):
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self.stats = {"batches": 0, "items": 0, "rejected": 0, "timed_out": 0}
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        self.executor.shutdown(wait=False)
+
+    async def submit(self, item, timeout):
+        """
+        Queue one item and wait for its result
+
+        Raises:
+            QueueFull: queue is at capacity (backpressure)
+            asyncio.TimeoutError: result not ready within timeout seconds
+        """
+        fut = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((item, fut))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise QueueFull(self.name)
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            raise
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Skip requests whose caller already timed out
+        return [(item, fut) for item, fut in batch if not fut.done()]
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.run_batch, items)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["items"] += len(batch)
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
+
+# ================= MODEL RUNNERS =================
+def make_image_runner(detector):
+    def run(arrays):
+        scores = detector.predict_scores(np.stack(arrays))
+        return [detector.to_result(s) for s in scores]
+    return run
+
+
+def make_text_runner(text_predict):
+    def run(texts):
+        results = text_predict.predict_many(texts, batch_size=len(texts))
+        return [{"label": label, "confidence": confidence} for label, confidence in results]
+    return run
+
+
+# ================= HTTP HANDLERS =================
+def busy_response(name):
+    return web.json_response({"error": f"{name} queue full"}, status=503, headers={"Retry-After": "1"})
+
+
+def timeout_response():
+    return web.json_response({"error": "request timed out"}, status=504)
+
+
+async def predict_image(request):
+    app = request.app
+    body = await request.read()
+    if not body:
+        return web.json_response({"error": "empty body"}, status=400)
+
+    # Decode off the event loop, in parallel with other requests
+    loop = asyncio.get_running_loop()
+    try:
+        array = await loop.run_in_executor(app["decode_pool"], app["detector"].decoder.decode, io.BytesIO(body))
+    except Exception as e:
+        return web.json_response({"error": f"could not decode image: {e}"}, status=400)
+
+    try:
+        result = await app["image_batcher"].submit(array, app["timeout"])
+    except QueueFull:
+        return busy_response("image")
+    except asyncio.TimeoutError:
+        return timeout_response()
+    return web.json_response(result)
+
+
+async def predict_text(request):
+    app = request.app
+    try:
+        payload = await request.json()
+        text = str(payload["text"])
+    except Exception:
+        return web.json_response({"error": 'expected JSON {"text": "..."}'}, status=400)
+
+    try:
+        result = await app["text_batcher"].submit(text, app["timeout"])
+    except QueueFull:
+        return busy_response("text")
+    except asyncio.TimeoutError:
+        return timeout_response()
+    return web.json_response(result)
+
+
+async def health(request):
+    app = request.app
+    out = {"uptime_s": round(time.time() - app["started"], 1)}
+    for key in ["image_batcher", "text_batcher"]:
+        b = app[key]
+        stats = dict(b.stats)
+        stats["queued"] = b.queue.qsize()
+        stats["mean_batch"] = round(stats["items"] / stats["batches"], 2) if stats["batches"] else 0
+        out[b.name] = stats
+    return web.json_response(out)
+
+
+# ================= APP =================
+def build_app(args):
+    from deepfake_detector import DeepFakeDetector
+    text_predict = load_text_predict()
+
+    detector = DeepFakeDetector(
+        args.image_model,
+        backend=args.image_backend,
+        max_batch_size=args.max_batch_size,
+        lazy=False
+    )
+    text_predict.warmup()
+
+    app = web.Application(client_max_size=args.max_upload_mb * 1024 * 1024)
+    app["detector"] = detector
+    app["timeout"] = args.timeout
+    app["started"] = time.time()
+    app["decode_pool"] = ThreadPoolExecutor(max_workers=args.decode_workers)
+    app["image_batcher"] = MicroBatcher(
+        "image", make_image_runner(detector), args.max_batch_size, args.max_wait_ms, args.max_queue
+    )
+    app["text_batcher"] = MicroBatcher(
+        "text", make_text_runner(text_predict), args.max_batch_size, args.max_wait_ms, args.max_queue
+    )
+
+    async def on_startup(app):
+        app["image_batcher"].start()
+        app["text_batcher"].start()
+
+    async def on_cleanup(app):
+        await app["image_batcher"].stop()
+        await app["text_batcher"].stop()
+        app["decode_pool"].shutdown(wait=False)
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post("/predict/image", predict_image)
+    app.router.add_post("/predict/text", predict_text)
+    app.router.add_get("/health", health)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=32, help="1 = no batching")
+    parser.add_argument("--max-wait-ms", type=float, default=5, help="Max time to wait for a batch to fill")
+    parser.add_argument("--max-queue", type=int, default=1024, help="Queued requests per model before 503")
+    parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout (seconds)")
+    parser.add_argument("--decode-workers", type=int, default=4)
+    parser.add_argument("--max-upload-mb", type=int, default=20)
+    parser.add_argument("--image-model", type=str, default=None)
+    parser.add_argument("--image-backend", choices=["keras", "tflite"], default="keras")
+    args = parser.parse_args()
+
+    print(f"🚀 Serving on http://{args.host}:{args.port} "
+          f"(max batch {args.max_batch_size}, max wait {args.max_wait_ms} ms)")
+    web.run_app(build_app(args), host=args.host, port=args.port)
@@ -0,0 +1,185 @@
+"""
+Persistent warm worker for the DeepFakeGuard CLIs
+
+Keeps the image detector and/or the text model loaded in one background
+process so repeated CLI calls skip framework import and model loading.
+
+Usage:
+    python warm_worker.py start [--no-image] [--no-text]   # keep running
+    python warm_worker.py image photo1.jpg photo2.jpg
+    python warm_worker.py text "Your OTP is 1234, click to verify"
+    python warm_worker.py stop
+
+Client commands fall back to loading the models in-process when no worker
+is listening.
+
+Connections are authenticated (pickled messages must never come from an
+unknown process): the worker uses DEEPFAKEGUARD_WORKER_KEY when set,
+otherwise it generates a random key at startup and writes it to
+KEY_FILE (owner read/write only), where clients read it.
+"""
+
+import argparse
+import json
+import os
+import sys
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from loaders import load_text_predict
+
+ADDRESS = ("127.0.0.1", int(os.environ.get("DEEPFAKEGUARD_WORKER_PORT", 6123)))
+KEY_FILE = os.environ.get("DEEPFAKEGUARD_WORKER_KEY_FILE",
+                          os.path.join(os.path.expanduser("~"), ".deepfakeguard", "worker.key"))
+
+
+def create_authkey():
+    """
+    Worker side: the configured key, or a fresh random key saved to KEY_FILE
+    """
+    if os.environ.get("DEEPFAKEGUARD_WORKER_KEY"):
+        return os.environ["DEEPFAKEGUARD_WORKER_KEY"].encode()
+    key = os.urandom(32)
+    os.makedirs(os.path.dirname(KEY_FILE), mode=0o700, exist_ok=True)
+    if os.path.exists(KEY_FILE):
+        os.remove(KEY_FILE)
+    fd = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def read_authkey():
+    """
+    Client side: the configured key, or the running worker's KEY_FILE (None if absent)
+    """
+    if os.environ.get("DEEPFAKEGUARD_WORKER_KEY"):
+        return os.environ["DEEPFAKEGUARD_WORKER_KEY"].encode()
+    try:
+        with open(KEY_FILE, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class Models:
+    """
+    Models are loaded on first use (or eagerly by the worker)
+    """
+
+    def __init__(self):
+        self.detector = None
+        self.text_predict = None
+
+    def image(self, paths):
+        if self.detector is None:
+            from deepfake_detector import DeepFakeDetector
+            self.detector = DeepFakeDetector()
+        return [dict(r, path=p) for p, r in zip(paths, self.detector.predict_batch(paths))]
+
+    def text(self, texts):
+        if self.text_predict is None:
+            self.text_predict = load_text_predict()
+        results = self.text_predict.predict_many(texts)
+        return [{"label": label, "confidence": confidence} for label, confidence in results]
+
+    def handle(self, command, payload):
+        if command == "image":
+            return self.image(payload)
+        if command == "text":
+            return self.text(payload)
+        raise ValueError(f"unknown command {command!r}")
+
+
+def serve(load_image, load_text):
+    models = Models()
+    if load_image:
+        from deepfake_detector import DeepFakeDetector
+        models.detector = DeepFakeDetector(lazy=False)
+    if load_text:
+        models.text_predict = load_text_predict()
+        models.text_predict.warmup()
+
+    authkey = create_authkey()
+    listener = Listener(ADDRESS, authkey=authkey)
+    print(f"🔥 Warm worker listening on {ADDRESS[0]}:{ADDRESS[1]} (Ctrl+C or 'stop' to exit)")
+
+    # Requests are served one at a time: the models are the bottleneck anyway
+    try:
+        while True:
+            # A client with the wrong key or one that hangs up early only
+            # loses its own request; the worker keeps serving
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, EOFError, OSError):
+                continue
+            with conn:
+                try:
+                    command, payload = conn.recv()
+                    if command == "stop":
+                        conn.send(("ok", True))
+                        break
+                    try:
+                        reply = ("ok", models.handle(command, payload))
+                    except Exception as e:
+                        reply = ("error", f"{type(e).__name__}: {e}")
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    continue
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        if not os.environ.get("DEEPFAKEGUARD_WORKER_KEY") and os.path.exists(KEY_FILE):
+            os.remove(KEY_FILE)
+    print("👋 Warm worker stopped")
+
+
+def call_worker(command, payload):
+    """
+    Send a request to a running worker; returns None if none is listening
+    """
+    authkey = read_authkey()
+    if authkey is None:
+        return None
+    try:
+        conn = Client(ADDRESS, authkey=authkey)
+    except (ConnectionRefusedError, OSError, AuthenticationError, EOFError):
+        # No worker, or a stale key file left behind by a crashed one
+        return None
+    with conn:
+        conn.send((command, payload))
+        try:
+            status, result = conn.recv()
+        except EOFError:
+            return None
+    if status != "ok":
+        raise RuntimeError(result)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_start = sub.add_parser("start", help="Run the worker in the foreground")
+    p_start.add_argument("--no-image", action="store_true", help="Do not preload the image detector")
+    p_start.add_argument("--no-text", action="store_true", help="Do not preload the text model")
+    p_image = sub.add_parser("image", help="Classify images")
+    p_image.add_argument("paths", nargs="+")
+    p_text = sub.add_parser("text", help="Classify text")
+    p_text.add_argument("texts", nargs="+")
+    sub.add_parser("stop", help="Stop a running worker")
+    args = parser.parse_args()
+
+    if args.command == "start":
+        serve(load_image=not args.no_image, load_text=not args.no_text)
+    elif args.command == "stop":
+        print("✅ Worker stopped" if call_worker("stop", None) else "⚠️ No warm worker running")
+    else:
+        payload = [os.path.abspath(p) for p in args.paths] if args.command == "image" else args.texts
+        results = call_worker(args.command, payload)
+        if results is None:
+            print("⚠️ No warm worker running, loading models in this process...", file=sys.stderr)
+            results = Models().handle(args.command, payload)
+        for r in results:
+            print(json.dumps(r))
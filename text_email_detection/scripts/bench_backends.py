@@ -0,0 +1,83 @@
+import argparse
+import time
+
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score
+
+import predict
+
+# ---------- CONFIG ----------
+TEST_REAL = "dataset_split/test/real.csv"
+TEST_FAKE = "dataset_split/test/fake.csv"
+SEQ_LENGTHS = [32, 128, 256, 512]
+WORDS = "please verify your account payment today meeting report team link offer bank".split()
+
+
+def load_test(n):
+    real = pd.read_csv(TEST_REAL)
+    fake = pd.read_csv(TEST_FAKE)
+    real["label"] = 0
+    fake["label"] = 1
+    df = pd.concat([real.sample(min(n // 2, len(real)), random_state=42),
+                    fake.sample(min(n // 2, len(fake)), random_state=42)])
+    return df["text"].astype(str).tolist(), df["label"].tolist()
+
+
+def text_of_length(n_tokens):
+    # Common words tokenize to one token each; 2 tokens go to [CLS]/[SEP]
+    return " ".join(WORDS[i % len(WORDS)] for i in range(n_tokens - 2))
+
+
+def to_label(result):
+    return 1 if result[0].startswith("SCAM") else 0
+
+
+# ---------- MAIN ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy parity + latency per text backend")
+    parser.add_argument("--backends", nargs="+", default=predict.BACKENDS)
+    parser.add_argument("-n", type=int, default=2000, help="Held-out texts for the parity check")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    texts, labels = load_test(args.n)
+    reference = None
+    parity, latency = [], []
+
+    for backend in args.backends:
+        predict.set_backend(backend)
+        predict.warmup()
+
+        start = time.perf_counter()
+        results = predict.predict_many(texts, batch_size=args.batch_size)
+        throughput = len(texts) / (time.perf_counter() - start)
+
+        preds = [to_label(r) for r in results]
+        if reference is None:
+            reference = preds
+        agree = sum(a == b for a, b in zip(preds, reference)) / len(preds)
+        parity.append((backend, accuracy_score(labels, preds), f1_score(labels, preds), agree, throughput))
+
+        row = [backend]
+        for n_tokens in SEQ_LENGTHS:
+            text = text_of_length(n_tokens)
+            times = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                predict.predict(text)
+                times.append((time.perf_counter() - t0) * 1000)
+            row.append(sorted(times)[len(times) // 2])
+        latency.append(row)
+
+    print("\n================ ACCURACY PARITY (held-out test split) ================")
+    print(f"{'backend':<12}{'acc':>8}{'f1':>8}{'agree':>9}{'texts/s':>10}")
+    for backend, acc, f1, agree, tput in parity:
+        print(f"{backend:<12}{acc:>8.4f}{f1:>8.4f}{agree:>9.2%}{tput:>10.1f}")
+    print(f"(agree = label agreement with {args.backends[0]}, texts/s at batch {args.batch_size})")
+
+    print("\n================ LATENCY p50 ms (single text) ================")
+    print(f"{'backend':<12}" + "".join(f"{f'{n} tok':>10}" for n in SEQ_LENGTHS))
+    for row in latency:
+        print(f"{row[0]:<12}" + "".join(f"{ms:>10.2f}" for ms in row[1:]))
+    print("==============================================================\n")
@@ -0,0 +1,66 @@
+import argparse
+import time
+
+import extractors
+
+# ---------- CONFIG ----------
+REPEAT = 3
+
+
+def legacy_extract_pdf(path):
+    """The original extractor (extract_text() twice per page, str +=), kept as the baseline"""
+    import pdfplumber
+
+    text = ""
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            if page.extract_text():
+                text += page.extract_text() + "\n"
+    return text
+
+
+def time_legacy(path):
+    start = time.perf_counter()
+    text = legacy_extract_pdf(path)
+    elapsed = time.perf_counter() - start
+    # The legacy path returns nothing until every page is done
+    return elapsed, elapsed, len(text)
+
+
+def time_stream(path, workers):
+    start = time.perf_counter()
+    first, chars = None, 0
+    for page in extractors.iter_pdf_pages(path, workers=workers):
+        if first is None:
+            first = time.perf_counter() - start
+        chars += len(page) + 1 if page else 0
+    return time.perf_counter() - start, first or 0.0, chars
+
+
+def best_of(fn, *args):
+    runs = [fn(*args) for _ in range(REPEAT)]
+    return min(runs, key=lambda r: r[0])
+
+
+# ---------- MAIN ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF extraction: legacy vs streaming / pooled")
+    parser.add_argument("pdfs", nargs="+", help="PDF files to extract")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    for path in args.pdfs:
+        n_pages = extractors.pdf_page_count(path)
+        rows = [("legacy", *best_of(time_legacy, path))]
+        for w in args.workers:
+            rows.append((f"stream w={w}", *best_of(time_stream, path, w)))
+
+        base = rows[0][1]
+        print("=" * 66)
+        print(f"{path} ({n_pages} pages, best of {REPEAT})")
+        print("=" * 66)
+        print(f"{'path':<14}{'ms/page':>10}{'total s':>10}{'first page ms':>16}{'chars':>9}{'speedup':>8}")
+        for name, total, first, chars in rows:
+            print(f"{name:<14}{total * 1000 / max(n_pages, 1):>10.1f}{total:>10.2f}"
+                  f"{first * 1000:>16.1f}{chars:>9,}{base / total:>7.2f}x")
+    print("=" * 66)
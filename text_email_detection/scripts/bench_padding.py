@@ -0,0 +1,80 @@
+import argparse
+import time
+from functools import partial
+
+import torch
+from torch.utils.data import DataLoader
+from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
+
+from length_sampler import LengthGroupedBatchSampler
+from token_cache import load_token_corpus, pad_collate
+
+# ---------- CONFIG ----------
+MODEL_NAME = "distilbert-base-uncased"
+MAX_LEN = 256
+BATCH_SIZE = 8
+
+
+def loaders(ds, pad_id):
+    """(name, train loader) for the old and new padding / batching schemes"""
+    corpus_pad = partial(pad_collate, pad_id=pad_id, pad_to=ds.meta["longest"])
+    dynamic_pad = partial(pad_collate, pad_id=pad_id)
+    return [
+        ("corpus pad + shuffle", DataLoader(ds, batch_size=BATCH_SIZE, shuffle=True, collate_fn=corpus_pad)),
+        ("dynamic pad + shuffle", DataLoader(ds, batch_size=BATCH_SIZE, shuffle=True, collate_fn=dynamic_pad)),
+        ("dynamic pad + grouped", DataLoader(ds, batch_sampler=LengthGroupedBatchSampler(ds.lengths, BATCH_SIZE),
+                                             collate_fn=dynamic_pad)),
+    ]
+
+
+def train_steps(model, optimizer, loader, steps):
+    model.train()
+    tokens = padded = 0
+    it = iter(loader)
+    # One untimed step so allocator / thread-pool warmup is not measured
+    batch = next(it)
+    model(**batch).loss.backward()
+    optimizer.zero_grad()
+
+    start = time.perf_counter()
+    for _, batch in zip(range(steps), it):
+        tokens += int(batch["attention_mask"].sum())
+        padded += batch["input_ids"].numel()
+        model(**batch).loss.backward()
+        optimizer.step()
+        optimizer.zero_grad()
+    return time.perf_counter() - start, tokens, padded
+
+
+# ---------- MAIN ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tokens/s and epoch time: corpus padding vs dynamic padding (CPU)")
+    parser.add_argument("--split", type=str, default="train")
+    parser.add_argument("--steps", type=int, default=50, help="Timed training steps per scheme")
+    args = parser.parse_args()
+
+    torch.manual_seed(42)
+    tokenizer = DistilBertTokenizerFast.from_pretrained(MODEL_NAME)
+    sources = [(f"dataset_split/{args.split}/real.csv", 0), (f"dataset_split/{args.split}/fake.csv", 1)]
+    ds = load_token_corpus(sources, tokenizer, MAX_LEN, args.split)
+
+    model = DistilBertForSequenceClassification.from_pretrained(MODEL_NAME, num_labels=2)
+    optimizer = torch.optim.AdamW(model.parameters(), lr=2e-5)
+    initial = {k: v.clone() for k, v in model.state_dict().items()}
+
+    rows = []
+    for name, loader in loaders(ds, tokenizer.pad_token_id):
+        model.load_state_dict(initial)
+        elapsed, tokens, padded = train_steps(model, optimizer, loader, args.steps)
+        epoch_s = elapsed / args.steps * len(loader)
+        rows.append((name, tokens / elapsed, tokens / max(padded, 1), epoch_s))
+
+    base = rows[0][3]
+    print("=" * 72)
+    print(f"{args.split}: {len(ds):,} rows, batch {BATCH_SIZE}, {args.steps} steps per scheme (CPU)")
+    print("=" * 72)
+    print(f"{'scheme':<24}{'tokens/s':>11}{'real tok':>10}{'est. epoch':>14}{'speedup':>10}")
+    for name, tps, real, epoch_s in rows:
+        print(f"{name:<24}{tps:>11,.0f}{real:>10.1%}{time.strftime('%H:%M:%S', time.gmtime(epoch_s)):>14}"
+              f"{base / epoch_s:>9.2f}x")
+    print("=" * 72)
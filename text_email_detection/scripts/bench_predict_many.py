@@ -0,0 +1,68 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+import predict
+
+# ---------- SYNTHETIC MIXED-LENGTH CORPUS ----------
+SHORT = [
+    "Your OTP is 4821, click the link to verify now",
+    "Are we still on for lunch tomorrow?",
+    "Congratulations you won a lottery prize, claim now",
+    "Running 10 minutes late, start without me",
+]
+LONG_WORDS = (
+    "please find attached the quarterly report for review before our meeting "
+    "the finance team has updated the figures and the project timeline has moved "
+    "let me know if you have questions about the budget or the delivery schedule"
+).split()
+
+
+def synthetic_corpus(n, seed=42):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        if rng.random() < 0.7:
+            texts.append(rng.choice(SHORT))
+        else:
+            texts.append(" ".join(rng.choice(LONG_WORDS) for _ in range(rng.randint(150, 450))))
+    return texts
+
+
+def load_corpus(csv_path, n, seed=42):
+    df = pd.read_csv(csv_path)
+    texts = df["text"].dropna().astype(str).tolist()
+    random.Random(seed).shuffle(texts)
+    return texts[:n]
+
+
+# ---------- MAIN ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="predict() loop vs predict_many() throughput")
+    parser.add_argument("--csv", type=str, default=None, help="CSV with a 'text' column (default: synthetic mix)")
+    parser.add_argument("-n", type=int, default=500, help="Number of texts")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 64])
+    args = parser.parse_args()
+
+    texts = load_corpus(args.csv, args.n) if args.csv else synthetic_corpus(args.n)
+    predict.warmup()
+
+    start = time.perf_counter()
+    loop_results = [predict.predict(t) for t in texts]
+    loop_s = time.perf_counter() - start
+
+    print("=" * 55)
+    print(f"{len(texts)} texts")
+    print("=" * 55)
+    print(f"{'predict() loop':<22}{len(texts) / loop_s:>10.1f} texts/s")
+
+    for bs in args.batch_sizes:
+        start = time.perf_counter()
+        batch_results = predict.predict_many(texts, batch_size=bs)
+        batch_s = time.perf_counter() - start
+        agree = sum(a[0] == b[0] for a, b in zip(loop_results, batch_results)) / len(texts)
+        print(f"{f'predict_many bs={bs}':<22}{len(texts) / batch_s:>10.1f} texts/s "
+              f"{loop_s / batch_s:6.2f}x  (label agreement {agree:.1%})")
+    print("=" * 55)
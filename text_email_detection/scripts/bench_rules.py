@@ -0,0 +1,74 @@
+import argparse
+import time
+
+import pandas as pd
+
+import predict
+
+# ---------- CONFIG ----------
+DEFAULT_CSVS = ["dataset_split/test/real.csv", "dataset_split/test/fake.csv"]
+
+
+def legacy_rule_check(text):
+    """The original linear `in` scan, kept here as the baseline"""
+    text = text.lower()
+    strong_patterns = [
+        "lottery", "won prize", "claim now", "free money",
+        "guaranteed profit", "registration fee",
+        "crypto investment", "earn daily"
+    ]
+    if any(p in text for p in strong_patterns):
+        return True
+    if "otp" in text and any(w in text for w in ["click", "verify", "link", "urgent"]):
+        return True
+    return False
+
+
+def load_texts(paths):
+    texts = []
+    for path in paths:
+        texts.extend(pd.read_csv(path)["text"].dropna().astype(str).tolist())
+    return texts
+
+
+def rate(fn, texts):
+    start = time.perf_counter()
+    out = [fn(t) for t in texts]
+    return out, len(texts) / (time.perf_counter() - start)
+
+
+# ---------- MAIN ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rule engine throughput and model-skip rate")
+    parser.add_argument("csv", nargs="*", default=DEFAULT_CSVS, help="CSV files with a 'text' column")
+    parser.add_argument("--rules", type=str, default=predict.RULES_PATH)
+    args = parser.parse_args()
+
+    predict.RULES_PATH = args.rules
+    engine = predict.get_rules()
+    texts = load_texts(args.csv)
+
+    legacy, legacy_rate = rate(legacy_rule_check, texts)
+    matches, engine_rate = rate(engine.match, texts)
+
+    overrides = [engine.triggers_override(m) for m in matches]
+    decided = [engine.is_decisive(m) for m in matches]
+    agree = sum(a == b for a, b in zip(legacy, overrides)) / len(texts)
+
+    fired = {}
+    for m in matches:
+        for rule_id in m.rules:
+            fired[rule_id] = fired.get(rule_id, 0) + 1
+
+    print("\n================ RULE ENGINE ================")
+    print(f"Texts                : {len(texts):,}")
+    print(f"Legacy scan          : {legacy_rate:,.0f} texts/s")
+    print(f"Compiled engine      : {engine_rate:,.0f} texts/s ({engine_rate / legacy_rate:.2f}x)")
+    print(f"Override flag agree  : {agree:.2%} (word boundaries make the engine stricter)")
+    print(f"Model-skip rate      : {sum(decided) / len(texts):.2%} "
+          f"(score >= {engine.decide_threshold})")
+    print(f"Hybrid override rate : {sum(overrides) / len(texts):.2%}")
+    print("Rules fired:")
+    for rule_id, count in sorted(fired.items(), key=lambda kv: -kv[1]):
+        print(f"  {rule_id:<22}{count:>8,}")
+    print("=============================================\n")
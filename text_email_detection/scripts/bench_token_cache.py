@@ -0,0 +1,108 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+# ---------- CONFIG ----------
+MODEL_NAME = "distilbert-base-uncased"
+MAX_LEN = 256
+SPLIT = "train"
+BATCHES = 200   # batches read after startup (exercises __getitem__ + collate)
+BATCH_SIZE = 8
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def legacy_dataset(tokenizer):
+    """The original TextDataset: padding=True over the whole split, lists of lists"""
+    import pandas as pd
+    import torch
+    from torch.utils.data import Dataset
+
+    real = pd.read_csv(f"dataset_split/{SPLIT}/real.csv")
+    fake = pd.read_csv(f"dataset_split/{SPLIT}/fake.csv")
+    real["label"] = 0
+    fake["label"] = 1
+    df = pd.concat([real, fake]).sample(frac=1).reset_index(drop=True)
+    texts, labels = df["text"].astype(str).tolist(), df["label"].tolist()
+
+    class TextDataset(Dataset):
+        def __init__(self):
+            self.encodings = tokenizer(texts, truncation=True, padding=True, max_length=MAX_LEN)
+            self.labels = labels
+
+        def __len__(self):
+            return len(self.labels)
+
+        def __getitem__(self, idx):
+            item = {k: torch.tensor(v[idx]) for k, v in self.encodings.items()}
+            item["labels"] = torch.tensor(self.labels[idx])
+            return item
+
+    return TextDataset(), None
+
+
+def cached_dataset(tokenizer):
+    from functools import partial
+
+    from token_cache import load_token_corpus, pad_collate
+
+    sources = [(f"dataset_split/{SPLIT}/real.csv", 0), (f"dataset_split/{SPLIT}/fake.csv", 1)]
+    ds = load_token_corpus(sources, tokenizer, MAX_LEN, SPLIT)
+    return ds, partial(pad_collate, pad_id=tokenizer.pad_token_id, pad_to=ds.meta["longest"])
+
+
+def measure(mode):
+    """Runs in a fresh process so startup time and peak RSS are not shared"""
+    from torch.utils.data import DataLoader
+    from transformers import DistilBertTokenizerFast
+
+    tokenizer = DistilBertTokenizerFast.from_pretrained(MODEL_NAME)
+    start = time.perf_counter()
+    ds, collate = legacy_dataset(tokenizer) if mode == "legacy" else cached_dataset(tokenizer)
+    startup = time.perf_counter() - start
+
+    loader = DataLoader(ds, batch_size=BATCH_SIZE, shuffle=True, collate_fn=collate)
+    start = time.perf_counter()
+    for i, _ in enumerate(loader):
+        if i + 1 == BATCHES:
+            break
+    read = time.perf_counter() - start
+
+    print(json.dumps({"mode": mode, "rows": len(ds), "startup_s": startup,
+                      "batches_per_s": BATCHES / read, "peak_rss_mb": peak_rss_mb()}))
+
+
+def run(mode):
+    out = subprocess.run([sys.executable, __file__, "--measure", mode],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# ---------- MAIN ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Legacy TextDataset vs memory-mapped token cache")
+    parser.add_argument("--measure", choices=["legacy", "cached"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure)
+        sys.exit()
+
+    # "cached" twice: the first run may build the cache, the second reuses it
+    rows = [run("legacy"), run("cached"), run("cached")]
+    labels = ["legacy", "cache (build)", "cache (reuse)"]
+
+    print("=" * 62)
+    print(f"{SPLIT} split, {rows[0]['rows']:,} rows, MAX_LEN {MAX_LEN}")
+    print("=" * 62)
+    print(f"{'dataset':<16}{'startup s':>11}{'batches/s':>12}{'peak RSS MB':>14}")
+    for label, row in zip(labels, rows):
+        print(f"{label:<16}{row['startup_s']:>11.2f}{row['batches_per_s']:>12.1f}{row['peak_rss_mb']:>14.0f}")
+    print("=" * 62)
@@ -1,11 +1,54 @@
+"""
+Streaming text corpus cleaner: clean → dedupe → balance
+
+Usage:
+    python clean_balance_email_text.py
+    python clean_balance_email_text.py --datasets email --workers 8 --max-per-class 100000
+    python clean_balance_email_text.py --threshold 0.7 --no-near-dedupe
+
+For each dataset (data/raw/<dataset>/{real,fake}/*.csv → data/clean/<dataset>/):
+- Worker processes read the CSVs in parallel, one process per file, in
+  chunks of --chunksize rows (only the text column is parsed); a file
+  whose worker is killed (e.g. out of memory) is reported as failed
+- Each chunk is cleaned with vectorized pandas string ops (same rules as
+  clean_text) and texts with 5 words or fewer are dropped
+- Workers also hash every text and compute its MinHash signature; the
+  main process drops exact duplicates (hash set) and near-duplicates
+  (MinHash-LSH, estimated Jaccard >= --threshold) per class
+- Unique texts go into a per-class reservoir sample of --max-per-class,
+  so memory for balancing stays bounded whatever the corpus size
+- real.csv / fake.csv get min(real, fake) shuffled texts each
+
+Files finish in any order, so which copy of a duplicate is kept (and the
+exact sample) can differ between runs.
+"""
+
+import argparse
+import codecs
+import hashlib
 import os
-import pandas as pd
-import re
+import queue
 import random
+import re
+import time
+from multiprocessing import Process, Queue
+
+import pandas as pd
+
+from minhash import NUM_PERM, MinHasher, MinHashLSH
 
 RAW_DIR = "data/raw"
 CLEAN_DIR = "data/clean"
+DATASETS = ["email", "text"]
+LABELS = ["real", "fake"]
+TEXT_COLUMNS = ["text", "body", "content", "message"]
+
+CHUNKSIZE = 20000
+MIN_WORDS = 6            # keep texts with more than 5 words
+MAX_PER_CLASS = 200000
 
+
+# ---------- CLEAN ----------
 def clean_text(text):
     text = str(text).lower()
     text = re.sub(r"http\S+|www\S+", "", text)
@@ -13,63 +56,224 @@ def clean_text(text):
     text = re.sub(r"\s+", " ", text).strip()
     return text
 
-def load_and_clean(folder):
-    texts = []
-    for file in os.listdir(folder):
-        if file.endswith(".csv"):
-            path = os.path.join(folder, file)
-            print("Reading:", path)
+
+def clean_series(s):
+    """
+    clean_text over a whole pandas Series at once
+    """
+    return (s.astype(str).str.lower()
+            .str.replace(r"http\S+|www\S+", "", regex=True)
+            .str.replace(r"[^a-z\s]", " ", regex=True)
+            .str.replace(r"\s+", " ", regex=True)
+            .str.strip())
+
+
+def detect_encoding(path):
+    """
+    "utf-8" when the whole file decodes as UTF-8, otherwise "latin-1"
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                decoder.decode(block)
+            decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def text_column(columns):
+    for c in columns:
+        if c.lower() in TEXT_COLUMNS:
+            return c
+    return columns[0]
+
+
+# ---------- WORKERS ----------
+_queue = None
+_hasher = None
+
+
+def _init_worker(q, num_perm):
+    global _queue, _hasher
+    _queue = q
+    _hasher = MinHasher(num_perm) if num_perm else None
+
+
+def _run_file(job, q, num_perm):
+    _init_worker(q, num_perm)
+    _clean_file(job)
+
+
+def _clean_file(job):
+    """
+    Stream one CSV through cleaning + hashing; chunks go to the result queue
+    """
+    path, label, chunksize = job
+    stats = {"rows": 0, "short": 0, "exact": 0}
+    try:
+        encoding = detect_encoding(path)
+        col = text_column(list(pd.read_csv(path, nrows=0, encoding=encoding).columns))
+        for chunk in pd.read_csv(path, usecols=[col], dtype={col: str}, chunksize=chunksize, encoding=encoding):
+            texts = clean_series(chunk[col].dropna())
+            long_enough = texts[texts.str.count(" ") >= MIN_WORDS - 1]
+            unique = long_enough.drop_duplicates()
+            stats["rows"] += len(chunk)
+            stats["short"] += len(chunk) - len(long_enough)
+            stats["exact"] += len(long_enough) - len(unique)
+
+            texts = unique.tolist()
+            hashes = [hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest() for t in texts]
+            sigs = _hasher.signatures(texts) if _hasher else None
+            _queue.put(("chunk", label, texts, hashes, sigs))
+        _queue.put(("done", path, stats, None))
+    except Exception as e:
+        _queue.put(("done", path, stats, f"{type(e).__name__}: {e}"))
+
+
+def stream_files(jobs, workers=None, num_perm=NUM_PERM, max_queued=None):
+    """
+    Run _clean_file over jobs [(path, label, chunksize), ...] in up to
+    `workers` processes (one per file) and yield their queue messages; at
+    most max_queued chunks wait in the queue (bounded memory when the
+    consumer is slower). A worker that dies without finishing its file
+    yields a "done" message with an error, so the stream never hangs.
+    """
+    workers = workers or os.cpu_count()
+    q = Queue(maxsize=max_queued or workers * 2)
+    todo = list(jobs)
+    running = {}      # path -> Process
+    finished = set()
+    try:
+        while todo or running:
+            while todo and len(running) < workers:
+                job = todo.pop(0)
+                proc = Process(target=_run_file, args=(job, q, num_perm), daemon=True)
+                proc.start()
+                running[job[0]] = proc
 
             try:
-                df = pd.read_csv(path)
-            except:
-                df = pd.read_csv(path, encoding="latin-1")
-
-            # detect text column
-            col = None
-            for c in df.columns:
-                if c.lower() in ["text", "body", "content", "message"]:
-                    col = c
-                    break
-            if col is None:
-                col = df.columns[0]
-
-            for t in df[col]:
-                t = clean_text(t)
-                if len(t.split()) > 5:
-                    texts.append(t)
-
-    return texts
-
-def balance_and_save(real, fake, out_dir):
-    random.shuffle(real)
-    random.shuffle(fake)
-
-    size = min(len(real), len(fake))
-    real = real[:size]
-    fake = fake[:size]
+                msg = q.get(timeout=1)
+            except queue.Empty:
+                msg = None
+            if msg is not None:
+                if msg[0] == "done":
+                    if msg[1] in finished:
+                        continue
+                    finished.add(msg[1])
+                    running.pop(msg[1]).join()
+                yield msg
+
+            # Killed workers never send "done" (exit code 0 means it is still in the queue)
+            for path, proc in list(running.items()):
+                if proc.exitcode not in (None, 0):
+                    del running[path]
+                    finished.add(path)
+                    yield ("done", path, {"rows": 0, "short": 0, "exact": 0},
+                           f"worker exited with code {proc.exitcode}; chunks read before were kept")
+    finally:
+        for proc in running.values():
+            proc.terminate()
+
+
+# ---------- BALANCE ----------
+class Reservoir:
+    """
+    Uniform sample of at most `capacity` items from a stream (Algorithm R)
+    """
+
+    def __init__(self, capacity, rng):
+        self.capacity = capacity
+        self.rng = rng
+        self.items = []
+        self.seen = 0
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.capacity:
+            self.items.append(item)
+        else:
+            j = self.rng.randrange(self.seen)
+            if j < self.capacity:
+                self.items[j] = item
+
+
+def list_csvs(folder):
+    return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".csv"))
+
+
+def save_texts(texts, path):
+    pd.DataFrame({"text": texts}).to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+def clean_dataset(raw_dir, out_dir, workers=None, chunksize=CHUNKSIZE, max_per_class=MAX_PER_CLASS,
+                  near_dedupe=True, threshold=0.8, seed=42):
+    rng = random.Random(seed)
+    num_perm = NUM_PERM if near_dedupe else 0
+    jobs = [(path, label, chunksize) for label in LABELS for path in list_csvs(os.path.join(raw_dir, label))]
+    if not jobs:
+        print(f"⚠️ No CSV files under {raw_dir}")
+        return None
+
+    seen = {label: set() for label in LABELS}
+    lsh = {label: MinHashLSH(NUM_PERM, threshold=threshold) for label in LABELS}
+    reservoirs = {label: Reservoir(max_per_class, rng) for label in LABELS}
+    stats = {label: {"rows": 0, "short": 0, "exact": 0, "near": 0} for label in LABELS}
+    labels_of = {path: label for path, label, _ in jobs}
+
+    start = time.time()
+    for msg in stream_files(jobs, workers, num_perm):
+        if msg[0] == "done":
+            _, path, file_stats, error = msg
+            for key, value in file_stats.items():
+                stats[labels_of[path]][key] += value
+            print(f"   {'❌' if error else '✔'} {path}" + (f" ({error})" if error else ""))
+            continue
+
+        _, label, texts, hashes, sigs = msg
+        for i, (text, h) in enumerate(zip(texts, hashes)):
+            if h in seen[label]:
+                stats[label]["exact"] += 1
+                continue
+            seen[label].add(h)
+            if near_dedupe and not lsh[label].add_if_new(sigs[i]):
+                stats[label]["near"] += 1
+                continue
+            reservoirs[label].add(text)
+
+    for label in LABELS:
+        s = stats[label]
+        print(f"   {label.upper():<4} rows {s['rows']:,} | short {s['short']:,} | exact dup {s['exact']:,} | "
+              f"near dup {s['near']:,} | unique {reservoirs[label].seen:,}")
 
+    size = min(len(r.items) for r in reservoirs.values())
     os.makedirs(out_dir, exist_ok=True)
+    for label in LABELS:
+        save_texts(rng.sample(reservoirs[label].items, size), os.path.join(out_dir, f"{label}.csv"))
 
-    pd.DataFrame({"text": real}).to_csv(
-        os.path.join(out_dir, "real.csv"), index=False
-    )
-    pd.DataFrame({"text": fake}).to_csv(
-        os.path.join(out_dir, "fake.csv"), index=False
-    )
+    print(f"✅ Saved {size} REAL and {size} FAKE to {out_dir} ({time.time() - start:.1f} s)")
+    return size
 
-    print(f"✅ Saved {size} REAL and {size} FAKE to {out_dir}")
 
-# ================= EMAIL =================
-print("\n🔹 Processing EMAIL data")
-email_real = load_and_clean("data/raw/email/real")
-email_fake = load_and_clean("data/raw/email/fake")
-balance_and_save(email_real, email_fake, "data/clean/email")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean, dedupe and balance the raw text corpora")
+    parser.add_argument("--datasets", nargs="+", default=DATASETS)
+    parser.add_argument("--raw-dir", type=str, default=RAW_DIR)
+    parser.add_argument("--clean-dir", type=str, default=CLEAN_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="CSV rows per chunk")
+    parser.add_argument("--max-per-class", type=int, default=MAX_PER_CLASS, help="Reservoir size per class")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Near-duplicate Jaccard threshold")
+    parser.add_argument("--no-near-dedupe", action="store_true", help="Only drop exact duplicates")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
 
-# ================= TEXT ==================
-print("\n🔹 Processing TEXT data")
-text_real = load_and_clean("data/raw/text/real")
-text_fake = load_and_clean("data/raw/text/fake")
-balance_and_save(text_real, text_fake, "data/clean/text")
+    for dataset in args.datasets:
+        print(f"\n🔹 Processing {dataset.upper()} data")
+        clean_dataset(os.path.join(args.raw_dir, dataset), os.path.join(args.clean_dir, dataset),
+                      workers=args.workers, chunksize=args.chunksize, max_per_class=args.max_per_class,
+                      near_dedupe=not args.no_near_dedupe, threshold=args.threshold, seed=args.seed)
 
-print("\n🎉 ALL DATA CLEANED & BALANCED SUCCESSFULLY")
+    print("\n🎉 ALL DATA CLEANED & BALANCED SUCCESSFULLY")
@@ -0,0 +1,337 @@
+"""
+Distill a compact student from the fine-tuned DistilBERT teacher
+
+Usage:
+    python distill_student.py                       # 2-layer student, 768 wide
+    python distill_student.py --layers 3
+    python distill_student.py --layers 4 --dim 384  # narrower student
+
+- Teacher = predict.MODEL_PATH. Its logits over the train split are
+  computed once and cached next to the token cache (keyed by the teacher
+  weights), so re-runs and resumed runs skip the teacher pass
+- Texts go through predict.clean_text first, like at inference time
+- Loss = ALPHA * KL(student || teacher at TEMPERATURE) * T^2
+       + (1 - ALPHA) * cross-entropy on the hard labels
+- A same-width student starts from evenly spaced teacher layers
+  (2 layers: 0 and 5); a narrower one starts from scratch
+- Training runs on train_engine.Trainer (accumulation, bf16, resumable)
+- The student is saved with save_pretrained (+ tokenizer), so predict.py
+  can load it by pointing MODEL_PATH at it
+- The report compares teacher and student on the test split: accuracy /
+  F1 retention, latency speedup, and a cascade (student first, teacher
+  only when the student's confidence is below a margin)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from functools import partial
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from sklearn.metrics import accuracy_score, f1_score
+from torch.utils.data import DataLoader, Dataset
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+from transformers import get_linear_schedule_with_warmup
+from transformers.modeling_outputs import SequenceClassifierOutput
+
+import predict
+from length_sampler import LengthGroupedBatchSampler
+from token_cache import load_token_corpus, pad_collate
+from train_engine import Trainer, optimizer_steps_per_epoch
+
+# ---------------- CONFIG ----------------
+TEACHER_PATH = predict.MODEL_PATH
+STUDENT_PATH = predict.MODEL_PATH + "_student"
+STUDENT_LAYERS = 2
+MAX_LEN = 256
+BATCH_SIZE = 32
+EPOCHS = 3
+LR = 5e-5
+WARMUP_RATIO = 0.1
+TEMPERATURE = 2.0
+ALPHA = 0.7
+SEED = 42
+EVAL_BATCH_SIZE = 64
+LATENCY_SAMPLES = 200
+CASCADE_MARGINS = [0.6, 0.7, 0.8, 0.9]
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+WEIGHT_FILES = ["model.safetensors", "pytorch_model.bin"]
+
+
+def split_sources(split):
+    return [
+        (f"dataset_split/{split}/real.csv", 0),
+        (f"dataset_split/{split}/fake.csv", 1),
+    ]
+
+
+# ---------------- STUDENT ----------------
+def layer_map(teacher_layers, student_layers):
+    """Evenly spaced teacher layers, always keeping the first and the last"""
+    if student_layers == 1:
+        return [teacher_layers - 1]
+    return [round(i * (teacher_layers - 1) / (student_layers - 1)) for i in range(student_layers)]
+
+
+def build_student(teacher, n_layers, dim=None):
+    config = DistilBertConfig.from_dict(teacher.config.to_dict())
+    config.n_layers = n_layers
+    narrow = dim is not None and dim != teacher.config.dim
+    if narrow:
+        config.dim = dim
+        config.hidden_dim = 4 * dim
+        config.n_heads = max(1, dim // 64)
+    student = DistilBertForSequenceClassification(config)
+    if narrow:
+        return student, None
+
+    # Same width: copy embeddings, classifier head and the selected layers
+    picked = layer_map(teacher.config.n_layers, n_layers)
+    prefix = "distilbert.transformer.layer."
+    state = {}
+    for key, value in teacher.state_dict().items():
+        if key.startswith(prefix):
+            layer, rest = key[len(prefix):].split(".", 1)
+            if int(layer) in picked:
+                state[f"{prefix}{picked.index(int(layer))}.{rest}"] = value
+        else:
+            state[key] = value
+    student.load_state_dict(state)
+    return student, picked
+
+
+class DistillationModel(torch.nn.Module):
+    """
+    Wraps the student so Trainer sees a model whose .loss is the distillation loss
+    """
+
+    def __init__(self, student, temperature=TEMPERATURE, alpha=ALPHA):
+        super().__init__()
+        self.student = student
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def forward(self, input_ids, attention_mask, labels=None, teacher_logits=None):
+        logits = self.student(input_ids=input_ids, attention_mask=attention_mask).logits
+        loss = None
+        if labels is not None:
+            # Loss in fp32 even under bf16 autocast
+            student_logits = logits.float()
+            loss = F.cross_entropy(student_logits, labels)
+            if teacher_logits is not None:
+                t = self.temperature
+                kd = F.kl_div(
+                    F.log_softmax(student_logits / t, dim=1),
+                    F.softmax(teacher_logits.float() / t, dim=1),
+                    reduction="batchmean",
+                ) * t * t
+                loss = self.alpha * kd + (1 - self.alpha) * loss
+        return SequenceClassifierOutput(loss=loss, logits=logits)
+
+
+# ---------------- SOFT LABELS ----------------
+def teacher_fingerprint(model_dir):
+    h = hashlib.sha256()
+    for name in ["config.json"] + WEIGHT_FILES:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                while chunk := f.read(1 << 20):
+                    h.update(chunk)
+    return h.hexdigest()
+
+
+@torch.inference_mode()
+def predict_logits(model, corpus, collate, batch_size=EVAL_BATCH_SIZE):
+    """Logits for every row of corpus, in corpus order (batches sorted by length)"""
+    model.eval()
+    logits = np.zeros((len(corpus), 2), dtype=np.float32)
+    sampler = LengthGroupedBatchSampler(corpus.lengths, batch_size, shuffle=False)
+    for idx in sampler.batches():
+        batch = collate([corpus[i] for i in idx])
+        out = model(input_ids=batch["input_ids"].to(DEVICE), attention_mask=batch["attention_mask"].to(DEVICE))
+        logits[idx] = out.logits.float().cpu().numpy()
+    return logits
+
+
+def load_teacher_logits(teacher, teacher_dir, corpus, collate):
+    path = os.path.join(corpus.cache_dir, f"teacher-{teacher_fingerprint(teacher_dir)[:16]}.npy")
+    if os.path.exists(path):
+        print(f"⚡ Reusing teacher logits {path}")
+        return np.load(path, mmap_mode="r")
+
+    print(f"🧑‍🏫 Teacher pass over {len(corpus):,} rows...")
+    start = time.time()
+    logits = predict_logits(teacher, corpus, collate)
+    np.save(path + ".tmp.npy", logits)
+    os.replace(path + ".tmp.npy", path)
+    print(f"   done in {time.time() - start:.1f} s → {path}")
+    return logits
+
+
+class SoftLabelCorpus(Dataset):
+    def __init__(self, corpus, teacher_logits):
+        self.corpus = corpus
+        self.teacher_logits = teacher_logits
+
+    @property
+    def lengths(self):
+        return self.corpus.lengths
+
+    def __len__(self):
+        return len(self.corpus)
+
+    def __getitem__(self, idx):
+        item = self.corpus[idx]
+        item["teacher_logits"] = self.teacher_logits[idx]
+        return item
+
+
+def distill_collate(batch, pad_id=0):
+    out = pad_collate(batch, pad_id=pad_id)
+    if "teacher_logits" in batch[0]:
+        out["teacher_logits"] = torch.from_numpy(np.stack([item["teacher_logits"] for item in batch]).astype(np.float32))
+    return out
+
+
+# ---------------- REPORT ----------------
+def metrics(labels, preds):
+    return {"accuracy": accuracy_score(labels, preds), "f1": f1_score(labels, preds)}
+
+
+def cascade_report(labels, teacher_logits, student_logits, margins=CASCADE_MARGINS):
+    """Student first; rows where its top probability < margin go to the teacher"""
+    student_probs = torch.softmax(torch.from_numpy(student_logits), dim=1).numpy()
+    student_preds = student_probs.argmax(1)
+    teacher_preds = teacher_logits.argmax(1)
+    rows = []
+    for margin in margins:
+        to_teacher = student_probs.max(1) < margin
+        preds = np.where(to_teacher, teacher_preds, student_preds)
+        rows.append({"margin": margin, "to_teacher": float(to_teacher.mean()), **metrics(labels, preds)})
+    return rows
+
+
+@torch.inference_mode()
+def latency(model, corpus, collate, n=LATENCY_SAMPLES, batch_size=EVAL_BATCH_SIZE):
+    """p50 single-text latency (ms) and batched throughput (texts/s)"""
+    model.eval()
+    rng = np.random.default_rng(SEED)
+    idx = rng.choice(len(corpus), size=min(n, len(corpus)), replace=False)
+
+    def forward(rows):
+        batch = collate([corpus[i] for i in rows])
+        model(input_ids=batch["input_ids"].to(DEVICE), attention_mask=batch["attention_mask"].to(DEVICE))
+
+    forward(idx[:1])
+    times = []
+    for i in idx:
+        start = time.perf_counter()
+        forward([i])
+        times.append((time.perf_counter() - start) * 1000)
+
+    order = idx[np.argsort(corpus.lengths[idx], kind="stable")]
+    start = time.perf_counter()
+    for s in range(0, len(order), batch_size):
+        forward(order[s:s + batch_size])
+    return float(np.median(times)), len(order) / (time.perf_counter() - start)
+
+
+def print_report(report):
+    t, s = report["teacher"], report["student"]
+    print("\n================ DISTILLATION REPORT (test split) ================")
+    print(f"Student: {report['student_config']['n_layers']} layers x {report['student_config']['dim']} dim "
+          f"({s['params'] / 1e6:.1f}M params vs {t['params'] / 1e6:.1f}M)")
+    print(f"{'model':<10}{'acc':>8}{'f1':>8}{'p50 ms':>10}{'texts/s':>10}")
+    for name, row in (("teacher", t), ("student", s)):
+        print(f"{name:<10}{row['accuracy']:>8.4f}{row['f1']:>8.4f}{row['p50_ms']:>10.2f}{row['texts_per_s']:>10.1f}")
+    print(f"Retention : accuracy {s['accuracy'] / t['accuracy']:.2%}, F1 {s['f1'] / max(t['f1'], 1e-9):.2%}")
+    print(f"Speedup   : {t['p50_ms'] / s['p50_ms']:.2f}x single text, "
+          f"{s['texts_per_s'] / t['texts_per_s']:.2f}x batched")
+    print(f"Agreement : {report['agreement']:.2%} same label as the teacher")
+    print("\nCascade (student first, teacher below margin):")
+    print(f"{'margin':>8}{'to teacher':>12}{'acc':>8}{'f1':>8}")
+    for row in report["cascade"]:
+        print(f"{row['margin']:>8.2f}{row['to_teacher']:>12.1%}{row['accuracy']:>8.4f}{row['f1']:>8.4f}")
+    print("==================================================================\n")
+
+
+# ---------------- MAIN ----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distill a compact student from the DistilBERT teacher")
+    parser.add_argument("--teacher", type=str, default=TEACHER_PATH)
+    parser.add_argument("--out", type=str, default=STUDENT_PATH)
+    parser.add_argument("--layers", type=int, default=STUDENT_LAYERS)
+    parser.add_argument("--dim", type=int, default=None, help="Hidden size (default: teacher's, layers copied)")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--accum-steps", type=int, default=1)
+    parser.add_argument("--lr", type=float, default=LR)
+    parser.add_argument("--temperature", type=float, default=TEMPERATURE)
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--bf16", action="store_true")
+    parser.add_argument("--checkpoint-dir", type=str, default="checkpoints_student")
+    parser.add_argument("--no-resume", action="store_true")
+    args = parser.parse_args()
+
+    torch.manual_seed(SEED)
+    tokenizer = DistilBertTokenizerFast.from_pretrained(args.teacher, local_files_only=True)
+    teacher = DistilBertForSequenceClassification.from_pretrained(args.teacher, local_files_only=True).to(DEVICE)
+    collate = partial(distill_collate, pad_id=tokenizer.pad_token_id)
+
+    corpora = {
+        split: load_token_corpus(split_sources(split), tokenizer, MAX_LEN, split, text_fn=predict.clean_text)
+        for split in ("train", "val", "test")
+    }
+    train_ds = SoftLabelCorpus(corpora["train"], load_teacher_logits(teacher, args.teacher, corpora["train"], collate))
+
+    student, picked = build_student(teacher, args.layers, args.dim)
+    student.to(DEVICE)
+    print(f"🎓 Student: {args.layers} layers x {student.config.dim} dim"
+          f"{f', initialized from teacher layers {picked}' if picked else ', random init'}")
+
+    train_sampler = LengthGroupedBatchSampler(train_ds.lengths, args.batch_size, shuffle=True, seed=SEED)
+    val_sampler = LengthGroupedBatchSampler(corpora["val"].lengths, args.batch_size, shuffle=False)
+    train_loader = DataLoader(train_ds, batch_sampler=train_sampler, collate_fn=collate,
+                              generator=torch.Generator().manual_seed(SEED))
+    val_loader = DataLoader(corpora["val"], batch_sampler=val_sampler, collate_fn=collate)
+
+    model = DistillationModel(student, temperature=args.temperature, alpha=args.alpha)
+    optimizer = torch.optim.AdamW(model.parameters(), lr=args.lr, weight_decay=0.0)
+    total_steps = optimizer_steps_per_epoch(len(train_loader), args.accum_steps) * args.epochs
+    scheduler = get_linear_schedule_with_warmup(optimizer, int(total_steps * WARMUP_RATIO), total_steps)
+
+    Trainer(
+        model, optimizer, scheduler, train_loader, val_loader, DEVICE, args.epochs,
+        accum_steps=args.accum_steps,
+        bf16=args.bf16,
+        checkpoint_dir=args.checkpoint_dir,
+    ).train(resume=not args.no_resume)
+
+    student.save_pretrained(args.out)
+    tokenizer.save_pretrained(args.out)
+
+    # ---------- REPORT ----------
+    test = corpora["test"]
+    labels = np.asarray(test.labels)
+    teacher_logits = predict_logits(teacher, test, collate)
+    student_logits = predict_logits(student, test, collate)
+
+    report = {"student_config": {"n_layers": student.config.n_layers, "dim": student.config.dim},
+              "initialized_from_layers": picked}
+    for name, m, logits in (("teacher", teacher, teacher_logits), ("student", student, student_logits)):
+        p50_ms, texts_per_s = latency(m, test, collate)
+        report[name] = {**metrics(labels, logits.argmax(1)), "p50_ms": p50_ms, "texts_per_s": texts_per_s,
+                        "params": sum(p.numel() for p in m.parameters())}
+    report["agreement"] = float((teacher_logits.argmax(1) == student_logits.argmax(1)).mean())
+    report["cascade"] = cascade_report(labels, teacher_logits, student_logits)
+
+    with open(os.path.join(args.out, "distill_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"✅ Student saved to {args.out}")
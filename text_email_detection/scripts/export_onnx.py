@@ -0,0 +1,64 @@
+import argparse
+import os
+
+import torch
+from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
+
+import predict
+
+# ---------- CONFIG ----------
+OPSET = 14
+
+
+class LogitsOnly(torch.nn.Module):
+    """Return a plain logits tensor so the ONNX graph has one named output"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+def export(model_dir):
+    tokenizer = DistilBertTokenizerFast.from_pretrained(model_dir, local_files_only=True)
+    model = DistilBertForSequenceClassification.from_pretrained(model_dir, local_files_only=True)
+    model.eval()
+
+    fp32_path = predict.onnx_path(model_dir)
+    int8_path = predict.onnx_path(model_dir, quantized=True)
+    os.makedirs(os.path.dirname(fp32_path), exist_ok=True)
+
+    dummy = tokenizer(["export example", "a second, longer export example"], return_tensors="pt", padding=True)
+
+    print("📦 Exporting ONNX (dynamic batch + sequence axes)...")
+    torch.onnx.export(
+        LogitsOnly(model),
+        (dummy["input_ids"], dummy["attention_mask"]),
+        fp32_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        opset_version=OPSET,
+        do_constant_folding=True,
+    )
+    print(f"✅ Saved: {fp32_path} ({os.path.getsize(fp32_path) / 1e6:.1f} MB)")
+
+    print("🔧 Dynamic INT8 quantization...")
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"✅ Saved: {int8_path} ({os.path.getsize(int8_path) / 1e6:.1f} MB)")
+
+
+# ---------- MAIN ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the DistilBERT text model to ONNX (+ INT8)")
+    parser.add_argument("--model", type=str, default=predict.MODEL_PATH, help="save_pretrained model folder")
+    args = parser.parse_args()
+
+    export(args.model)
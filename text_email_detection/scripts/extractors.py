@@ -0,0 +1,175 @@
+"""
+Streaming document text extraction
+
+Every extractor is a generator that yields text parts (PDF pages, DOCX
+paragraph blocks, email body parts) as soon as they are available, so a
+classifier can start on the first pages and stop the extraction early.
+
+PDF pages are extracted by a process pool (pdfplumber is pure Python and
+holds the GIL); each worker opens the file once and extracts a contiguous
+range of pages. Results are yielded in page order.
+"""
+
+import email
+import html
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from email import policy
+
+# ---------- CONFIG ----------
+PDF_WORKERS = None          # None = min(4, cpu count)
+PAGES_PER_TASK = 4          # pages per worker task (one file open per task)
+POOL_MIN_PAGES = 8          # smaller PDFs are extracted inline
+MAX_PAGES = None            # page budget per PDF (None = all pages)
+MAX_CHARS = None            # character budget per document (None = unlimited)
+DOCX_PARAGRAPHS = 50        # paragraphs per yielded DOCX part
+
+
+# ---------- LIMITS ----------
+def limit_chars(parts, max_chars):
+    """
+    Stop a part stream once max_chars characters have been yielded
+    (the last part is truncated)
+    """
+    if max_chars is None:
+        yield from parts
+        return
+    remaining = max_chars
+    try:
+        for part in parts:
+            if remaining <= 0:
+                break
+            yield part[:remaining]
+            remaining -= len(part)
+    finally:
+        if hasattr(parts, "close"):
+            parts.close()
+
+
+# ---------- PDF ----------
+def _extract_page_range(path, start, end):
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def pdf_page_count(path):
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def iter_pdf_pages(path, workers=PDF_WORKERS, max_pages=MAX_PAGES, max_chars=MAX_CHARS,
+                   pages_per_task=PAGES_PER_TASK):
+    """
+    Yield the text of each PDF page, in order
+
+    Pages with no extractable text yield "". Closing the generator early
+    cancels page ranges that have not started yet.
+    """
+    yield from limit_chars(_iter_pdf_pages(path, workers, max_pages, pages_per_task), max_chars)
+
+
+def _iter_pdf_pages(path, workers, max_pages, pages_per_task):
+    n_pages = pdf_page_count(path)
+    if max_pages is not None:
+        n_pages = min(n_pages, max_pages)
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    if workers <= 1 or n_pages < POOL_MIN_PAGES:
+        for start in range(0, n_pages, pages_per_task):
+            yield from _extract_page_range(path, start, min(start + pages_per_task, n_pages))
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            executor.submit(_extract_page_range, path, start, min(start + pages_per_task, n_pages))
+            for start in range(0, n_pages, pages_per_task)
+        ]
+        for future in futures:
+            yield from future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------- DOCX ----------
+def iter_docx_parts(path, paragraphs=DOCX_PARAGRAPHS, max_chars=MAX_CHARS):
+    """
+    Yield DOCX text in blocks of `paragraphs` paragraphs
+    """
+    yield from limit_chars(_iter_docx_parts(path, paragraphs), max_chars)
+
+
+def _iter_docx_parts(path, paragraphs):
+    from docx import Document
+
+    block = []
+    for p in Document(path).paragraphs:
+        block.append(p.text)
+        if len(block) == paragraphs:
+            yield "\n".join(block)
+            block = []
+    if block:
+        yield "\n".join(block)
+
+
+# ---------- EMAIL ----------
+_SKIP_TAGS = re.compile(r"<(script|style|head)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_BREAK_TAGS = re.compile(r"<\s*(br|/p|/div|/tr|/li|/h[1-6])\b[^>]*>", re.IGNORECASE)
+_TAGS = re.compile(r"<[^>]+>")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def html_to_text(markup):
+    """
+    Strip an HTML body down to its visible text
+    """
+    text = _SKIP_TAGS.sub(" ", markup)
+    text = _BREAK_TAGS.sub("\n", text)
+    text = html.unescape(_TAGS.sub(" ", text))
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def message_parts(msg):
+    """
+    Yield the body text of a parsed email.message.EmailMessage
+
+    text/plain parts are preferred; HTML parts are stripped and used only
+    when the message has no plain-text part. Attachments are skipped.
+    """
+    plain, rich = [], []
+    for part in msg.walk():
+        if part.is_multipart() or part.get_content_disposition() == "attachment":
+            continue
+        content_type = part.get_content_type()
+        if content_type not in ("text/plain", "text/html"):
+            continue
+        try:
+            content = part.get_content()
+        except (LookupError, ValueError):
+            payload = part.get_payload(decode=True) or b""
+            content = payload.decode("utf-8", errors="replace")
+        if content_type == "text/plain":
+            plain.append(content)
+        else:
+            rich.append(content)
+
+    if plain:
+        yield from plain
+    else:
+        for markup in rich:
+            yield html_to_text(markup)
+
+
+def iter_eml_parts(path, max_chars=MAX_CHARS):
+    """
+    Yield the body parts of an .eml file
+    """
+    with open(path, "rb") as f:
+        msg = email.message_from_binary_file(f, policy=policy.default)
+    yield from limit_chars(message_parts(msg), max_chars)
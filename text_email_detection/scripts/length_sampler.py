@@ -0,0 +1,80 @@
+"""
+Length-grouped batch sampler
+
+With dynamic padding (pad_collate without pad_to) a batch costs as much
+as its longest row, so rows of similar length should share a batch.
+
+Training (shuffle=True): every epoch the indices are shuffled, cut into
+"mega-batches" of batch_size * mega_batch_mult rows, each mega-batch is
+sorted by length and cut into batches, and the batch order is shuffled.
+Batches stay random across epochs while padding stays small.
+
+Validation (shuffle=False): rows are sorted by length once and batched
+in that order (fully deterministic).
+
+The order only depends on (seed, epoch), so a resumed run can skip the
+batches it already trained on with set_epoch(epoch, start_batch).
+"""
+
+import numpy as np
+from torch.utils.data import Sampler
+
+
+class LengthGroupedBatchSampler(Sampler):
+    def __init__(self, lengths, batch_size, shuffle=True, mega_batch_mult=50, seed=42, drop_last=False):
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.mega_batch_mult = mega_batch_mult
+        self.seed = seed
+        self.drop_last = drop_last
+        self.epoch = 0
+        self.start_batch = 0
+
+    def set_epoch(self, epoch, start_batch=0):
+        """
+        Call before each epoch so every epoch gets a different order;
+        start_batch skips the first batches (mid-epoch resume)
+        """
+        self.epoch = epoch
+        self.start_batch = start_batch
+
+    def batches(self):
+        """
+        The full list of batches (index arrays) for the current epoch
+        """
+        n = len(self.lengths)
+        if not self.shuffle:
+            # Stable sort keeps equal-length rows in file order
+            order = np.argsort(self.lengths, kind="stable")
+            batches = [order[i:i + self.batch_size] for i in range(0, n, self.batch_size)]
+        else:
+            rng = np.random.default_rng(self.seed + self.epoch)
+            order = rng.permutation(n)
+            mega = self.batch_size * self.mega_batch_mult
+            batches = []
+            for start in range(0, n, mega):
+                chunk = order[start:start + mega]
+                chunk = chunk[np.argsort(-self.lengths[chunk], kind="stable")]
+                batches.extend(chunk[i:i + self.batch_size] for i in range(0, len(chunk), self.batch_size))
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+
+        if self.drop_last:
+            batches = [b for b in batches if len(b) == self.batch_size]
+        return batches
+
+    def __iter__(self):
+        for batch in self.batches()[self.start_batch:]:
+            yield batch.tolist()
+
+    def __len__(self):
+        """Batches in a full epoch (start_batch is not subtracted)"""
+        n = len(self.lengths)
+        if not self.shuffle:
+            return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
+        # Every mega-batch is batched on its own, so each may end in a short batch
+        mega = self.batch_size * self.mega_batch_mult
+        sizes = [mega] * (n // mega) + ([n % mega] if n % mega else [])
+        if self.drop_last:
+            return sum(size // self.batch_size for size in sizes)
+        return sum(-(-size // self.batch_size) for size in sizes)
@@ -0,0 +1,126 @@
+"""
+MinHash signatures and an LSH index for near-duplicate text lookup
+
+MinHasher.signatures() turns each text into num_perm minimum hash values
+over its word 3-gram shingles. The fraction of equal positions between
+two signatures estimates the Jaccard similarity of their shingle sets,
+so reworded or lightly edited copies of a message stay close while
+unrelated texts do not. Hashing is vectorized over a whole batch:
+shingles of every text are hashed in one array and reduced per text
+with np.minimum.reduceat.
+
+MinHashLSH splits signatures into bands; texts sharing any band land in
+the same bucket and only those candidates are compared, so a lookup does
+not scan every stored text.
+"""
+
+import zlib
+
+import numpy as np
+
+MERSENNE = (1 << 31) - 1
+NUM_PERM = 64
+SHINGLE = 3
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, shingle=SHINGLE, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self.a = rng.randint(1, MERSENNE, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, MERSENNE, size=num_perm).astype(np.uint64)
+
+    def signatures(self, texts):
+        """
+        uint32 [len(texts), num_perm] signatures of whitespace-tokenized texts
+        """
+        k = self.shingle
+        words, lengths = [], []
+        for text in texts:
+            hashes = [zlib.crc32(w.encode("utf-8")) for w in text.split()]
+            if len(hashes) < k:
+                hashes += [0] * (k - len(hashes))
+            words.extend(hashes)
+            lengths.append(len(hashes))
+        if not lengths:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+
+        w = np.asarray(words, dtype=np.uint64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        n = len(w) - k + 1
+
+        # Rolling combination of k consecutive word hashes (wraps mod 2^64)
+        h = np.zeros(n, dtype=np.uint64)
+        for j in range(k):
+            h = h * np.uint64(1000003) + w[j:j + n]
+        h = (h ^ (h >> np.uint64(29))) & np.uint64(MERSENNE)
+
+        # Keep only windows that do not cross a text boundary
+        counts = lengths - k + 1
+        seg_starts = np.cumsum(counts) - counts
+        doc_starts = np.cumsum(lengths) - lengths
+        idx = np.repeat(doc_starts, counts) + (np.arange(counts.sum()) - np.repeat(seg_starts, counts))
+        x = h[idx]
+
+        sig = np.empty((len(lengths), self.num_perm), dtype=np.uint32)
+        for i in range(self.num_perm):
+            sig[:, i] = np.minimum.reduceat((self.a[i] * x + self.b[i]) % np.uint64(MERSENNE), seg_starts)
+        return sig
+
+
+class MinHashLSH:
+    """
+    Banded LSH over MinHash signatures with Jaccard verification
+
+    With 64 permutations in 16 bands of 4 rows, pairs at Jaccard 0.8 share
+    a band with probability > 0.999; candidates are then kept only when
+    their estimated similarity reaches `threshold`.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=16, threshold=0.8):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self.size = 0
+
+    def _keys(self, sig):
+        return [sig[b * self.rows:(b + 1) * self.rows].tobytes() for b in range(len(self.buckets))]
+
+    def query(self, sig):
+        """
+        Id of a stored signature with estimated Jaccard >= threshold, or None
+        """
+        seen = set()
+        for bucket, key in zip(self.buckets, self._keys(sig)):
+            for other in bucket.get(key, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                if np.mean(self.signatures[other] == sig) >= self.threshold:
+                    return other
+        return None
+
+    def insert(self, sig):
+        if self.size == len(self.signatures):
+            self.signatures = np.concatenate([self.signatures, np.empty_like(self.signatures)])
+        self.signatures[self.size] = sig
+        for bucket, key in zip(self.buckets, self._keys(sig)):
+            bucket.setdefault(key, []).append(self.size)
+        self.size += 1
+        return self.size - 1
+
+    def add_if_new(self, sig):
+        """
+        Insert sig unless a near-duplicate is already stored; True when inserted
+        """
+        if self.query(sig) is not None:
+            return False
+        self.insert(sig)
+        return True
+
+    def __len__(self):
+        return self.size
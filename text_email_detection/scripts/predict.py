@@ -1,21 +1,50 @@
-import torch
+import itertools
+import os
 import re
-import pdfplumber
-import email
-from email import policy
-from docx import Document
-from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
+import sys
+
+# Make sibling modules importable when this file is loaded by path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.append(SCRIPT_DIR)
+
+from extractors import iter_docx_parts, iter_eml_parts, iter_pdf_pages
+from scam_rules import RuleEngine
+
+# torch / transformers / pdfplumber / python-docx are imported on first use,
+# so importing this module (or running a CLI's --help) stays fast.
 
 # ================= CONFIG =================
 MODEL_PATH = r"C:\DeepFakeGuard-Text detector\text_email_detection\model"
 MAX_LEN = 512
 
+# Inference backend: "torch", "torch-int8" (dynamic quantization),
+# "onnx" or "onnx-int8" (ONNX Runtime, files from export_onnx.py)
+BACKEND = os.environ.get("DEEPFAKEGUARD_TEXT_BACKEND", "torch")
+BACKENDS = ["torch", "torch-int8", "onnx", "onnx-int8"]
+ONNX_THREADS = None       # ONNX Runtime intra-op threads (None = default)
+
+# Rule engine (see scam_rules.py); rules whose summed weight reaches the
+# file's decide_threshold return SCAM without running the model
+RULES_PATH = os.path.join(SCRIPT_DIR, "..", "rules", "scam_rules.json")
+RULE_SHORT_CIRCUIT = True
+
+# Long-document mode (predict_long)
+CHUNK_OVERLAP = 128       # tokens shared by consecutive windows
+CHUNK_BATCH_SIZE = 8      # windows per forward pass
+MAX_CHUNKS = 64           # chunk budget per document
+EARLY_EXIT_PROB = 0.95    # stop once a chunk is this confidently SCAM
+RULE_TAIL_CHARS = 200     # end of a part rescanned with the next (phrases split across pages)
+
 LABELS = {
     0: "REAL / SAFE",
     1: "SCAM / FAKE"
 }
 
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+tokenizer = None
+model = None
+device = None
+rules = None
 
 # ================= TEXT CLEANING =================
 def clean_text(text):
@@ -25,38 +54,113 @@ def clean_text(text):
     text = re.sub(r"\s+", " ", text).strip()
     return text
 
-# ================= RULE-BASED CHECK (STRONG ONLY) =================
-def rule_based_scam_check(text):
-    text = text.lower()
-
-    strong_patterns = [
-        "lottery", "won prize", "claim now", "free money",
-        "guaranteed profit", "registration fee",
-        "crypto investment", "earn daily"
-    ]
+# ================= RULE-BASED CHECK =================
+def get_rules():
+    """Compile the rule file once"""
+    global rules
+    if rules is None:
+        rules = RuleEngine.from_file(RULES_PATH)
+    return rules
+
+def rule_based_scam_check(text, match=None):
+    engine = get_rules()
+    if match is None:
+        match = engine.match(text)
+    return engine.triggers_override(match)
+
+def rule_decision(text, match=None):
+    """(label, confidence) when the rules alone decide SCAM, else None"""
+    if not RULE_SHORT_CIRCUIT:
+        return None
+    engine = get_rules()
+    if match is None:
+        match = engine.match(text)
+    if engine.is_decisive(match):
+        return "SCAM / FAKE (Rule Match)", engine.decide_confidence
+    return None
 
-    if any(p in text for p in strong_patterns):
-        return True
+# ================= LOAD MODEL =================
+class OnnxModel:
+    """ONNX Runtime session with the same call signature as the torch model"""
+
+    def __init__(self, path, num_threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+    def __call__(self, input_ids, attention_mask):
+        import torch
+        from types import SimpleNamespace
+
+        logits = self.session.run(["logits"], {
+            "input_ids": input_ids.cpu().numpy(),
+            "attention_mask": attention_mask.cpu().numpy(),
+        })[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+def onnx_path(model_dir, quantized=False):
+    return os.path.join(model_dir, "onnx", "model_int8.onnx" if quantized else "model.onnx")
+
+def set_backend(name):
+    """Switch inference backend; the next prediction reloads the model"""
+    global BACKEND, model
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {name!r}")
+    BACKEND = name
+    model = None
+
+def load_model():
+    """Load tokenizer + model once (first prediction or warmup())"""
+    global tokenizer, model, device
+    if model is not None:
+        return tokenizer, model, device
+
+    import torch
+    from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    tokenizer = DistilBertTokenizerFast.from_pretrained(
+        MODEL_PATH, local_files_only=True
+    )
 
-    if "otp" in text and any(w in text for w in ["click", "verify", "link", "urgent"]):
-        return True
+    if BACKEND in ("onnx", "onnx-int8"):
+        device = torch.device("cpu")
+        model = OnnxModel(onnx_path(MODEL_PATH, BACKEND == "onnx-int8"), ONNX_THREADS)
+        return tokenizer, model, device
 
-    return False
+    loaded = DistilBertForSequenceClassification.from_pretrained(
+        MODEL_PATH, local_files_only=True
+    )
 
-# ================= LOAD MODEL =================
-tokenizer = DistilBertTokenizerFast.from_pretrained(
-    MODEL_PATH, local_files_only=True
-)
+    if BACKEND == "torch-int8":
+        # Dynamic INT8 quantization of the Linear layers (CPU only)
+        device = torch.device("cpu")
+        loaded = torch.quantization.quantize_dynamic(loaded, {torch.nn.Linear}, dtype=torch.qint8)
 
-model = DistilBertForSequenceClassification.from_pretrained(
-    MODEL_PATH, local_files_only=True
-)
+    loaded.to(device)
+    loaded.eval()
+    model = loaded
+    return tokenizer, model, device
 
-model.to(device)
-model.eval()
+def warmup():
+    """Load the model and run one dummy prediction"""
+    load_model()
+    predict("warmup")
 
 # ================= CORE PREDICT =================
 def predict(text):
+    match = get_rules().match(text)
+    decided = rule_decision(text, match)
+    if decided:
+        return decided
+
+    import torch
+    tokenizer, model, device = load_model()
+
     cleaned = clean_text(text)
 
     inputs = tokenizer(
@@ -75,39 +179,283 @@ def predict(text):
         pred = torch.argmax(probs, dim=1).item()
         confidence = probs[0][pred].item() * 100
 
+    return hybrid_verdict(text, pred, confidence, match)
+
+def hybrid_verdict(text, pred, confidence, match=None):
     label = LABELS[pred]
 
     # Hybrid safety override
-    if rule_based_scam_check(text) and confidence < 90:
+    if rule_based_scam_check(text, match) and confidence < 90:
         return "SCAM / FAKE (Hybrid Detection)", round(max(confidence, 90), 2)
 
     return label, round(confidence, 2)
 
+# ================= BATCH PREDICT =================
+def predict_many(texts, batch_size=32, return_matches=False):
+    """
+    Classify many texts; returns [(label, confidence), ...] in input order
+    (with return_matches: (results, rule matches) so callers can report the
+    fired rules without matching again)
+
+    Inputs are sorted by token length and each batch is padded only to its
+    own longest item, so short SMS are not padded to long-email length.
+    Texts decided by the rule engine never reach the model.
+    """
+    texts = list(texts)
+    results = [None] * len(texts)
+    engine = get_rules()
+    matches = [engine.match(t) for t in texts]
+    todo = []
+    for i, (text, match) in enumerate(zip(texts, matches)):
+        decided = rule_decision(text, match)
+        if decided:
+            results[i] = decided
+        else:
+            todo.append(i)
+    if not todo:
+        return (results, matches) if return_matches else results
+
+    import torch
+    tokenizer, model, device = load_model()
+    encodings = tokenizer(
+        [clean_text(texts[i]) for i in todo],
+        truncation=True,
+        max_length=MAX_LEN
+    )
+    input_ids = dict(zip(todo, encodings["input_ids"]))
+    order = sorted(todo, key=lambda i: len(input_ids[i]))
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            batch = tokenizer.pad(
+                {"input_ids": [input_ids[i] for i in idx]},
+                return_tensors="pt"
+            )
+            batch = {k: v.to(device) for k, v in batch.items()}
+            probs = torch.softmax(model(**batch).logits, dim=1).cpu()
+            preds = torch.argmax(probs, dim=1)
+
+            for i, row, pred in zip(idx, probs, preds.tolist()):
+                results[i] = hybrid_verdict(texts[i], pred, row[pred].item() * 100, matches[i])
+
+    return (results, matches) if return_matches else results
+
+# ================= LONG DOCUMENTS =================
+def _windows(n_tokens, window, overlap, max_chunks):
+    """Start offsets of overlapping windows; evenly spread when over budget"""
+    step = max(1, window - overlap)
+    starts = list(range(0, max(1, n_tokens - overlap), step))
+    if len(starts) > max_chunks:
+        # Keep the whole document covered instead of only its beginning
+        pick = [round(i * (len(starts) - 1) / (max_chunks - 1)) for i in range(max_chunks)] if max_chunks > 1 else [0]
+        starts = [starts[i] for i in sorted(set(pick))]
+    return starts
+
+def _aggregate(scam_probs, rule, top_k):
+    if rule == "max":
+        return max(scam_probs)
+    if rule == "mean":
+        return sum(scam_probs) / len(scam_probs)
+    if rule == "topk":
+        top = sorted(scam_probs, reverse=True)[:top_k]
+        return sum(top) / len(top)
+    raise ValueError(f"unknown aggregation rule: {rule}")
+
+def _stream_windows(token_parts, window, overlap, max_chunks):
+    """
+    Yield (start, ids) windows as soon as enough tokens have arrived
+
+    Produces the same windows as _windows() for the concatenated stream,
+    capped at max_chunks (the stream length is not known up front).
+    """
+    step = max(1, window - overlap)
+    ids = []
+    start = emitted = 0
+    for part in token_parts:
+        ids.extend(part)
+        while start + window <= len(ids) and emitted < max_chunks:
+            yield start, ids[start:start + window]
+            emitted += 1
+            start += step
+        if emitted >= max_chunks:
+            return
+    while emitted < max_chunks and (start == 0 or start < len(ids) - overlap):
+        yield start, ids[start:start + window]
+        emitted += 1
+        start += step
+
+def _score_windows(windows, batch_size, early_exit, stop=None):
+    """
+    Run (start, ids) windows through the model in batches; when stop()
+    is true after the windows run out, the last partial batch is dropped
+
+    Returns:
+        tuple: (spans, scam_probs, trigger) where trigger is the index of
+               the window that hit early_exit, or None
+    """
+    spans, scam_probs, pending = [], [], []
+
+    def flush():
+        # Loaded on the first batch: a stream decided by the rules never gets here
+        import torch
+        tokenizer, model, device = load_model()
+
+        batch = tokenizer.pad(
+            {"input_ids": [tokenizer.build_inputs_with_special_tokens(ids) for _, ids in pending]},
+            return_tensors="pt"
+        )
+        batch = {k: v.to(device) for k, v in batch.items()}
+        with torch.inference_mode():
+            probs = torch.softmax(model(**batch).logits, dim=1)[:, 1].cpu().tolist()
+        offset = len(scam_probs)
+        spans.extend((start, start + len(ids)) for start, ids in pending)
+        scam_probs.extend(probs)
+        pending.clear()
+
+        best = max(range(len(probs)), key=probs.__getitem__)
+        if early_exit is not None and probs[best] >= early_exit:
+            return offset + best
+        return None
+
+    trigger = None
+    for w in windows:
+        pending.append(w)
+        if len(pending) == batch_size:
+            trigger = flush()
+            if trigger is not None:
+                break
+    if trigger is None and pending and not (stop and stop()):
+        trigger = flush()
+    return spans, scam_probs, trigger
+
+def _long_result(text, match, spans, scam_probs, trigger, aggregate, top_k, chunks_total):
+    stopped_early = trigger is not None
+    scam_prob = scam_probs[trigger] if stopped_early else _aggregate(scam_probs, aggregate, top_k)
+    if trigger is None:
+        trigger = max(range(len(scam_probs)), key=scam_probs.__getitem__)
+
+    pred = 1 if scam_prob >= 0.5 else 0
+    confidence = (scam_prob if pred == 1 else 1 - scam_prob) * 100
+    label, confidence = hybrid_verdict(text, pred, confidence, match)
+
+    return {
+        "label": label,
+        "confidence": confidence,
+        "scam_prob": round(scam_prob, 4),
+        "chunks_total": chunks_total,
+        "chunks_run": len(scam_probs),
+        "trigger_chunk": trigger,
+        "trigger_tokens": spans[trigger],
+        "early_exit": stopped_early,
+        "chunk_probs": [round(p, 4) for p in scam_probs],
+        "rules": match.rules,
+    }
+
+def _rule_result(decided, match):
+    return {
+        "label": decided[0], "confidence": decided[1], "scam_prob": None,
+        "chunks_total": 0, "chunks_run": 0, "trigger_chunk": None,
+        "trigger_tokens": None, "early_exit": True, "chunk_probs": [],
+        "rules": match.rules,
+    }
+
+def predict_long(text, aggregate="max", top_k=3, overlap=CHUNK_OVERLAP,
+                 batch_size=CHUNK_BATCH_SIZE, max_chunks=MAX_CHUNKS,
+                 early_exit=EARLY_EXIT_PROB):
+    """
+    Classify a document of any length with overlapping MAX_LEN windows
+
+    Windows are run in batches; as soon as one window's SCAM probability
+    reaches early_exit the remaining windows are skipped. Otherwise the
+    per-window SCAM probabilities are combined with `aggregate`
+    ("max", "mean" or "topk").
+
+    Returns:
+        dict: label, confidence, scam_prob, chunks_total, chunks_run,
+              trigger_chunk (index of the window that decided the verdict),
+              trigger_tokens (its token range), early_exit, chunk_probs
+    """
+    match = get_rules().match(text)
+    decided = rule_decision(text, match)
+    if decided:
+        return _rule_result(decided, match)
+
+    tokenizer, _, _ = load_model()
+    token_ids = tokenizer(clean_text(text), add_special_tokens=False, verbose=False)["input_ids"]
+    window = MAX_LEN - tokenizer.num_special_tokens_to_add()
+    starts = _windows(len(token_ids), window, overlap, max_chunks)
+
+    windows = ((s, token_ids[s:s + window]) for s in starts)
+    spans, scam_probs, trigger = _score_windows(windows, batch_size, early_exit)
+    return _long_result(text, match, spans, scam_probs, trigger, aggregate, top_k, len(starts))
+
+def predict_stream(parts, aggregate="max", top_k=3, overlap=CHUNK_OVERLAP,
+                   batch_size=CHUNK_BATCH_SIZE, max_chunks=MAX_CHUNKS,
+                   early_exit=EARLY_EXIT_PROB):
+    """
+    Like predict_long, but for text that arrives in parts (pages, MIME parts)
+
+    Windows are classified while later parts are still being produced, and
+    an early exit (confident SCAM window or decisive rule hit) stops
+    consuming the stream, so e.g. the remaining PDF pages are never
+    extracted. chunks_total is None when the stream was not read to the end.
+    The model is only loaded once a part gets past the rules.
+    """
+    engine = get_rules()
+
+    # Phrase hits accumulate over all parts read so far, so an "all" rule
+    # fires even when its phrases sit on different pages (as in predict()).
+    # The tail of the previous part is rescanned for phrases split across parts.
+    state = {"found": set(), "match": engine.evaluate(set()), "decided": None, "exhausted": False}
+
+    def token_parts():
+        tail = ""
+        for part in parts:
+            state["found"] |= engine.groups(tail + "\n" + part if tail else part)
+            tail = part[-RULE_TAIL_CHARS:].split(None, 1)[-1] if len(part) > RULE_TAIL_CHARS else part
+            state["match"] = engine.evaluate(state["found"])
+            decided = rule_decision(None, state["match"])
+            if decided:
+                state["decided"] = decided
+                return
+            tokenizer, _, _ = load_model()
+            yield tokenizer(clean_text(part), add_special_tokens=False, verbose=False)["input_ids"]
+        state["exhausted"] = True
+
+    def windows(stream):
+        first = next(stream, None)
+        if state["decided"]:
+            return
+        tokenizer, _, _ = load_model()
+        window = MAX_LEN - tokenizer.num_special_tokens_to_add()
+        head = [first if first is not None else []]
+        yield from _stream_windows(itertools.chain(head, stream), window, overlap, max_chunks)
+
+    stream = token_parts()
+    try:
+        spans, scam_probs, trigger = _score_windows(windows(stream), batch_size, early_exit,
+                                                    stop=lambda: state["decided"] is not None)
+    finally:
+        stream.close()
+        if hasattr(parts, "close"):
+            parts.close()
+
+    if state["decided"]:
+        return _rule_result(state["decided"], state["match"])
+    chunks_total = len(scam_probs) if state["exhausted"] and trigger is None else None
+    return _long_result(None, state["match"], spans, scam_probs, trigger, aggregate, top_k, chunks_total)
+
 # ================= FILE EXTRACTORS =================
+# Streaming versions live in extractors.py; these return the whole text.
 def extract_pdf(path):
-    text = ""
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
-            if page.extract_text():
-                text += page.extract_text() + "\n"
-    return text
+    return "".join(page + "\n" for page in iter_pdf_pages(path) if page)
 
 def extract_docx(path):
-    doc = Document(path)
-    return "\n".join(p.text for p in doc.paragraphs)
+    return "\n".join(iter_docx_parts(path))
 
 def extract_eml(path):
-    with open(path, "rb") as f:
-        msg = email.message_from_binary_file(f, policy=policy.default)
-
-    if msg.is_multipart():
-        for part in msg.walk():
-            if part.get_content_type() == "text/plain":
-                return part.get_content()
-    else:
-        return msg.get_content()
-
-    return ""
+    return "\n".join(iter_eml_parts(path))
 
 # ================= MAIN =================
 if __name__ == "__main__":
@@ -131,23 +479,36 @@ if __name__ == "__main__":
 
     elif choice == "2":
         path = input("Enter PDF file path: ")
-        text = extract_pdf(path)
+        parts = iter_pdf_pages(path)
 
     elif choice == "3":
         path = input("Enter DOCX file path: ")
-        text = extract_docx(path)
+        parts = iter_docx_parts(path)
 
     elif choice == "4":
         path = input("Enter EML file path: ")
-        text = extract_eml(path)
+        parts = iter_eml_parts(path)
 
     else:
         print("❌ Invalid option")
         exit()
 
-    label, confidence = predict(text)
+    if choice == "1":
+        label, confidence = predict(text)
+        details = None
+    else:
+        # Documents: classify every part while it is still being extracted
+        details = predict_stream(parts)
+        label, confidence = details["label"], details["confidence"]
 
     print("\n================ RESULT ================")
     print(f"Prediction : {label}")
     print(f"Confidence : {confidence}%")
+    if details and details["trigger_chunk"] is None:
+        print(f"Decided by : rules ({', '.join(details['rules'])})")
+    elif details:
+        print(f"Chunks     : {details['chunks_run']}/{details['chunks_total'] or '?'} run"
+              f"{' (early exit)' if details['early_exit'] else ''}")
+        print(f"Decided by : chunk {details['trigger_chunk']} "
+              f"(tokens {details['trigger_tokens'][0]}-{details['trigger_tokens'][1]})")
     print("=======================================\n")
@@ -0,0 +1,140 @@
+"""
+Compiled multi-pattern scam rule engine
+
+Rules live in a JSON file (see rules/scam_rules.json). All phrases of all
+rules are compiled into ONE scanning regex, so a message is scanned once
+no matter how many rules exist; at each position where a phrase starts,
+every phrase matching there is reported (nested phrases such as "prize"
+inside "won prize" both fire).
+
+Rule file format:
+    {
+      "decide_threshold": 10,      # score that decides SCAM without the model
+      "decide_confidence": 99.0,   # confidence reported for such verdicts
+      "override_threshold": 1,     # score that triggers the hybrid override
+      "rules": [
+        {"id": "lottery", "any": ["lottery", "won prize"], "weight": 10},
+        {"id": "otp_link", "all": [["otp"], ["click", "verify", "link", "urgent"]], "weight": 5},
+        {"id": "prefix", "any": ["crypto"], "weight": 2, "word_boundary": false}
+      ]
+    }
+
+"any": fires if any phrase matches. "all": list of phrase groups, fires if
+every group has at least one match (co-occurrence). Phrases are matched
+case-insensitively, with flexible whitespace, and on word boundaries
+unless "word_boundary" is false. The score is the sum of fired rule weights.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RuleMatch:
+    score: float = 0.0
+    rules: list = field(default_factory=list)
+
+
+class RuleEngine:
+    def __init__(self, rules, decide_threshold=None, decide_confidence=99.0, override_threshold=1):
+        self.rules = rules
+        self.decide_threshold = decide_threshold
+        self.decide_confidence = decide_confidence
+        self.override_threshold = override_threshold
+
+        # phrase -> group name; each distinct (phrase, boundary) is compiled once
+        self._groups = {}
+        bodies = []
+        for rule in rules:
+            boundary = rule.get("word_boundary", True)
+            for phrase in self._phrases(rule):
+                key = (phrase.lower(), boundary)
+                if key in self._groups:
+                    continue
+                name = f"p{len(self._groups)}"
+                self._groups[key] = name
+                body = r"\s+".join(re.escape(w) for w in phrase.lower().split())
+                if boundary:
+                    body = rf"\b{body}\b"
+                bodies.append((name, body))
+
+        # _scan finds every position where at least one phrase starts (zero-width,
+        # so overlapping and nested phrases are not consumed); _at then reports
+        # ALL phrases starting at that position, one optional lookahead each
+        self._scan = None
+        self._at = None
+        if bodies:
+            self._scan = re.compile("(?=" + "|".join(body for _, body in bodies) + ")", re.IGNORECASE)
+            self._at = re.compile("".join(f"(?:(?=(?P<{name}>{body})))?" for name, body in bodies), re.IGNORECASE)
+
+    @staticmethod
+    def _phrases(rule):
+        phrases = list(rule.get("any", []))
+        for group in rule.get("all", []):
+            phrases.extend(group)
+        return phrases
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(
+            config["rules"],
+            decide_threshold=config.get("decide_threshold"),
+            decide_confidence=config.get("decide_confidence", 99.0),
+            override_threshold=config.get("override_threshold", 1),
+        )
+
+    def groups(self, text):
+        """
+        Names of all phrase groups found in text (combine sets across parts
+        of a document and score them with evaluate())
+        """
+        text = str(text)
+        if self._scan is None:
+            return set()
+        found = set()
+        for m in self._scan.finditer(text):
+            groups = self._at.match(text, m.start()).groupdict()
+            found.update(name for name, value in groups.items() if value is not None)
+        return found
+
+    def match(self, text):
+        """
+        Score a message against all rules in a single regex pass
+        """
+        return self.evaluate(self.groups(text))
+
+    def evaluate(self, found):
+        """
+        Score a set of phrase groups from groups()
+        """
+        result = RuleMatch()
+        if not found:
+            return result
+
+        for rule in self.rules:
+            boundary = rule.get("word_boundary", True)
+
+            def hit(phrases):
+                return any(self._groups[(p.lower(), boundary)] in found for p in phrases)
+
+            fired = False
+            if rule.get("any") and hit(rule["any"]):
+                fired = True
+            elif rule.get("all") and all(hit(group) for group in rule["all"]):
+                fired = True
+            if fired:
+                result.score += rule.get("weight", 1)
+                result.rules.append(rule["id"])
+        return result
+
+    def is_decisive(self, match):
+        """
+        True when the rules alone decide SCAM (model can be skipped)
+        """
+        return self.decide_threshold is not None and match.score >= self.decide_threshold
+
+    def triggers_override(self, match):
+        return match.score >= self.override_threshold
@@ -0,0 +1,265 @@
+"""
+Bulk mailbox scan: mbox / Maildir → batched text classification
+
+Usage:
+    python scan_mailbox.py inbox.mbox --out results.jsonl
+    python scan_mailbox.py ~/Maildir archive.mbox --out results.jsonl --workers 8 --batch-size 64
+
+- Streams every source: mbox files are read line by line and Maildir
+  folders (cur/ + new/) one file at a time, so memory does not grow with
+  the mailbox size
+- Worker processes parse the raw messages and extract the body text
+  (text/plain, or stripped text/html when there is no plain part)
+- Duplicates are dropped by Message-ID and by body hash
+- Bodies are classified in batches with predict_many() and each batch is
+  written to the JSONL output as soon as it finishes, one row per message
+- Prints live messages/s and the end-to-end rate at the end
+"""
+
+import argparse
+import email
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from email import policy
+
+import predict
+from extractors import message_parts
+
+FIELDS = ["id", "message_id", "source", "subject", "from", "label", "confidence", "rules", "error"]
+
+
+# ---------- SOURCES ----------
+def is_maildir(path):
+    return os.path.isdir(path) and all(os.path.isdir(os.path.join(path, d)) for d in ("cur", "new"))
+
+
+def iter_mbox(path):
+    """
+    Lazily yield (source, key, raw_bytes) for every message in an mbox file
+
+    Messages start at lines beginning with "From "; mboxrd-quoted
+    ">From " lines inside bodies are unquoted.
+    """
+    name = os.path.basename(path)
+    index = 0
+    lines = None
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(b"From "):
+                if lines is not None:
+                    yield name, str(index), _join_mbox(lines)
+                    index += 1
+                lines = []
+                continue
+            if lines is None:
+                continue  # junk before the first separator
+            if line.startswith(b">") and line.lstrip(b">").startswith(b"From "):
+                line = line[1:]
+            lines.append(line)
+    if lines is not None:
+        yield name, str(index), _join_mbox(lines)
+
+
+def _join_mbox(lines):
+    # The blank line before the next "From " separator is not part of the message
+    if lines and lines[-1].strip() == b"":
+        lines = lines[:-1]
+    return b"".join(lines)
+
+
+def iter_maildir(path):
+    """
+    Lazily yield (source, key, raw_bytes) for every message in cur/ and new/
+    """
+    name = os.path.basename(os.path.normpath(path))
+    for sub in ("cur", "new"):
+        folder = os.path.join(path, sub)
+        for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+            if not entry.is_file() or entry.name.startswith("."):
+                continue
+            # The unique part of a Maildir name is everything before ":2,<flags>"
+            key = entry.name.split(":", 1)[0]
+            try:
+                with open(entry.path, "rb") as f:
+                    yield name, key, f.read()
+            except OSError:
+                continue
+
+
+def iter_sources(paths):
+    for path in paths:
+        if is_maildir(path):
+            yield from iter_maildir(path)
+        elif os.path.isfile(path):
+            yield from iter_mbox(path)
+        else:
+            print(f"\n⚠️ Skipping {path}: not an mbox file or Maildir folder", file=sys.stderr)
+
+
+# ---------- WORKERS ----------
+def parse_message(item):
+    """
+    Parse one raw message and extract its body text (runs in a worker)
+    """
+    source, key, raw = item
+    row = {"id": f"{source}:{key}", "message_id": None, "source": source,
+           "subject": None, "from": None, "text": "", "body_hash": None, "error": None}
+    try:
+        msg = email.message_from_bytes(raw, policy=policy.default)
+        row["message_id"] = (msg.get("Message-ID") or "").strip() or None
+        row["subject"] = str(msg.get("Subject") or "") or None
+        row["from"] = str(msg.get("From") or "") or None
+        row["text"] = "\n".join(message_parts(msg)).strip()
+    except Exception as e:
+        row["error"] = f"parse error: {e}"
+        return row
+
+    # Normalize whitespace so re-encoded copies of the same body collide
+    body = " ".join(row["text"].split()).lower()
+    if body:
+        row["body_hash"] = hashlib.sha1(body.encode("utf-8")).hexdigest()
+    return row
+
+
+def ordered_map(pool, fn, items, inflight):
+    """
+    pool.map with at most `inflight` pending tasks (pool.map would submit
+    the whole mailbox up front)
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= inflight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# ---------- DEDUPE ----------
+class Deduper:
+    def __init__(self):
+        self.message_ids = set()
+        self.body_hashes = set()
+        self.duplicates = 0
+
+    def is_new(self, row):
+        mid, body = row["message_id"], row["body_hash"]
+        if (mid and mid in self.message_ids) or (body and body in self.body_hashes):
+            self.duplicates += 1
+            return False
+        if mid:
+            self.message_ids.add(mid)
+        if body:
+            self.body_hashes.add(body)
+        return True
+
+
+# ---------- OUTPUT ----------
+class JsonlWriter:
+    def __init__(self, path):
+        self._f = open(path, "w", encoding="utf-8")
+
+    def write(self, rows):
+        self._f.write("".join(json.dumps({k: r.get(k) for k in FIELDS}) + "\n" for r in rows))
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+class Progress:
+    def __init__(self):
+        self.start = time.time()
+        self.read = 0
+        self.classified = 0
+        self.duplicates = 0
+        self.errors = 0
+
+    def update(self, read, rows, duplicates):
+        self.read = read
+        self.classified += sum(r.get("label") is not None for r in rows)
+        self.errors += sum(r["error"] is not None for r in rows)
+        self.duplicates = duplicates
+        elapsed = time.time() - self.start
+        rate = self.read / elapsed if elapsed > 0 else 0
+        sys.stdout.write(f"\r📬 {self.read:,} read | {self.classified:,} classified | "
+                         f"{self.duplicates:,} dupes | errors {self.errors:,} | {rate:6.1f} msg/s   ")
+        sys.stdout.flush()
+
+
+# ---------- SCAN ----------
+def classify(rows, batch_size):
+    """
+    Fill label / confidence / rules for parsed rows (in place)
+    """
+    todo = [r for r in rows if r["error"] is None and r["text"]]
+    for r in rows:
+        if r["error"] is None and not r["text"]:
+            r["error"] = "no text body"
+    if not todo:
+        return
+
+    results, matches = predict.predict_many([r["text"] for r in todo], batch_size=batch_size, return_matches=True)
+    for r, (label, confidence), match in zip(todo, results, matches):
+        r["label"] = label
+        r["confidence"] = confidence
+        r["rules"] = match.rules
+
+
+def scan(args):
+    workers = args.workers or min(4, os.cpu_count() or 1)
+    writer = JsonlWriter(args.out)
+    deduper = Deduper()
+    progress = Progress()
+    read = 0
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        parsed = ordered_map(pool, parse_message, iter_sources(args.sources), inflight=args.batch_size * 4)
+        batch = []
+        for row in parsed:
+            read += 1
+            if row["error"] is None and not deduper.is_new(row):
+                continue
+            batch.append(row)
+            if len(batch) == args.batch_size:
+                classify(batch, args.batch_size)
+                writer.write(batch)
+                progress.update(read, batch, deduper.duplicates)
+                batch = []
+        if batch:
+            classify(batch, args.batch_size)
+            writer.write(batch)
+        progress.update(read, batch, deduper.duplicates)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        writer.close()
+    return progress
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Classify every message in mbox files / Maildir folders")
+    parser.add_argument("sources", nargs="+", help="mbox files and/or Maildir folders")
+    parser.add_argument("--out", type=str, required=True, help="Output .jsonl file")
+    parser.add_argument("--batch-size", type=int, default=32, help="Messages per classifier batch")
+    parser.add_argument("--workers", type=int, default=None, help="Parse/extract worker processes (default: min(4, cores))")
+    parser.add_argument("--backend", choices=predict.BACKENDS, default=predict.BACKEND)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    predict.set_backend(args.backend)
+    predict.warmup()
+
+    progress = scan(args)
+    elapsed = time.time() - progress.start
+    print(f"\n✅ Scan complete: {progress.read:,} messages in {elapsed:.1f} s "
+          f"({progress.read / max(elapsed, 1e-9):.1f} msg/s end to end) | "
+          f"{progress.classified:,} classified, {progress.duplicates:,} duplicates, "
+          f"{progress.errors:,} errors → {args.out}")
@@ -0,0 +1,50 @@
+"""
+Tests for the compiled scam rule engine
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scam_rules import RuleEngine
+
+
+def fired(rules, text):
+    return sorted(RuleEngine(rules).match(text).rules)
+
+
+def test_nested_phrases_all_fire():
+    rules = [
+        {"id": "won_prize", "any": ["won prize"], "weight": 8},
+        {"id": "prize", "any": ["prize"], "weight": 2},
+    ]
+    assert fired(rules, "you won prize") == ["prize", "won_prize"]
+    assert RuleEngine(rules).match("you won prize").score == 10
+
+
+def test_prefix_phrase_inside_longer_phrase():
+    rules = [
+        {"id": "free_money", "any": ["free money"], "weight": 8},
+        {"id": "free", "any": ["free"], "weight": 1},
+    ]
+    assert fired(rules, "get FREE   money today") == ["free", "free_money"]
+
+
+def test_same_phrase_with_and_without_word_boundary():
+    rules = [
+        {"id": "exact", "any": ["crypto"], "weight": 1},
+        {"id": "prefix", "any": ["crypto"], "weight": 1, "word_boundary": False},
+    ]
+    assert fired(rules, "buy crypto now") == ["exact", "prefix"]
+    assert fired(rules, "cryptocurrency") == ["prefix"]
+
+
+def test_all_rule_with_overlapping_groups():
+    rules = [{"id": "otp", "all": [["verify otp"], ["otp"]], "weight": 5}]
+    assert fired(rules, "please verify otp") == ["otp"]
+    assert fired(rules, "otp only") == []
+
+
+def test_no_rules():
+    assert RuleEngine([]).match("anything").rules == []
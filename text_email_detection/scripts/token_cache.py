@@ -0,0 +1,209 @@
+"""
+Pre-tokenized, memory-mapped training corpus
+
+build_token_cache() tokenizes CSV splits ONCE (no padding) and writes:
+
+    <cache_dir>/
+        tokens.bin    all input IDs back to back (uint16, or uint32 for big vocabularies)
+        offsets.bin   int64, n_rows + 1; row i is tokens[offsets[i]:offsets[i + 1]]
+        labels.bin    int8, one label per row
+        meta.json     fingerprint, dtype, row / token counts (written last)
+
+The cache folder name contains a fingerprint of the tokenizer, MAX_LEN,
+the optional text preprocessing function and the source CSV bytes, so
+any change to one of them builds a new cache and an unchanged corpus is
+reused. TokenCorpus memory-maps the files: startup is instant and rows
+are read as zero-copy slices straight from the page cache.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from torch.utils.data import Dataset
+
+CACHE_ROOT = "token_cache"
+CHUNK_ROWS = 50000          # CSV rows tokenized per step
+CACHE_VERSION = 1           # bump when the on-disk layout changes
+
+
+# ---------- FINGERPRINT ----------
+def _file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def tokenizer_fingerprint(tokenizer):
+    """
+    Hash of everything that changes the produced IDs (vocab, normalizer, special tokens)
+    """
+    h = hashlib.sha256(type(tokenizer).__name__.encode())
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        h.update(backend.to_str().encode("utf-8"))
+    else:
+        h.update(json.dumps(tokenizer.get_vocab(), sort_keys=True).encode("utf-8"))
+    h.update(json.dumps(tokenizer.special_tokens_map, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _code_bytes(code):
+    parts = [code.co_code, repr(code.co_names).encode("utf-8")]
+    for const in code.co_consts:
+        # Nested functions / comprehensions: hash their code, not their repr (has an address)
+        parts.append(_code_bytes(const) if hasattr(const, "co_code") else repr(const).encode("utf-8"))
+    return b"|".join(parts)
+
+
+def function_fingerprint(fn):
+    """
+    Hash of a function's name, bytecode and constants, so editing e.g.
+    the regexes of predict.clean_text changes the fingerprint
+    """
+    h = hashlib.sha256(f"{fn.__module__}.{fn.__qualname__}".encode("utf-8"))
+    h.update(_code_bytes(fn.__code__))
+    h.update(repr(fn.__defaults__).encode("utf-8"))
+    return h.hexdigest()
+
+
+def corpus_fingerprint(sources, tokenizer, max_len, text_fn=None):
+    """
+    sources: [(csv_path, label), ...]
+    """
+    fn_hash = function_fingerprint(text_fn) if text_fn else "raw"
+    h = hashlib.sha256(f"v{CACHE_VERSION}|{max_len}|{fn_hash}|{tokenizer_fingerprint(tokenizer)}".encode())
+    for path, label in sources:
+        h.update(f"|{label}|{_file_sha256(path)}".encode())
+    return h.hexdigest()
+
+
+# ---------- BUILD ----------
+def _iter_chunks(sources, chunk_rows, text_fn=None):
+    for path, label in sources:
+        for chunk in pd.read_csv(path, usecols=["text"], chunksize=chunk_rows):
+            texts = chunk["text"].fillna("").astype(str).tolist()
+            yield [text_fn(t) for t in texts] if text_fn else texts, label
+
+
+def build_token_cache(sources, tokenizer, max_len, cache_dir, chunk_rows=CHUNK_ROWS, fingerprint=None,
+                      text_fn=None):
+    """
+    Tokenize the CSVs into cache_dir (written to a temp folder, then renamed);
+    text_fn (e.g. predict.clean_text) is applied to every text first
+    """
+    dtype = np.uint16 if len(tokenizer) <= np.iinfo(np.uint16).max + 1 else np.uint32
+    tmp_dir = cache_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    n_rows = n_tokens = longest = 0
+    with open(os.path.join(tmp_dir, "tokens.bin"), "wb") as tokens_f, \
+         open(os.path.join(tmp_dir, "offsets.bin"), "wb") as offsets_f, \
+         open(os.path.join(tmp_dir, "labels.bin"), "wb") as labels_f:
+        offsets_f.write(np.zeros(1, dtype=np.int64).tobytes())
+        for texts, label in _iter_chunks(sources, chunk_rows, text_fn):
+            ids = tokenizer(texts, truncation=True, max_length=max_len)["input_ids"]
+            lengths = np.fromiter((len(x) for x in ids), dtype=np.int64, count=len(ids))
+            tokens_f.write(np.fromiter((t for x in ids for t in x), dtype=dtype, count=int(lengths.sum())).tobytes())
+            offsets_f.write((n_tokens + np.cumsum(lengths)).tobytes())
+            labels_f.write(np.full(len(ids), label, dtype=np.int8).tobytes())
+
+            n_rows += len(ids)
+            n_tokens += int(lengths.sum())
+            longest = max(longest, int(lengths.max(initial=0)))
+            print(f"\r🧩 Tokenized {n_rows:,} rows ({n_tokens:,} tokens)", end="", flush=True)
+    print()
+
+    meta = {
+        "version": CACHE_VERSION,
+        "fingerprint": fingerprint,
+        "dtype": np.dtype(dtype).name,
+        "rows": n_rows,
+        "tokens": n_tokens,
+        "longest": longest,
+        "max_len": max_len,
+        "sources": [[path, label] for path, label in sources],
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    return meta
+
+
+# ---------- DATASET ----------
+class TokenCorpus(Dataset):
+    """
+    Memory-mapped corpus; item i is {"input_ids": uint view, "labels": int}
+
+    Items are numpy views into the mapped file (no copy); the collate
+    function turns a batch of them into padded int64 tensors.
+    """
+
+    def __init__(self, cache_dir):
+        with open(os.path.join(cache_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.cache_dir = cache_dir
+        rows = self.meta["rows"]
+        self.tokens = np.memmap(os.path.join(cache_dir, "tokens.bin"), dtype=self.meta["dtype"], mode="r",
+                                shape=(self.meta["tokens"],)) if self.meta["tokens"] else np.zeros(0, self.meta["dtype"])
+        self.offsets = np.memmap(os.path.join(cache_dir, "offsets.bin"), dtype=np.int64, mode="r", shape=(rows + 1,))
+        self.labels = np.memmap(os.path.join(cache_dir, "labels.bin"), dtype=np.int8, mode="r", shape=(rows,)) \
+            if rows else np.zeros(0, np.int8)
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def __getitem__(self, idx):
+        start, end = self.offsets[idx], self.offsets[idx + 1]
+        return {"input_ids": self.tokens[start:end], "labels": int(self.labels[idx])}
+
+
+def pad_collate(batch, pad_id=0, pad_to=None):
+    """
+    Pad a batch of TokenCorpus items into input_ids / attention_mask / labels tensors
+    """
+    width = pad_to or max(len(item["input_ids"]) for item in batch)
+    input_ids = torch.full((len(batch), width), pad_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(batch), width), dtype=torch.long)
+    for row, item in enumerate(batch):
+        ids = item["input_ids"][:width]
+        input_ids[row, :len(ids)] = torch.from_numpy(ids.astype(np.int64))
+        attention_mask[row, :len(ids)] = 1
+    labels = torch.tensor([item["labels"] for item in batch], dtype=torch.long)
+    return {"input_ids": input_ids, "attention_mask": attention_mask, "labels": labels}
+
+
+def load_token_corpus(sources, tokenizer, max_len, name, cache_root=CACHE_ROOT, text_fn=None):
+    """
+    Return a TokenCorpus for sources, building the cache only if the
+    fingerprint (tokenizer + MAX_LEN + text_fn + CSV contents) has no cache yet
+    """
+    start = time.time()
+    fingerprint = corpus_fingerprint(sources, tokenizer, max_len, text_fn)
+    cache_dir = os.path.join(cache_root, f"{name}-{fingerprint[:16]}")
+    meta_path = os.path.join(cache_dir, "meta.json")
+
+    if os.path.exists(meta_path):
+        print(f"⚡ Reusing token cache {cache_dir}")
+    else:
+        print(f"🧩 Building token cache {cache_dir}")
+        os.makedirs(cache_root, exist_ok=True)
+        build_token_cache(sources, tokenizer, max_len, cache_dir, fingerprint=fingerprint, text_fn=text_fn)
+
+    corpus = TokenCorpus(cache_dir)
+    print(f"   {len(corpus):,} rows, {corpus.meta['tokens']:,} tokens ({time.time() - start:.1f} s)")
+    return corpus
@@ -1,65 +1,70 @@
-import pandas as pd
+import argparse
+from functools import partial
+
 import torch
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import DataLoader
 from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
-from transformers import AdamW
-from sklearn.metrics import accuracy_score, f1_score
-from tqdm import tqdm
+from transformers import get_linear_schedule_with_warmup
+
+from length_sampler import LengthGroupedBatchSampler
+from token_cache import load_token_corpus, pad_collate
+from train_engine import Trainer, optimizer_steps_per_epoch
 
 # ---------------- CONFIG ----------------
 MODEL_NAME = "distilbert-base-uncased"
 BATCH_SIZE = 8
+ACCUM_STEPS = 1           # effective batch = BATCH_SIZE * ACCUM_STEPS
 EPOCHS = 3
 MAX_LEN = 256
+LR = 2e-5
+WARMUP_RATIO = 0.1
+SEED = 42
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_EVERY = 500    # optimizer steps
+LOG_EVERY = 50            # optimizer steps
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-# ---------------- LOAD DATA ----------------
-def load_data(real_path, fake_path):
-    real = pd.read_csv(real_path)
-    fake = pd.read_csv(fake_path)
-
-    real["label"] = 0
-    fake["label"] = 1
-
-    df = pd.concat([real, fake]).sample(frac=1).reset_index(drop=True)
-    return df["text"].astype(str).tolist(), df["label"].tolist()
-
-train_texts, train_labels = load_data(
-    "dataset_split/train/real.csv",
-    "dataset_split/train/fake.csv"
-)
-
-val_texts, val_labels = load_data(
-    "dataset_split/val/real.csv",
-    "dataset_split/val/fake.csv"
-)
+# ---------------- ARGS ----------------
+parser = argparse.ArgumentParser(description="Fine-tune DistilBERT on dataset_split (resumable)")
+parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+parser.add_argument("--accum-steps", type=int, default=ACCUM_STEPS, help="Micro-batches per optimizer step")
+parser.add_argument("--epochs", type=int, default=EPOCHS)
+parser.add_argument("--lr", type=float, default=LR)
+parser.add_argument("--bf16", action="store_true", help="bf16 autocast for forward passes (CPU or CUDA)")
+parser.add_argument("--checkpoint-dir", type=str, default=CHECKPOINT_DIR)
+parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY)
+parser.add_argument("--log-every", type=int, default=LOG_EVERY)
+parser.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint")
+args = parser.parse_args()
+
+torch.manual_seed(SEED)
+
+# ---------------- DATA ----------------
+# Each split is tokenized once into a memory-mapped cache (see token_cache.py)
+# and reused until the tokenizer, MAX_LEN or the CSVs change.
+def split_sources(split):
+    return [
+        (f"dataset_split/{split}/real.csv", 0),
+        (f"dataset_split/{split}/fake.csv", 1),
+    ]
 
-# ---------------- DATASET ----------------
 tokenizer = DistilBertTokenizerFast.from_pretrained(MODEL_NAME)
 
-class TextDataset(Dataset):
-    def __init__(self, texts, labels):
-        self.encodings = tokenizer(
-            texts,
-            truncation=True,
-            padding=True,
-            max_length=MAX_LEN
-        )
-        self.labels = labels
-
-    def __len__(self):
-        return len(self.labels)
-
-    def __getitem__(self, idx):
-        item = {k: torch.tensor(v[idx]) for k, v in self.encodings.items()}
-        item["labels"] = torch.tensor(self.labels[idx])
-        return item
+train_ds = load_token_corpus(split_sources("train"), tokenizer, MAX_LEN, "train")
+val_ds = load_token_corpus(split_sources("val"), tokenizer, MAX_LEN, "val")
 
-train_ds = TextDataset(train_texts, train_labels)
-val_ds = TextDataset(val_texts, val_labels)
+# Each batch is padded only to its own longest row, and rows of similar
+# length are batched together (shuffled per epoch for training, sorted for
+# validation), so little compute goes into pad tokens.
+collate = partial(pad_collate, pad_id=tokenizer.pad_token_id)
+train_sampler = LengthGroupedBatchSampler(train_ds.lengths, args.batch_size, shuffle=True, seed=SEED)
+val_sampler = LengthGroupedBatchSampler(val_ds.lengths, args.batch_size, shuffle=False)
 
-train_loader = DataLoader(train_ds, batch_size=BATCH_SIZE, shuffle=True)
-val_loader = DataLoader(val_ds, batch_size=BATCH_SIZE)
+# Own generator: the loader must not draw from the global (dropout) RNG,
+# or a resumed run would not replay the same dropout masks
+train_loader = DataLoader(train_ds, batch_sampler=train_sampler, collate_fn=collate,
+                          generator=torch.Generator().manual_seed(SEED))
+val_loader = DataLoader(val_ds, batch_sampler=val_sampler, collate_fn=collate)
 
 # ---------------- MODEL ----------------
 model = DistilBertForSequenceClassification.from_pretrained(
@@ -67,46 +72,20 @@ model = DistilBertForSequenceClassification.from_pretrained(
 )
 model.to(DEVICE)
 
-optimizer = AdamW(model.parameters(), lr=2e-5)
+optimizer = torch.optim.AdamW(model.parameters(), lr=args.lr, weight_decay=0.0)
+total_steps = optimizer_steps_per_epoch(len(train_loader), args.accum_steps) * args.epochs
+scheduler = get_linear_schedule_with_warmup(optimizer, int(total_steps * WARMUP_RATIO), total_steps)
 
 # ---------------- TRAIN ----------------
-print("🚀 Training started...\n")
-
-for epoch in range(EPOCHS):
-    model.train()
-    total_loss = 0
-
-    for batch in tqdm(train_loader):
-        batch = {k: v.to(DEVICE) for k, v in batch.items()}
-        outputs = model(**batch)
-
-        loss = outputs.loss
-        loss.backward()
-
-        optimizer.step()
-        optimizer.zero_grad()
-        total_loss += loss.item()
-
-    # ---------- VALIDATION ----------
-    model.eval()
-    preds, true = [], []
-
-    with torch.no_grad():
-        for batch in val_loader:
-            batch = {k: v.to(DEVICE) for k, v in batch.items()}
-            outputs = model(**batch)
-            logits = outputs.logits
-
-            preds.extend(torch.argmax(logits, axis=1).cpu().numpy())
-            true.extend(batch["labels"].cpu().numpy())
-
-    acc = accuracy_score(true, preds)
-    f1 = f1_score(true, preds)
-
-    print(f"\nEpoch {epoch+1}/{EPOCHS}")
-    print(f"Loss: {total_loss:.4f}")
-    print(f"Val Accuracy: {acc:.4f}")
-    print(f"Val F1-score: {f1:.4f}")
+trainer = Trainer(
+    model, optimizer, scheduler, train_loader, val_loader, DEVICE, args.epochs,
+    accum_steps=args.accum_steps,
+    bf16=args.bf16,
+    checkpoint_dir=args.checkpoint_dir,
+    checkpoint_every=args.checkpoint_every,
+    log_every=args.log_every,
+)
+trainer.train(resume=not args.no_resume)
 
 # ---------------- SAVE MODEL ----------------
 model.save_pretrained("model")
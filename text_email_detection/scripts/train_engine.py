@@ -0,0 +1,252 @@
+"""
+Resumable training loop for the text classifier
+
+- Gradient accumulation: accum_steps micro-batches per optimizer step
+  (effective batch = batch_size * accum_steps)
+- Optional bf16 autocast (CPU or CUDA) for the forward pass
+- Checkpoints every checkpoint_every optimizer steps and at the end of
+  every epoch: model, optimizer, scheduler, all RNG states, epoch and the
+  position inside the epoch. Checkpoints are written to a temp file and
+  renamed, so a crash while saving keeps the previous one.
+- Resume restarts exactly at the next batch: the sampler's order only
+  depends on (seed, epoch), and checkpoints are taken on optimizer-step
+  boundaries, so no gradient is half-accumulated
+- Logs loss, learning rate, samples/s, tokens/s and ETA every log_every steps
+
+The train loader must use a LengthGroupedBatchSampler (num_workers=0) and
+its own torch.Generator, so creating the loader iterator does not draw
+from the global RNG that dropout uses.
+"""
+
+import math
+import os
+import random
+import time
+
+import numpy as np
+import torch
+from sklearn.metrics import accuracy_score, f1_score
+
+CHECKPOINT_NAME = "last.pt"
+
+
+def optimizer_steps_per_epoch(n_batches, accum_steps):
+    return math.ceil(n_batches / accum_steps)
+
+
+def rng_state():
+    state = {
+        "python": random.getstate(),
+        "numpy": np.random.get_state(),
+        "torch": torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def set_rng_state(state):
+    random.setstate(state["python"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+    if "cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["cuda"])
+
+
+def format_eta(seconds):
+    return time.strftime("%H:%M:%S", time.gmtime(max(0, seconds)))
+
+
+class Trainer:
+    def __init__(self, model, optimizer, scheduler, train_loader, val_loader, device, epochs,
+                 accum_steps=1, bf16=False, checkpoint_dir="checkpoints", checkpoint_every=500,
+                 log_every=50, max_grad_norm=1.0):
+        self.model = model
+        self.optimizer = optimizer
+        self.scheduler = scheduler
+        self.train_loader = train_loader
+        self.val_loader = val_loader
+        self.sampler = train_loader.batch_sampler
+        self.device = device
+        self.epochs = epochs
+        self.accum_steps = accum_steps
+        self.bf16 = bf16
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.log_every = log_every
+        self.max_grad_norm = max_grad_norm
+
+        self.n_batches = len(train_loader)
+        self.steps_per_epoch = optimizer_steps_per_epoch(self.n_batches, accum_steps)
+        self.total_steps = self.steps_per_epoch * epochs
+
+        # Position of the NEXT batch to train on
+        self.epoch = 0
+        self.batch_in_epoch = 0
+        self.global_step = 0
+        self.epoch_stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats():
+        return {"loss": 0.0, "batches": 0, "samples": 0, "tokens": 0, "padded": 0, "train_s": 0.0}
+
+    def _autocast(self):
+        return torch.autocast(device_type=self.device.type, dtype=torch.bfloat16, enabled=self.bf16)
+
+    # ---------- CHECKPOINTS ----------
+    @property
+    def checkpoint_path(self):
+        return os.path.join(self.checkpoint_dir, CHECKPOINT_NAME)
+
+    def save_checkpoint(self):
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        state = {
+            "model": self.model.state_dict(),
+            "optimizer": self.optimizer.state_dict(),
+            "scheduler": self.scheduler.state_dict() if self.scheduler else None,
+            "rng": rng_state(),
+            "epoch": self.epoch,
+            "batch_in_epoch": self.batch_in_epoch,
+            "global_step": self.global_step,
+            "epoch_stats": self.epoch_stats,
+            "batch_size": self.sampler.batch_size,
+            "accum_steps": self.accum_steps,
+            "seed": self.sampler.seed,
+        }
+        tmp = self.checkpoint_path + ".tmp"
+        torch.save(state, tmp)
+        os.replace(tmp, self.checkpoint_path)
+
+    def load_checkpoint(self):
+        """
+        Restore the last checkpoint; returns False when there is none
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return False
+        # On CPU: the RNG states must stay CPU ByteTensors, and load_state_dict
+        # moves model / optimizer tensors to their parameters' device
+        state = torch.load(self.checkpoint_path, map_location="cpu", weights_only=False)
+
+        saved = (state["batch_size"], state["accum_steps"], state["seed"])
+        current = (self.sampler.batch_size, self.accum_steps, self.sampler.seed)
+        if saved != current:
+            raise ValueError(
+                f"Checkpoint was written with (batch_size, accum_steps, seed)={saved}, "
+                f"this run uses {current}; resuming would not reproduce the batch order"
+            )
+
+        self.model.load_state_dict(state["model"])
+        self.optimizer.load_state_dict(state["optimizer"])
+        if self.scheduler and state["scheduler"]:
+            self.scheduler.load_state_dict(state["scheduler"])
+        set_rng_state(state["rng"])
+        self.epoch = state["epoch"]
+        self.batch_in_epoch = state["batch_in_epoch"]
+        self.global_step = state["global_step"]
+        self.epoch_stats = state["epoch_stats"]
+        print(f"↩️ Resumed from {self.checkpoint_path}: epoch {self.epoch + 1}, "
+              f"batch {self.batch_in_epoch}/{self.n_batches}, step {self.global_step}/{self.total_steps}")
+        return True
+
+    # ---------- TRAIN ----------
+    def _optimizer_step(self):
+        if self.max_grad_norm:
+            torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.max_grad_norm)
+        self.optimizer.step()
+        if self.scheduler:
+            self.scheduler.step()
+        self.optimizer.zero_grad(set_to_none=True)
+        self.global_step += 1
+
+    def _log(self, run_start, run_start_step, window):
+        elapsed = time.time() - run_start
+        steps_done = self.global_step - run_start_step
+        eta = elapsed / steps_done * (self.total_steps - self.global_step) if steps_done else 0
+        lr = self.optimizer.param_groups[0]["lr"]
+        print(f"epoch {self.epoch + 1}/{self.epochs} | step {self.global_step}/{self.total_steps} | "
+              f"loss {window['loss'] / max(window['batches'], 1):.4f} | lr {lr:.2e} | "
+              f"{window['samples'] / window['s']:.1f} samples/s | {window['tokens'] / window['s']:,.0f} tokens/s | "
+              f"ETA {format_eta(eta)}", flush=True)
+
+    def train_epoch(self, run_start, run_start_step):
+        self.model.train()
+        self.sampler.set_epoch(self.epoch, start_batch=self.batch_in_epoch)
+        stats = self.epoch_stats
+        window = {"loss": 0.0, "batches": 0, "samples": 0, "tokens": 0, "s": 0.0}
+        tick = time.time()
+
+        for batch in self.train_loader:
+            n_tokens = int(batch["attention_mask"].sum())
+            stats["tokens"] += n_tokens
+            stats["padded"] += batch["input_ids"].numel()
+            stats["samples"] += len(batch["labels"])
+            window["tokens"] += n_tokens
+            window["samples"] += len(batch["labels"])
+
+            batch = {k: v.to(self.device) for k, v in batch.items()}
+            with self._autocast():
+                loss = self.model(**batch).loss
+            (loss / self.accum_steps).backward()
+
+            stats["loss"] += loss.item()
+            stats["batches"] += 1
+            window["loss"] += loss.item()
+            window["batches"] += 1
+            self.batch_in_epoch += 1
+
+            # Step every accum_steps batches of the epoch and on its last batch
+            if self.batch_in_epoch % self.accum_steps == 0 or self.batch_in_epoch == self.n_batches:
+                self._optimizer_step()
+                now = time.time()
+                stats["train_s"] += now - tick
+                window["s"] += now - tick
+                tick = now
+
+                if self.global_step % self.log_every == 0:
+                    self._log(run_start, run_start_step, window)
+                    window = {"loss": 0.0, "batches": 0, "samples": 0, "tokens": 0, "s": 0.0}
+                if self.checkpoint_every and self.global_step % self.checkpoint_every == 0 \
+                        and self.batch_in_epoch < self.n_batches:
+                    self.save_checkpoint()
+                    tick = time.time()
+
+        return stats
+
+    @torch.no_grad()
+    def evaluate(self):
+        self.model.eval()
+        preds, true = [], []
+        for batch in self.val_loader:
+            batch = {k: v.to(self.device) for k, v in batch.items()}
+            with self._autocast():
+                logits = self.model(**batch).logits
+            preds.extend(torch.argmax(logits, dim=1).cpu().numpy())
+            true.extend(batch["labels"].cpu().numpy())
+        return accuracy_score(true, preds), f1_score(true, preds)
+
+    def train(self, resume=True):
+        if resume:
+            self.load_checkpoint()
+        effective = self.sampler.batch_size * self.accum_steps
+        print(f"🚀 Training: {self.epochs} epochs x {self.steps_per_epoch} steps, "
+              f"effective batch {effective} ({self.sampler.batch_size} x {self.accum_steps} accum)"
+              f"{', bf16 autocast' if self.bf16 else ''}\n")
+
+        run_start, run_start_step = time.time(), self.global_step
+        while self.epoch < self.epochs:
+            stats = self.train_epoch(run_start, run_start_step)
+            acc, f1 = self.evaluate()
+
+            print(f"\nEpoch {self.epoch + 1}/{self.epochs}")
+            print(f"Loss: {stats['loss'] / max(stats['batches'], 1):.4f} (mean per batch)")
+            print(f"Val Accuracy: {acc:.4f}")
+            print(f"Val F1-score: {f1:.4f}")
+            print(f"Train time: {stats['train_s']:.1f} s | "
+                  f"{stats['tokens'] / max(stats['train_s'], 1e-9):,.0f} tokens/s "
+                  f"({stats['tokens'] / max(stats['padded'], 1):.1%} real tokens)\n")
+
+            self.epoch += 1
+            self.batch_in_epoch = 0
+            self.epoch_stats = self._empty_stats()
+            self.save_checkpoint()
+        return self.model